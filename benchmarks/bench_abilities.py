@@ -0,0 +1,60 @@
+"""
+Ability modifiers: precompile time and per-call analysis cost.
+
+Compiles the ability-aware vectors of a synthetic Pokedex for each mode
+(what the first analysis with abilities pays, once per dataset version),
+then times analyze_team_by_type on random teams with abilities off and on,
+with a cold and a warm analysis cache.
+
+Usage: python benchmarks/bench_abilities.py [n_species]
+"""
+
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from poketype.abilities import ABILITY_MODES, AbilityVectors
+from poketype.analysis import ANALYSIS_CACHE, analyze_team_by_type
+from poketype.pokedex import parse_pokedex
+from poketype.store import PokedexStore
+from benchmarks.synthetic import synthetic_pokedex
+
+
+def per_call_us(teams, store, ability_mode) -> float:
+    start = time.perf_counter()
+    for team in teams:
+        analyze_team_by_type(team, store, ability_mode=ability_mode)
+    return (time.perf_counter() - start) / len(teams) * 1e6
+
+
+def main():
+    n_species = int(sys.argv[1]) if len(sys.argv) > 1 else 1400
+    store = PokedexStore.from_dict(parse_pokedex(synthetic_pokedex(n_species)), version="bench")
+    rnd = random.Random(0)
+    teams = [rnd.sample(store.ids, 6) for _ in range(2000)]
+
+    print(f"species: {len(store)}")
+    for mode in ABILITY_MODES:
+        samples = []
+        for _ in range(5):
+            start = time.perf_counter()
+            AbilityVectors(store, mode)
+            samples.append((time.perf_counter() - start) * 1000)
+        print(f"precompile {mode!r:<6}          {statistics.median(samples):8.1f} ms")
+
+    print(f"{'analyze_team_by_type':<28}{'cold us':>10}{'warm us':>10}")
+    for ability_mode in (None,) + ABILITY_MODES:
+        if ability_mode is not None:
+            store.ability_vectors(ability_mode)
+        ANALYSIS_CACHE.clear()
+        cold = per_call_us(teams, store, ability_mode)
+        warm = per_call_us(teams, store, ability_mode)
+        print(f"{'abilities=' + str(ability_mode):<28}{cold:>10.1f}{warm:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Replay a log of team edits through analyze_team_by_type, with and without
+the shared ANALYSIS_CACHE.
+
+A log is JSON Lines, one team (list of species ids) per line: the team as it
+was on each analysis request, across all sessions. Without a log file a
+synthetic one is generated: sessions build teams from a popularity-skewed
+species pool and keep editing them, and every edit is analyzed --reruns
+times (the button run, the st.rerun after it, filter changes...).
+
+Usage: python benchmarks/bench_analysis_cache.py [log.jsonl] [--sessions N] [--reruns N]
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from poketype.analysis import ANALYSIS_CACHE, _analyze_matrix, analyze_team_by_type, get_team_defense_matrix
+from poketype.cache import LRUCache
+from poketype.pokedex import parse_pokedex
+from poketype.store import PokedexStore
+from benchmarks.synthetic import synthetic_pokedex
+
+import poketype.analysis as analysis_module
+
+
+def synthetic_edit_log(species: List[str], sessions: int, skew: float = 1.2, reruns: int = 1,
+                       edits_per_session: int = 40, seed: int = 0) -> List[List[str]]:
+    """Teams after every edit of every session, popular species picked most."""
+    rnd = random.Random(seed)
+    weights = [1 / (rank + 1) ** skew for rank in range(len(species))]
+    log = []
+    for _ in range(sessions):
+        team: List[str] = []
+        for _ in range(edits_per_session):
+            action = rnd.random()
+            if team and (len(team) == 6 or action < 0.25):
+                if action < 0.6:
+                    team[rnd.randrange(len(team))] = rnd.choices(species, weights)[0]
+                else:
+                    team.pop(rnd.randrange(len(team)))
+            else:
+                team.append(rnd.choices(species, weights)[0])
+            log.extend(list(team) for _ in range(reruns))
+    return log
+
+
+def replay(log: List[List[str]], store: PokedexStore, cached: bool) -> float:
+    start = time.perf_counter()
+    if cached:
+        for team in log:
+            analyze_team_by_type(team, store)
+    else:
+        for team in log:
+            _analyze_matrix(get_team_defense_matrix(team, store))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("log", nargs="?", help="JSON Lines team edit log")
+    parser.add_argument("--sessions", type=int, default=2000)
+    parser.add_argument("--species", type=int, default=1400)
+    parser.add_argument("--skew", type=float, default=1.2, help="Zipf exponent of species popularity")
+    parser.add_argument("--reruns", type=int, default=2, help="analysis requests per edit")
+    args = parser.parse_args()
+
+    store = PokedexStore.from_dict(parse_pokedex(synthetic_pokedex(args.species)))
+    if args.log:
+        with open(args.log, encoding="utf-8") as f:
+            log = [json.loads(line) for line in f if line.strip()]
+    else:
+        species = list(store)
+        random.Random(1).shuffle(species)
+        log = synthetic_edit_log(species, args.sessions, args.skew, args.reruns)
+
+    uncached = replay(log, store, cached=False)
+    print(f"teams replayed: {len(log)}")
+    print(f"{'cache':<14}{'us/team':>10}{'hit rate':>10}{'evictions':>11}{'size':>8}")
+    print(f"{'none':<14}{uncached / len(log) * 1e6:>10.1f}{'-':>10}{'-':>11}{'-':>8}")
+
+    for maxsize in (256, 1024, ANALYSIS_CACHE.maxsize):
+        analysis_module.ANALYSIS_CACHE = cache = LRUCache(maxsize)
+        elapsed = replay(log, store, cached=True)
+        stats = cache.stats()
+        print(f"{f'LRU {maxsize}':<14}{elapsed / len(log) * 1e6:>10.1f}{stats['hit_rate']:>10.1%}"
+              f"{stats['evictions']:>11}{stats['size']:>8}")
+    analysis_module.ANALYSIS_CACHE = ANALYSIS_CACHE
+
+
+if __name__ == "__main__":
+    main()
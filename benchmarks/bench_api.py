@@ -0,0 +1,161 @@
+"""
+Load test for the JSON API (poketype.api) on localhost.
+
+Starts `python -m poketype.api` in a subprocess on a synthetic Pokedex
+snapshot (or targets --url), then runs --clients keep-alive connections
+for --duration seconds, each posting random teams drawn from a pool of
+--teams distinct teams. Reports requests/second and latency percentiles,
+plus the server's cache stats.
+
+Usage: python benchmarks/bench_api.py [--clients 8] [--duration 10]
+                                      [--endpoint analyze|batch] [--teams 500]
+"""
+
+import argparse
+import http.client
+import json
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional
+from urllib.parse import urlsplit
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from poketype.pokedex import SNAPSHOT_VERSION, parse_pokedex, write_snapshot
+from benchmarks.synthetic import synthetic_pokedex
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_ready(host: str, port: int, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection(host, port, timeout=1)
+            conn.request("GET", "/health")
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("API server did not start")
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def client(host: str, port: int, bodies: List[bytes], path: str, deadline: float,
+           latencies: List[float], errors: List[int], seed: int) -> None:
+    rnd = random.Random(seed)
+    conn = http.client.HTTPConnection(host, port)
+    headers = {"Content-Type": "application/json"}
+    while time.perf_counter() < deadline:
+        body = rnd.choice(bodies)
+        start = time.perf_counter()
+        try:
+            conn.request("POST", path, body=body, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            ok = response.status == 200
+        except OSError:
+            conn.close()
+            conn = http.client.HTTPConnection(host, port)
+            ok = False
+        latencies.append(time.perf_counter() - start)
+        if not ok:
+            errors.append(1)
+    conn.close()
+
+
+def run_load(host: str, port: int, bodies: List[bytes], path: str, clients: int, duration: float):
+    latencies: List[float] = []
+    errors: List[int] = []
+    deadline = time.perf_counter() + duration
+    threads = [
+        threading.Thread(target=client, args=(host, port, bodies, path, deadline, latencies, errors, seed))
+        for seed in range(clients)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sorted(latencies), len(errors), time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", help="existing API server (default: start one)")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--endpoint", choices=("analyze", "batch"), default="analyze")
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--teams", type=int, default=500, help="distinct teams in the request pool")
+    args = parser.parse_args()
+
+    pokemon = parse_pokedex(synthetic_pokedex())
+    rnd = random.Random(0)
+    species = list(pokemon)
+    teams = [rnd.sample(species, 6) for _ in range(args.teams)]
+    if args.endpoint == "analyze":
+        path = "/analyze"
+        bodies = [json.dumps({"team": team}).encode() for team in teams]
+    else:
+        path = "/analyze/batch"
+        bodies = [
+            json.dumps({"teams": rnd.sample(teams, min(args.batch_size, len(teams)))}).encode()
+            for _ in range(64)
+        ]
+
+    server: Optional[subprocess.Popen] = None
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.url:
+            url = urlsplit(args.url)
+            host, port = url.hostname, url.port
+        else:
+            snapshot_path = Path(tmp) / "pokedex.json.gz"
+            write_snapshot(snapshot_path, {
+                "version": SNAPSHOT_VERSION,
+                "fetched_at": time.time(),
+                "dataset_version": "bench",
+                "pokemon": pokemon,
+            })
+            host, port = "127.0.0.1", free_port()
+            server = subprocess.Popen(
+                [sys.executable, "-m", "poketype.api", "--port", str(port), "--snapshot", str(snapshot_path)],
+                cwd=str(ROOT), stderr=subprocess.DEVNULL,
+            )
+        try:
+            wait_ready(host, port)
+            latencies, errors, elapsed = run_load(host, port, bodies, path, args.clients, args.duration)
+            conn = http.client.HTTPConnection(host, port)
+            conn.request("GET", "/stats")
+            stats = json.loads(conn.getresponse().read())
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait()
+
+    print(f"endpoint: POST {path}, clients: {args.clients}, distinct teams: {args.teams}")
+    print(f"requests: {len(latencies)}, errors: {errors}, {len(latencies) / elapsed:.0f} req/s")
+    print("latency ms: " + ", ".join(
+        f"p{int(q * 100)} {percentile(latencies, q) * 1000:.2f}" for q in (0.5, 0.9, 0.99)
+    ) + f", max {latencies[-1] * 1000:.2f}")
+    response_cache = stats["response_cache"]
+    print(f"response cache: hit rate {response_cache['hit_rate']:.1%}, size {response_cache['size']}, "
+          f"evictions {response_cache['evictions']}")
+
+
+if __name__ == "__main__":
+    main()
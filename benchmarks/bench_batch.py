@@ -0,0 +1,50 @@
+"""
+Throughput benchmark for batched team scoring (teams/second).
+
+Usage: python benchmarks/bench_batch.py [N ...]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from poketype import engine
+from poketype.batch import SpeciesIndex, score_teams
+
+DEFAULT_SIZES = (1_000, 100_000, 1_000_000)
+
+
+def synthetic_pokedex():
+    """One species per mono/dual typing."""
+    return {
+        f"combo{code}": {"name": f"Combo {code}", "types": [engine.TYPES[i] for i in combo]}
+        for code, combo in enumerate(engine.COMBOS)
+    }
+
+
+def bench(n_teams: int, species: SpeciesIndex, repeat: int = 3) -> float:
+    rng = np.random.default_rng(n_teams)
+    teams = rng.integers(0, len(species), size=(n_teams, 6), dtype=np.int32)
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        score_teams(teams, species)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    species = SpeciesIndex(synthetic_pokedex())
+    print(f"{'teams':>10}  {'seconds':>9}  {'teams/s':>12}")
+    for n_teams in sizes:
+        elapsed = bench(n_teams, species)
+        print(f"{n_teams:>10}  {elapsed:>9.4f}  {n_teams / elapsed:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Coverage table render cost: one st.markdown per cell ("columns") vs a
+single HTML payload ("html"), for a 6-member team.
+
+Runs render_coverage_table inside Streamlit's AppTest harness against an
+offline synthetic Pokedex snapshot and reports elements sent, serialized
+payload bytes and server-side render time.
+
+Usage: python benchmarks/bench_coverage_render.py [runs]
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from poketype.pokedex import SNAPSHOT_VERSION, parse_pokedex, write_snapshot
+from benchmarks.synthetic import synthetic_pokedex
+
+SCRIPT = """
+import sys, time
+sys.path.insert(0, {root!r})
+import streamlit as st
+import streamlit_app as app
+
+team = list(app.POKEMON)[:6]
+start = time.perf_counter()
+app.render_coverage_table(team, mode={mode!r})
+st.session_state.render_ms = (time.perf_counter() - start) * 1000
+"""
+
+
+def walk(node):
+    """Yield every element and block below an AppTest node."""
+    for child in getattr(node, "children", {}).values():
+        yield child
+        yield from walk(child)
+
+
+def measure(mode: str, runs: int):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_string(SCRIPT.format(root=str(ROOT), mode=mode), default_timeout=60)
+    render_ms = []
+    for _ in range(runs):
+        at.run()
+        if at.exception:
+            raise RuntimeError(at.exception)
+        render_ms.append(at.session_state.render_ms)
+
+    nodes = list(walk(at.main))
+    elements = [node for node in nodes if not getattr(node, "children", None)]
+    payload = sum(node.proto.ByteSize() for node in nodes if getattr(node, "proto", None) is not None)
+    return len(elements), len(nodes), payload, statistics.median(render_ms)
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshot_path = Path(tmp) / "pokedex.json.gz"
+        write_snapshot(snapshot_path, {
+            "version": SNAPSHOT_VERSION,
+            "fetched_at": time.time(),
+            "dataset_version": "bench",
+            "pokemon": parse_pokedex(synthetic_pokedex()),
+        })
+        os.environ["POKEDEX_SNAPSHOT"] = str(snapshot_path)
+
+        print(f"{'mode':<10}{'elements':>10}{'deltas':>10}{'bytes':>10}{'render ms':>12}")
+        for mode in ("columns", "html"):
+            elements, deltas, payload, render_ms = measure(mode, runs)
+            print(f"{mode:<10}{elements:>10}{deltas:>10}{payload:>10}{render_ms:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
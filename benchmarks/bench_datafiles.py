@@ -0,0 +1,125 @@
+"""
+Loading the Showdown data files: sequential vs concurrent, buffered vs streamed.
+
+Against a local stand-in answering after --delay seconds per request:
+
+sequential:  one requests.get + json.loads per file, one after the other
+             (how load_all_pokemon fetches pokedex.json).
+concurrent:  poketype.datafiles.load_data_files, all files at once with
+             streamed parsing.
+
+Then the peak memory of parsing a learnsets-sized file from the complete
+body (bytes + parsed object alive together) vs streamed through
+JSONObjectStream into reduced entries.
+
+Usage: python benchmarks/bench_datafiles.py [n_species] [delay_seconds]
+"""
+
+import json
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from poketype.datafiles import DATA_FILES, BareKeyQuoter, JSONObjectStream, load_data_files
+from poketype.typechart import TYPES
+from benchmarks.standin import js_literal, serve
+from benchmarks.synthetic import synthetic_pokedex
+
+
+def synthetic_files(n_species: int) -> dict:
+    """Stand-in payloads shaped like Showdown's data files."""
+    rnd = random.Random(0)
+    pokedex = synthetic_pokedex(n_species)
+    moves = {
+        f"move{i}": {"num": i, "name": f"Move{i}", "type": rnd.choice(TYPES), "category": "Physical",
+                     "basePower": rnd.randrange(0, 150, 5), "accuracy": 100, "pp": 10, "priority": 0,
+                     "flags": {"protect": 1, "mirror": 1}, "target": "normal", "desc": "x" * 120}
+        for i in range(900)
+    }
+    learnsets = {
+        pokemon_id: {"learnset": {move: ["9M", "8L1", "7T"] for move in rnd.sample(list(moves), 80)}}
+        for pokemon_id in pokedex
+    }
+    abilities = {f"ability{i}": {"num": i, "name": f"Ability{i}", "rating": 3, "desc": "y" * 200} for i in range(310)}
+    formats_data = {pokemon_id: {"tier": rnd.choice(["OU", "UU", "RU", "NU"])} for pokemon_id in pokedex}
+    raw = {"pokedex": pokedex, "learnsets": learnsets, "moves": moves, "abilities": abilities,
+           "formats_data": formats_data}
+    files = {}
+    for name, data_file in DATA_FILES.items():
+        if data_file.bare_keys:
+            body = f"exports.Battle{name.title().replace('_', '')} = {js_literal(raw[name])};"
+        else:
+            body = json.dumps(raw[name])
+        files["/" + data_file.path] = body.encode("utf-8")
+    return files
+
+
+def sequential(base_url: str) -> float:
+    import requests
+
+    start = time.perf_counter()
+    for data_file in DATA_FILES.values():
+        text = requests.get(f"{base_url}/{data_file.path}", timeout=30).text
+        if data_file.bare_keys:
+            text = BareKeyQuoter().feed(text)
+        json.loads(text[text.index("{"):text.rindex("}") + 1])
+    return time.perf_counter() - start
+
+
+def peak_kib(fn) -> float:
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def main():
+    n_species = int(sys.argv[1]) if len(sys.argv) > 1 else 1400
+    delay = float(sys.argv[2]) if len(sys.argv) > 2 else 0.2
+    files = synthetic_files(n_species)
+
+    with serve(files) as server:
+        server.delay = delay
+        sequential_s = sequential(server.base_url)
+        load_data_files(base_url=server.base_url)  # open the pooled connections
+        _, timings = load_data_files(base_url=server.base_url)
+
+    print(f"species: {n_species}, stand-in delay: {delay:.2f} s per request")
+    print(f"{'file':<14}{'KiB':>10}{'headers ms':>12}{'total ms':>10}{'entries':>9}")
+    for name, timing in timings.items():
+        if name == "total":
+            continue
+        print(f"{name:<14}{timing['bytes'] / 1024:>10.0f}{timing['headers_seconds'] * 1000:>12.0f}"
+              f"{timing['seconds'] * 1000:>10.0f}{timing['entries']:>9}")
+    print(f"sequential:   {sequential_s * 1000:.0f} ms")
+    print(f"concurrent:   {timings['total']['seconds'] * 1000:.0f} ms")
+
+    body = files["/" + DATA_FILES["learnsets"].path]
+    reduce_entry = DATA_FILES["learnsets"].reduce_entry
+
+    def buffered():
+        text = body.decode("utf-8")
+        parsed = json.loads(text)
+        return {key: reduce_entry(entry) for key, entry in parsed.items()}
+
+    def streamed():
+        # Chunks as a response would deliver them; body itself is not counted
+        stream, data = JSONObjectStream(), {}
+        for offset in range(0, len(body), 1 << 16):
+            for key, entry in stream.feed(body[offset:offset + (1 << 16)].decode("utf-8")):
+                data[key] = reduce_entry(entry)
+        stream.close()
+        return data
+
+    assert buffered() == streamed()
+    print(f"learnsets ({len(body) / 1024:.0f} KiB) peak memory: buffered {peak_kib(buffered):.0f} KiB, "
+          f"streamed {peak_kib(streamed):.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Import-time budget for the headless core.
+
+Runs each import in a fresh interpreter and reports the median time.
+Exits non-zero if `import poketype` exceeds its budget or pulls in
+Streamlit, pandas, NumPy or requests, or if the analysis API import pulls
+in anything but NumPy or takes more than `import numpy` plus its own
+budget. The API needs NumPy, which alone takes 100 ms or more depending
+on the machine, so only the time on top of it is budgeted.
+
+Usage: python benchmarks/bench_import.py [--budget-ms 50] [--api-budget-ms 30] [--repeat 15]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+HEAVY_MODULES = ("streamlit", "pandas", "numpy", "requests")
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+{statement}
+elapsed = (time.perf_counter() - start) * 1000
+print(json.dumps({{"ms": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+# label -> (statement, budget option or None, heavy modules it may import)
+CASES = {
+    "import numpy": ("import numpy", None, ("numpy",)),
+    "import poketype": ("import poketype", "budget_ms", ()),
+    "core analysis API": ("from poketype import analyze_team_by_type, get_pokemon_weaknesses_resistances",
+                          "api_budget_ms", ("numpy",)),
+    "streamlit_app deps": ("import streamlit, pandas", None, HEAVY_MODULES),
+}
+
+
+def measure(statement: str, repeat: int):
+    samples = []
+    loaded = []
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", PROBE.format(statement=statement, heavy=HEAVY_MODULES)],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        )
+        result = json.loads(out.stdout)
+        samples.append(result["ms"])
+        loaded = result["loaded"]
+    return statistics.median(samples), loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--budget-ms", type=float, default=50.0)
+    parser.add_argument("--api-budget-ms", type=float, default=30.0,
+                        help="budget of the analysis API import on top of import numpy")
+    parser.add_argument("--repeat", type=int, default=15)
+    args = parser.parse_args()
+
+    failed = False
+    timings = {}
+    for label, (statement, budget_option, allowed) in CASES.items():
+        ms, loaded = measure(statement, args.repeat)
+        timings[label] = ms
+        print(f"{label:<20} {ms:>8.1f} ms  loads: {', '.join(loaded) or '-'}")
+        if budget_option is None:
+            continue
+        budget = getattr(args, budget_option)
+        if budget_option == "api_budget_ms":
+            budget += timings["import numpy"]
+        if ms > budget:
+            print(f"  over budget ({budget:.0f} ms)")
+            failed = True
+        unexpected = [module for module in loaded if module not in allowed]
+        if unexpected:
+            print(f"  heavy modules imported eagerly: {', '.join(unexpected)}")
+            failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
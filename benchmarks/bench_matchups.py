@@ -0,0 +1,78 @@
+"""
+Species-vs-species matchup matrix: build time, file size and query latency.
+
+Builds the matrix for a synthetic Pokedex in memory and into a memory-mapped
+.npy file, reloads it with mmap_mode="r" (what each worker process does) and
+times the row/column slice queries.
+
+Usage: python benchmarks/bench_matchups.py [n_species]
+"""
+
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from poketype.matchups import MatchupMatrix, build_matchup_matrix, matrix_path
+from poketype.pokedex import parse_pokedex
+from poketype.store import PokedexStore
+from poketype.threats import ThreatIndex
+from benchmarks.synthetic import synthetic_pokedex
+
+
+def median_us(fn, repeat: int = 500) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1e6)
+    return statistics.median(samples)
+
+
+def print_query_times(matchups: MatchupMatrix, pokemon_id: str, other_id: str) -> None:
+    # In a function so the memory map is released with it, before the
+    # temporary directory is removed
+    print(f"matchup(a, b):           {median_us(lambda: matchups.matchup(pokemon_id, other_id)):8.1f} us")
+    print(f"beats(X) (row + column): {median_us(lambda: matchups.beats(pokemon_id)):8.1f} us")
+    print(f"walls(X) (row):          {median_us(lambda: matchups.walls(pokemon_id)):8.1f} us")
+    print(f"threatened_by(X) (col):  {median_us(lambda: matchups.threatened_by(pokemon_id)):8.1f} us")
+
+
+def main():
+    n_species = int(sys.argv[1]) if len(sys.argv) > 1 else 1400
+    store = PokedexStore.from_dict(parse_pokedex(synthetic_pokedex(n_species)), version="bench")
+
+    start = time.perf_counter()
+    ThreatIndex(store)
+    profiles_ms = (time.perf_counter() - start) * 1000
+    # Warm the cached index shared by the builds below
+    _ = store.threat_index
+
+    start = time.perf_counter()
+    build_matchup_matrix(store)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        MatchupMatrix.load(store, tmp)
+        write_ms = (time.perf_counter() - start) * 1000
+        size = matrix_path(store, tmp).stat().st_size
+
+        start = time.perf_counter()
+        MatchupMatrix.load(store, tmp)
+        load_us = (time.perf_counter() - start) * 1e6
+
+        print(f"species: {len(store)}")
+        print(f"profile index build:     {profiles_ms:8.1f} ms")
+        print(f"matrix build (memory):   {build_ms:8.1f} ms")
+        print(f"matrix build + write:    {write_ms:8.1f} ms")
+        print(f"file size:               {size / 1024:8.1f} KiB")
+        print(f"memory-map load:         {load_us:8.1f} us")
+        print_query_times(MatchupMatrix.load(store, tmp), store.ids[len(store) // 2], store.ids[len(store) // 3])
+
+
+if __name__ == "__main__":
+    main()
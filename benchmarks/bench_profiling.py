@@ -0,0 +1,93 @@
+"""
+Profiling spans: overhead when disabled and when enabled.
+
+Times an empty block bare, inside a disabled span and inside an enabled
+span, the same for a @profiled no-op function, and a warm
+analyze_team_by_type call (which is @profiled) with profiling off and on.
+
+Usage: python benchmarks/bench_profiling.py [iterations]
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from poketype import profiling
+from poketype.analysis import analyze_team_by_type
+from poketype.pokedex import parse_pokedex
+from poketype.profiling import profiled, span
+from poketype.store import PokedexStore
+from benchmarks.synthetic import synthetic_pokedex
+
+
+def noop():
+    pass
+
+
+@profiled("noop")
+def profiled_noop():
+    pass
+
+
+def per_call_ns(func, iterations: int) -> float:
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        func(iterations)
+        best = min(best, (time.perf_counter() - start) / iterations * 1e9)
+    return best
+
+
+def bare(iterations):
+    for _ in range(iterations):
+        pass
+
+
+def with_span(iterations):
+    for _ in range(iterations):
+        with span("block"):
+            pass
+
+
+def call_noop(iterations):
+    for _ in range(iterations):
+        noop()
+
+
+def call_profiled(iterations):
+    for _ in range(iterations):
+        profiled_noop()
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    store = PokedexStore.from_dict(parse_pokedex(synthetic_pokedex()), version="bench")
+    rnd = random.Random(0)
+    teams = [rnd.sample(store.ids, 6) for _ in range(500)]
+
+    def analyses(count):
+        for i in range(count):
+            analyze_team_by_type(teams[i % len(teams)], store)
+
+    analyses(len(teams))
+    profiling.bind(profiling.SessionProfile())
+    print(f"{'':<28}{'disabled ns':>14}{'enabled ns':>14}")
+    bare_ns = per_call_ns(bare, iterations)
+    print(f"{'empty block (no span)':<28}{bare_ns:>14.1f}{'':>14}")
+    for label, func, count in (("empty block in span", with_span, iterations),
+                               ("no-op call", call_noop, iterations),
+                               ("@profiled no-op call", call_profiled, iterations),
+                               ("analyze_team_by_type warm", analyses, iterations // 20)):
+        profiling.set_enabled(False)
+        disabled = per_call_ns(func, count)
+        profiling.set_enabled(True)
+        enabled = per_call_ns(func, count)
+        print(f"{label:<28}{disabled:>14.1f}{enabled:>14.1f}")
+    profiling.set_enabled(False)
+
+
+if __name__ == "__main__":
+    main()
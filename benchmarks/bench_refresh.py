@@ -0,0 +1,85 @@
+"""
+Request-path latency of an expired Pokedex: blocking reload vs background refresh.
+
+Against a local stand-in that answers after --delay seconds, compares:
+
+blocking:    what a ttl expiry did, the rerun that finds the data stale
+             downloads and parses pokedex.json itself (load_snapshot).
+background:  DatasetRefresher.get() keeps serving the current store while
+             the refresh runs on its thread, then swaps it in.
+
+Then makes the stand-in fail and shows the old data kept and the failure
+counted in the refresher's metrics.
+
+Usage: python benchmarks/bench_refresh.py [n_species] [delay_seconds]
+"""
+
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from poketype.pokedex import load_snapshot, read_snapshot, write_snapshot
+from poketype.refresh import DatasetRefresher
+from benchmarks.standin import serve
+from benchmarks.synthetic import synthetic_pokedex
+
+
+def make_stale(path: Path) -> None:
+    snapshot = read_snapshot(path)
+    snapshot["fetched_at"] = 0
+    write_snapshot(path, snapshot)
+
+
+def main():
+    n_species = int(sys.argv[1]) if len(sys.argv) > 1 else 1400
+    delay = float(sys.argv[2]) if len(sys.argv) > 2 else 1.0
+    files = {"/pokedex.json": json.dumps(synthetic_pokedex(n_species)).encode("utf-8")}
+
+    with tempfile.TemporaryDirectory() as tmp, serve(files) as server:
+        url = server.base_url + "/pokedex.json"
+        path = Path(tmp) / "pokedex.json.gz"
+        load_snapshot(path, url)
+        server.delay = delay
+
+        # New content before each refresh, so it downloads and parses it in full
+        files["/pokedex.json"] = json.dumps(synthetic_pokedex(n_species + 1)).encode("utf-8")
+        make_stale(path)
+        start = time.perf_counter()
+        load_snapshot(path, url)
+        blocking_ms = (time.perf_counter() - start) * 1000
+
+        files["/pokedex.json"] = json.dumps(synthetic_pokedex(n_species + 2)).encode("utf-8")
+        make_stale(path)
+        refresher = DatasetRefresher(path, url)
+        old = refresher.get()
+        samples = []
+        start = time.perf_counter()
+        # Reruns arriving while the refresh is in flight
+        while refresher.get() is old and time.perf_counter() - start < delay + 30:
+            call = time.perf_counter()
+            refresher.get()
+            samples.append((time.perf_counter() - call) * 1e6)
+            time.sleep(0.01)
+        swapped_ms = (time.perf_counter() - start) * 1000
+
+        print(f"species: {n_species}, stand-in delay: {delay:.1f} s")
+        print(f"blocking reload:      {blocking_ms:.0f} ms on the request path")
+        print(f"background refresh:   get() median {statistics.median(samples):.1f} us over {len(samples)} "
+              f"calls, new store after {swapped_ms:.0f} ms")
+
+        refresher.refresh(wait=True)
+        server.fail = True
+        server.delay = 0
+        current = refresher.get()
+        refresher.refresh(wait=True)
+        print(f"failing stand-in:     old data kept: {refresher.get() is current}, "
+              f"metrics: {json.dumps(refresher.metrics.to_dict())}")
+
+
+if __name__ == "__main__":
+    main()
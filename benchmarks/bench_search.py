@@ -0,0 +1,75 @@
+"""
+Microbenchmark of the species search behind the Pokemon selector.
+
+Times SpeciesSearch queries (exact, prefix, typo, multi-word, filtered) on
+the fixture's real names and on a synthetic dex, and compares the selector
+options sent per rerun: every name of the generation before, at most
+SEARCH_LIMIT matches after.
+
+Usage: python benchmarks/bench_search.py [n_species]
+"""
+
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from poketype.indexes import ALL_GENERATIONS
+from poketype.pokedex import parse_pokedex
+from poketype.search import SpeciesSearch
+from poketype.store import PokedexStore
+from benchmarks.run import FIXTURE_PATH
+from benchmarks.synthetic import synthetic_pokedex
+
+SEARCH_LIMIT = 20
+
+FIXTURE_QUERIES = ("garchomp", "garch", "garchmp", "mega zard", "lando therian", "zard", "")
+
+
+def median_us(fn, repeat: int = 500) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1e6)
+    return statistics.median(samples)
+
+
+def bench(label: str, store: PokedexStore, queries) -> None:
+    start = time.perf_counter()
+    index = SpeciesSearch(store)
+    build_ms = (time.perf_counter() - start) * 1000
+    print(f"\n[{label}] species: {len(store)}, terms: {len(index.terms)}, one-time build: {build_ms:.1f} ms")
+    print(f"{'query':<24}{'us':>10}  top match")
+    for query in queries:
+        matches = index.search(query, SEARCH_LIMIT)
+        elapsed = median_us(lambda: index.search(query, SEARCH_LIMIT))
+        print(f"{query!r:<24}{elapsed:>10.1f}  {matches[0]['name'] if matches else '-'}")
+    filtered = median_us(lambda: index.search("mon", SEARCH_LIMIT, generation=4, types=["Water"],
+                                              form_types=["base"]))
+    print(f"{'filtered':<24}{filtered:>10.1f}")
+
+    all_names = store.indexes.selector_options(ALL_GENERATIONS).names
+    before = len(json.dumps(list(all_names)))
+    after = len(json.dumps([match["name"] for match in index.search("", SEARCH_LIMIT)]))
+    print(f"selector options per rerun: {len(all_names)} names ({before} bytes) -> "
+          f"{SEARCH_LIMIT} matches ({after} bytes)")
+
+
+def main():
+    n_species = int(sys.argv[1]) if len(sys.argv) > 1 else 1400
+    with open(FIXTURE_PATH, encoding="utf-8") as f:
+        fixture = PokedexStore.from_dict(parse_pokedex(json.load(f)))
+    bench("fixture", fixture, FIXTURE_QUERIES)
+
+    synthetic = PokedexStore.from_dict(parse_pokedex(synthetic_pokedex(n_species)))
+    names = [synthetic[pokemon_id]["name"] for pokemon_id in list(synthetic.ids)[::n_species // 4 or 1]]
+    queries = [name.lower() for name in names] + [name[:-1] + "x" for name in names] + [names[0][:3], ""]
+    bench(f"synthetic {n_species}", synthetic, queries)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Microbenchmark of the selector work done on every rerun of main().
+
+before: get_pokemon_by_generation over a plain dict, then building the
+        name -> id options (sorting all names for "All Generations").
+after:  PokedexStore.indexes lookups, built once per dataset version.
+
+Usage: python benchmarks/bench_selector.py [n_species]
+"""
+
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from poketype.analysis import get_pokemon_by_generation
+from poketype.indexes import ALL_GENERATIONS, PokedexIndexes
+from poketype.pokedex import parse_pokedex
+from poketype.store import PokedexStore
+from benchmarks.synthetic import synthetic_pokedex
+
+
+def rerun_before(pokemon_dict, selected_gen):
+    pokemon_by_gen = get_pokemon_by_generation(pokemon_dict)
+    gen_options = [ALL_GENERATIONS] + list(pokemon_by_gen.keys())
+    if selected_gen == ALL_GENERATIONS:
+        pokemon_options = {data["name"]: pid for pid, data in pokemon_dict.items()}
+        pokemon_list = sorted(pokemon_options.keys())
+    else:
+        pokemon_options = {name: pid for pid, name in pokemon_by_gen.get(selected_gen, [])}
+        pokemon_list = [name for _, name in pokemon_by_gen.get(selected_gen, [])]
+    return gen_options, [""] + pokemon_list, pokemon_options
+
+
+def rerun_after(store, selected_gen):
+    indexes = store.indexes
+    gen_options = (ALL_GENERATIONS,) + indexes.generation_labels
+    selector = indexes.selector_options(selected_gen)
+    return gen_options, ("",) + selector.names, selector.ids_by_name
+
+
+def median_us(fn, repeat: int = 200) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1e6)
+    return statistics.median(samples)
+
+
+def main():
+    n_species = int(sys.argv[1]) if len(sys.argv) > 1 else 1400
+    pokemon_dict = parse_pokedex(synthetic_pokedex(n_species))
+    store = PokedexStore.from_dict(pokemon_dict)
+
+    start = time.perf_counter()
+    PokedexIndexes(store)
+    build_ms = (time.perf_counter() - start) * 1000
+    store.indexes  # warm the cached indexes
+
+    print(f"species: {len(pokemon_dict)}, one-time index build: {build_ms:.1f} ms")
+    print(f"{'selection':<22}{'before us':>12}{'after us':>12}")
+    for selected_gen in (ALL_GENERATIONS, "Gen 4 - Sinnoh"):
+        before = median_us(lambda: rerun_before(pokemon_dict, selected_gen))
+        after = median_us(lambda: rerun_after(store, selected_gen))
+        print(f"{selected_gen:<22}{before:>12.1f}{after:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Memory and load latency of many sessions: per-session copies vs one shared store.
+
+copies: what st.cache_data does; the store is pickled once and every rerun
+        unpickles a fresh copy, which the session keeps alive through its
+        TeamState until the next rerun.
+shared: st.cache_resource returning the one frozen PokedexStore.
+
+Each simulated session loads the dataset, builds its TeamState and runs a
+search and a team analysis, as a rerun of the app does. Retained memory is
+measured with tracemalloc once every session is alive.
+
+Usage: python benchmarks/bench_sessions.py [n_species] [n_sessions]
+"""
+
+import pickle
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from poketype.analysis import ANALYSIS_CACHE, analyze_team_by_type
+from poketype.pokedex import parse_pokedex
+from poketype.store import DERIVED_CACHE, PokedexStore
+from poketype.team import TeamState
+from benchmarks.synthetic import synthetic_pokedex
+
+
+def simulate(load, teams):
+    """Sessions kept alive by the caller, and the median load time in ms."""
+    sessions, load_ms = [], []
+    for team in teams:
+        start = time.perf_counter()
+        store = load()
+        load_ms.append((time.perf_counter() - start) * 1000)
+        state = TeamState(store, team)
+        store.search_index.search(store[team[0]]["name"][:4])
+        analyze_team_by_type(team, store)
+        sessions.append({"team_state": state})
+    return sessions, statistics.median(load_ms)
+
+
+def measure(label, load, teams):
+    # Derived structures are built once either way; keep them out of the totals.
+    # Latency comes from an untraced run, tracemalloc slows allocations down
+    _, load_ms = simulate(load, teams)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    sessions, _ = simulate(load, teams)
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    print(f"{label:<10}{load_ms:>14.3f}{retained / 1024:>16.0f}{retained / 1024 / len(sessions):>14.1f}")
+    return sessions
+
+
+def main():
+    n_species = int(sys.argv[1]) if len(sys.argv) > 1 else 1400
+    n_sessions = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    store = PokedexStore.from_dict(parse_pokedex(synthetic_pokedex(n_species)), version=f"bench-{n_species}")
+    rnd = random.Random(0)
+    teams = [rnd.sample(store.ids, 6) for _ in range(n_sessions)]
+    payload = pickle.dumps(store, protocol=pickle.HIGHEST_PROTOCOL)
+
+    print(f"species: {n_species}, sessions: {n_sessions}, pickled store: {len(payload) / 1024:.0f} KiB")
+    print(f"{'':<10}{'load ms':>14}{'retained KiB':>16}{'KiB/session':>14}")
+    measure("copies", lambda: pickle.loads(payload), teams)
+    measure("shared", lambda: store, teams)
+    ANALYSIS_CACHE.clear()
+    DERIVED_CACHE.clear()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Startup time of the Pokedex snapshot against a local HTTP stand-in.
+
+Measures a cold start (no snapshot, full download), a warm start (fresh
+snapshot, no network) and a stale start revalidated with 304 Not Modified.
+
+Usage: python benchmarks/bench_snapshot.py [n_species]
+"""
+
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from poketype.pokedex import load_snapshot, read_snapshot, write_snapshot
+from benchmarks.standin import serve
+from benchmarks.synthetic import synthetic_pokedex
+
+
+def timed(fn, repeat: int = 1, setup=None) -> float:
+    """Median wall time in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    n_species = int(sys.argv[1]) if len(sys.argv) > 1 else 1400
+    payload = json.dumps(synthetic_pokedex(n_species)).encode("utf-8")
+
+    with tempfile.TemporaryDirectory() as tmp, serve({"/pokedex.json": payload}) as server:
+        path = Path(tmp) / "pokedex.json.gz"
+        url = server.base_url + "/pokedex.json"
+
+        cold_ms = timed(lambda: load_snapshot(path, url), repeat=5, setup=lambda: path.unlink(missing_ok=True))
+        warm_ms = timed(lambda: load_snapshot(path, url), repeat=20)
+
+        def make_stale():
+            snapshot = read_snapshot(path)
+            snapshot["fetched_at"] = 0
+            write_snapshot(path, snapshot)
+
+        before = server.not_modified
+        stale_ms = timed(lambda: load_snapshot(path, url), repeat=5, setup=make_stale)
+        revalidated = server.not_modified - before
+
+        print(f"species:          {n_species}")
+        print(f"pokedex.json:     {len(payload) / 1024:.0f} KiB")
+        print(f"snapshot file:    {path.stat().st_size / 1024:.0f} KiB")
+        print(f"cold start:       {cold_ms:.1f} ms (download + parse + write)")
+        print(f"warm start:       {warm_ms:.1f} ms (snapshot only)")
+        print(f"stale start:      {stale_ms:.1f} ms (304 revalidation, {revalidated}/5 not modified)")
+
+
+if __name__ == "__main__":
+    main()
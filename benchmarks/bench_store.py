@@ -0,0 +1,68 @@
+"""
+Memory footprint and per-session copy cost: Pokedex dict vs PokedexStore.
+
+st.cache_data pickles the cached value once and unpickles a fresh copy for
+every caller, so the per-session cost is one pickle.loads of the value.
+
+Usage: python benchmarks/bench_store.py [n_species]
+"""
+
+import pickle
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from poketype.pokedex import parse_pokedex
+from poketype.store import PokedexStore
+from benchmarks.synthetic import synthetic_pokedex
+
+
+def deep_sizeof(obj, seen=None) -> int:
+    """Approximate retained size, counting shared objects once."""
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    if isinstance(obj, np.ndarray):
+        return sys.getsizeof(obj) if obj.base is None else obj.nbytes
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    elif hasattr(obj, "__dict__"):
+        size += deep_sizeof(vars(obj), seen)
+    return size
+
+
+def copy_cost_ms(value, repeat: int = 30) -> float:
+    payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        pickle.loads(payload)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    n_species = int(sys.argv[1]) if len(sys.argv) > 1 else 1400
+    pokemon_dict = parse_pokedex(synthetic_pokedex(n_species))
+    store = PokedexStore.from_dict(pokemon_dict)
+
+    print(f"species: {len(pokemon_dict)}")
+    print(f"{'':<16}{'memory KiB':>12}{'pickle KiB':>12}{'copy ms':>10}")
+    for label, value in (("dict", pokemon_dict), ("PokedexStore", store)):
+        memory = deep_sizeof(value) / 1024
+        pickled = len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)) / 1024
+        print(f"{label:<16}{memory:>12.0f}{pickled:>12.0f}{copy_cost_ms(value):>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
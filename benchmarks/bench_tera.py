@@ -0,0 +1,42 @@
+"""
+Tera search: time of search_tera on random full teams.
+
+Reports the median and worst time, how many left x right half pairs were
+scored, and how often the best assignment beats the team without Tera.
+
+Usage: python benchmarks/bench_tera.py [n_teams] [n_species]
+"""
+
+import random
+import statistics
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from poketype.pokedex import parse_pokedex
+from poketype.store import PokedexStore
+from poketype.tera import search_tera
+from benchmarks.synthetic import synthetic_pokedex
+
+
+def main():
+    n_teams = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    n_species = int(sys.argv[2]) if len(sys.argv) > 2 else 1400
+    store = PokedexStore.from_dict(parse_pokedex(synthetic_pokedex(n_species)), version="bench")
+    rnd = random.Random(0)
+    teams = [rnd.sample(store.ids, 6) for _ in range(n_teams)]
+
+    print(f"species: {len(store)}, teams: {n_teams}")
+    print(f"{'abilities':<12}{'median ms':>12}{'max ms':>10}{'pairs':>12}{'improved':>10}")
+    for ability_mode in (None, "best"):
+        results = [search_tera(store, team, ability_mode=ability_mode) for team in teams]
+        elapsed = [result["elapsed"] * 1000 for result in results]
+        improved = sum(result["tera"] != [None] * len(team) for result, team in zip(results, teams))
+        pairs = statistics.median(result["pairs"] for result in results)
+        print(f"{str(ability_mode):<12}{statistics.median(elapsed):>12.1f}{max(elapsed):>10.1f}"
+              f"{pairs:>12.0f}{improved:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+"""
+Benchmark suite with regression gates.
+
+Runs offline against the checked-in fixture (benchmarks/fixtures/pokedex.json,
+a slice of Showdown's pokedex.json) and synthetic dexes scaled to 10k and
+100k species, timing the loading and analysis paths the app uses:
+
+    parse_pokedex                raw pokedex.json data -> Pokemon dict
+    PokedexStore.from_dict       Pokemon dict -> store (no index build)
+    get_pokemon_by_generation    on the parsed dict; on a new store (cold,
+                                 includes its index build) and on one whose
+                                 indexes are built (warm)
+    calc_multiplier              one attacking type vs one typing
+    summarize_team               cold analysis cache
+    analyze_team_by_type         cold and warm analysis cache
+    species_detail_cells         the HTML cells of render_team_details_table
+
+Every benchmark reports the median and best time per call in seconds.
+Results are written as JSON; --baseline compares them with a stored run and
+exits with status 1 when a benchmark is slower than the baseline by more
+than --threshold (a fraction, 0.25 = 25%).
+
+Usage:
+    python benchmarks/run.py [--sizes fixture,10000,100000] [--output results.json]
+    python benchmarks/run.py --baseline baseline.json [--threshold 0.25]
+    python benchmarks/run.py --compare-only results.json --baseline baseline.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Mapping, Optional
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from poketype.analysis import (ANALYSIS_CACHE, analyze_team_by_type, calc_multiplier, get_pokemon_by_generation,
+                               summarize_team)
+from poketype.html import species_detail_cells
+from poketype.pokedex import parse_pokedex
+from poketype.store import PokedexStore
+from poketype.typechart import TYPES
+from benchmarks.synthetic import synthetic_pokedex
+
+FIXTURE_PATH = Path(__file__).resolve().parent / "fixtures" / "pokedex.json"
+
+DEFAULT_SIZES = ("fixture", "10000", "100000")
+
+DEFAULT_THRESHOLD = 0.25
+
+# Samples per benchmark; each sample times `number` calls
+REPEAT = 5
+
+
+def raw_pokedex(size: str) -> Dict[str, Dict]:
+    """Raw pokedex.json data of a dataset name: "fixture" or a species count."""
+    if size == "fixture":
+        with open(FIXTURE_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    return synthetic_pokedex(int(size))
+
+
+def measure(func: Callable[[], object], number: int, repeat: int = REPEAT,
+            setup: Optional[Callable[[], object]] = None) -> Dict[str, float]:
+    """Median and best seconds per call over `repeat` samples of `number` calls."""
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / number)
+    return {"median": statistics.median(samples), "best": min(samples), "calls": number}
+
+
+def per_call(result: Dict[str, float], calls: int) -> Dict[str, float]:
+    """Rescale a measure() result whose single call made `calls` calls."""
+    return {"median": result["median"] / calls, "best": result["best"] / calls, "calls": calls}
+
+
+def run_dataset(size: str, repeat: int = REPEAT) -> Dict[str, Dict[str, float]]:
+    """All benchmarks on one dataset."""
+    raw = raw_pokedex(size)
+    pokemon_dict = parse_pokedex(raw)
+    store = PokedexStore.from_dict(pokemon_dict, version=f"bench-{size}")
+    rnd = random.Random(0)
+    ids = list(store.ids)
+    teams = [rnd.sample(ids, min(6, len(ids))) for _ in range(200)]
+    typings = [store[pokemon_id]["types"] for pokemon_id in rnd.choices(ids, k=200)]
+    # Larger dexes take longer per call, so fewer calls keep each sample short
+    scale = max(1, len(raw) // 1000)
+
+    def cold_analyses(analyze: Callable) -> Callable[[], None]:
+        def run():
+            ANALYSIS_CACHE.clear()
+            for team in teams:
+                analyze(team, store)
+        return run
+
+    def team_detail_cells():
+        for team in teams[:20]:
+            for pokemon_id in team:
+                species_detail_cells(pokemon_id, store[pokemon_id])
+
+    def multipliers():
+        for types in typings:
+            for atk_type in TYPES:
+                calc_multiplier(atk_type, types)
+
+    loads = max(1, 20 // scale)
+    # Unversioned stores, built outside the timing; each builds its indexes on first use
+    new_stores: List[PokedexStore] = []
+
+    def build_new_stores():
+        new_stores[:] = [PokedexStore.from_dict(pokemon_dict) for _ in range(loads)]
+
+    results = {
+        "parse_pokedex": measure(lambda: parse_pokedex(raw), loads, repeat),
+        "PokedexStore.from_dict": measure(lambda: PokedexStore.from_dict(pokemon_dict), loads, repeat),
+        "get_pokemon_by_generation[dict]": measure(lambda: get_pokemon_by_generation(pokemon_dict), loads, repeat),
+        "get_pokemon_by_generation[store-cold]": measure(lambda: get_pokemon_by_generation(new_stores.pop()),
+                                                         loads, repeat, setup=build_new_stores),
+        "get_pokemon_by_generation[store-warm]": measure(lambda: get_pokemon_by_generation(store), loads, repeat,
+                                                         setup=lambda: get_pokemon_by_generation(store)),
+        "calc_multiplier": per_call(measure(multipliers, 1, repeat), len(typings) * len(TYPES)),
+        "summarize_team": per_call(measure(cold_analyses(summarize_team), 1, repeat), len(teams)),
+        "analyze_team_by_type[cold]": per_call(measure(cold_analyses(analyze_team_by_type), 1, repeat), len(teams)),
+        "analyze_team_by_type[warm]": per_call(
+            measure(lambda: [analyze_team_by_type(team, store) for team in teams], 1, repeat,
+                    setup=lambda: [analyze_team_by_type(team, store) for team in teams]),
+            len(teams),
+        ),
+        "species_detail_cells": per_call(measure(team_detail_cells, 1, repeat),
+                                         sum(len(team) for team in teams[:20])),
+    }
+    ANALYSIS_CACHE.clear()
+    return results
+
+
+def run(sizes: List[str], repeat: int = REPEAT) -> Dict:
+    """Benchmark every dataset; results[dataset][benchmark] = timings."""
+    results = {}
+    for size in sizes:
+        start = time.perf_counter()
+        results[size] = run_dataset(size, repeat)
+        print(f"{size}: done in {time.perf_counter() - start:.1f} s", file=sys.stderr)
+    return {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare(current: Mapping, baseline: Mapping, threshold: float = DEFAULT_THRESHOLD) -> List[Dict]:
+    """
+    Rows of (dataset, benchmark, baseline, current, ratio, regressed) for the
+    benchmarks present in both runs. Median times are compared; a ratio
+    above 1 + threshold is a regression.
+    """
+    rows = []
+    for size, benchmarks in current["results"].items():
+        for name, timing in benchmarks.items():
+            base = baseline["results"].get(size, {}).get(name)
+            if base is None or base["median"] <= 0:
+                continue
+            ratio = timing["median"] / base["median"]
+            rows.append({
+                "dataset": size,
+                "benchmark": name,
+                "baseline": base["median"],
+                "current": timing["median"],
+                "ratio": ratio,
+                "regressed": ratio > 1 + threshold,
+            })
+    return rows
+
+
+def format_seconds(seconds: float) -> str:
+    if seconds >= 1:
+        return f"{seconds:.2f} s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds * 1e6:.2f} us"
+
+
+def print_results(results: Mapping) -> None:
+    for size, benchmarks in results["results"].items():
+        print(f"\n[{size}]")
+        for name, timing in benchmarks.items():
+            print(f"  {name:<40}{format_seconds(timing['median']):>12}{format_seconds(timing['best']):>12}")
+
+
+def print_comparison(rows: List[Dict], threshold: float) -> None:
+    print(f"\n{'dataset':<10}{'benchmark':<40}{'baseline':>12}{'current':>12}{'ratio':>8}")
+    for row in rows:
+        flag = "  REGRESSED" if row["regressed"] else ""
+        print(f"{row['dataset']:<10}{row['benchmark']:<40}{format_seconds(row['baseline']):>12}"
+              f"{format_seconds(row['current']):>12}{row['ratio']:>8.2f}{flag}")
+    regressed = sum(row["regressed"] for row in rows)
+    print(f"\n{regressed} of {len(rows)} benchmarks slower than baseline by more than {threshold:.0%}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the benchmark suite and compare with a baseline.")
+    parser.add_argument("--sizes", default=",".join(DEFAULT_SIZES),
+                        help="comma-separated datasets: fixture and/or species counts (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=REPEAT, help="samples per benchmark (default: %(default)s)")
+    parser.add_argument("--output", help="write the results JSON to this file")
+    parser.add_argument("--baseline", help="results JSON to compare with")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown as a fraction of the baseline (default: %(default)s)")
+    parser.add_argument("--compare-only", metavar="RESULTS",
+                        help="compare this results JSON with --baseline instead of running")
+    args = parser.parse_args(argv)
+
+    if args.compare_only:
+        if not args.baseline:
+            parser.error("--compare-only needs --baseline")
+        with open(args.compare_only, encoding="utf-8") as f:
+            results = json.load(f)
+    else:
+        results = run([size.strip() for size in args.sizes.split(",") if size.strip()], args.repeat)
+        print_results(results)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        rows = compare(results, baseline, args.threshold)
+        print_comparison(rows, args.threshold)
+        if any(row["regressed"] for row in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""
+Local HTTP stand-in for play.pokemonshowdown.com data files.
+Serves fixed payloads with ETag / Last-Modified validation, and can be made
+slow or failing to exercise refresh paths.
+"""
+
+import hashlib
+import json
+import re
+import threading
+from contextlib import contextmanager
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator
+
+_IDENTIFIER = re.compile(r"[A-Za-z_$][\w$]*")
+
+
+def js_literal(value) -> str:
+    """
+    A JavaScript literal the way Showdown writes its .js data files
+    (es3-stringified): identifier keys unquoted, everything else as JSON.
+    """
+    if isinstance(value, dict):
+        return "{%s}" % ",".join(
+            (key if _IDENTIFIER.fullmatch(key) else json.dumps(key)) + ":" + js_literal(item)
+            for key, item in value.items()
+        )
+    if isinstance(value, list):
+        return "[%s]" % ",".join(js_literal(item) for item in value)
+    return json.dumps(value)
+
+
+class StandinServer(ThreadingHTTPServer):
+    """Serves `files` (path -> bytes) on localhost."""
+
+    daemon_threads = True
+
+    def __init__(self, files: Dict[str, bytes]):
+        super().__init__(("127.0.0.1", 0), StandinHandler)
+        self.files = files
+        self.last_modified = formatdate(usegmt=True)
+        self.delay = 0.0
+        self.fail = False
+        # Paths answered with 500 even while fail is off
+        self.fail_paths = set()
+        self.requests = 0
+        self.not_modified = 0
+        # Headers of every request, in arrival order
+        self.request_headers = []
+        # TCP connections accepted, to check keep-alive reuse
+        self.connections = 0
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_GET(self):
+        server = self.server
+        server.requests += 1
+        server.request_headers.append(dict(self.headers))
+        if server.delay:
+            threading.Event().wait(server.delay)
+        payload = server.files.get(self.path)
+        failing = server.fail or self.path in server.fail_paths
+        if failing or payload is None:
+            self.send_response(500 if failing else 404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        etag = '"%s"' % hashlib.sha256(payload).hexdigest()[:16]
+        if self.headers.get("If-None-Match") == etag:
+            server.not_modified += 1
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", server.last_modified)
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+@contextmanager
+def serve(files: Dict[str, bytes]) -> Iterator[StandinServer]:
+    """Run a stand-in server on a background thread."""
+    server = StandinServer(files)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,53 @@
+"""
+Synthetic Showdown-format Pokedex data for offline benchmarks.
+"""
+
+import random
+from itertools import combinations
+from typing import Dict
+
+from poketype.typechart import TYPES
+
+FORMES = ["Mega", "Alola", "Galar", "Hisui", "Gmax", "Therian"]
+
+# Mostly abilities without a defensive effect, some with one
+ABILITIES = ["Pressure", "Intimidate", "Overgrow", "Blaze", "Torrent", "Sturdy", "Levitate", "Thick Fat",
+             "Flash Fire", "Water Absorb", "Volt Absorb", "Sap Sipper", "Heatproof", "Dry Skin"]
+
+
+def synthetic_pokedex(n_species: int = 1400, seed: int = 0) -> Dict[str, Dict]:
+    """
+    Raw pokedex.json-style entries: roughly one form per six base species,
+    dex numbers spread over all nine generations, one to three abilities.
+    """
+    rnd = random.Random(seed)
+    # Separate stream, so typings match the data from before abilities
+    ability_rnd = random.Random(seed + 1)
+
+    def abilities():
+        slots = ability_rnd.sample(ABILITIES, ability_rnd.randint(1, 3))
+        return dict(zip(("0", "1", "H"), slots))
+
+    typings = [[t] for t in TYPES] + [list(pair) for pair in combinations(TYPES, 2)]
+    pokedex = {}
+    num = 0
+    while len(pokedex) < n_species:
+        num += 1
+        name = f"Species{num}"
+        pokedex[name.lower()] = {
+            "num": (num - 1) % 1025 + 1,
+            "name": name,
+            "types": rnd.choice(typings),
+            "abilities": abilities(),
+        }
+        if num % 6 == 0 and len(pokedex) < n_species:
+            forme = rnd.choice(FORMES)
+            pokedex[f"{name}{forme}".lower()] = {
+                "num": (num - 1) % 1025 + 1,
+                "name": f"{name}-{forme}",
+                "baseSpecies": name,
+                "forme": forme,
+                "types": rnd.choice(typings),
+                "abilities": abilities(),
+            }
+    return pokedex
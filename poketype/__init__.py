@@ -0,0 +1,62 @@
+"""
+Pokemon type analysis core.
+
+Headless library behind the Streamlit app: type chart, Pokedex loader and
+team analysis. Importing the package is cheap; submodules (and NumPy,
+pandas, requests) are only imported when one of their names is first used.
+"""
+
+import importlib
+from typing import List
+
+from poketype.typechart import CHARTS, DEFAULT_CHART, TYPES, TYPE_CHART, chart_for_generation
+
+# Public name -> submodule that defines it
+_LAZY_EXPORTS = {
+    "calc_multiplier": "analysis",
+    "analyze_team_by_type": "analysis",
+    "summarize_team": "analysis",
+    "get_pokemon_weaknesses_resistances": "analysis",
+    "get_pokemon_by_generation": "analysis",
+    "get_team_defense_matrix": "analysis",
+    "get_risk_color": "analysis",
+    "team_combo_key": "analysis",
+    "team_profile_key": "analysis",
+    "ANALYSIS_CACHE": "analysis",
+    "get_pokemon": "dataset",
+    "set_pokemon": "dataset",
+    "load_pokedex": "pokedex",
+    "load_snapshot": "pokedex",
+    "DatasetRefresher": "refresh",
+    "parse_pokedex": "pokedex",
+    "load_data_files": "datafiles",
+    "PokedexStore": "store",
+    "SpeciesIndex": "batch",
+    "score_teams": "batch",
+    "suggest_completions": "optimizer",
+    "get_threats": "threats",
+    "find_cores": "cores",
+    "search_species": "search",
+    "ABILITY_MODES": "abilities",
+    "search_tera": "tera",
+    "TeamState": "team",
+    "RATINGS": "rating",
+    "RATING_COLORS": "rating",
+    "get_rating": "rating",
+    "get_net_score": "rating",
+}
+
+__all__ = ["TYPES", "TYPE_CHART", "CHARTS", "DEFAULT_CHART", "chart_for_generation"] + list(_LAZY_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name in _LAZY_EXPORTS:
+        module = importlib.import_module(f"poketype.{_LAZY_EXPORTS[name]}")
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module 'poketype' has no attribute {name!r}")
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
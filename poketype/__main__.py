@@ -0,0 +1,5 @@
+import sys
+
+from poketype.cli import main
+
+sys.exit(main())
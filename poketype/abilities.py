@@ -0,0 +1,182 @@
+"""
+Defensive ability modifiers.
+Abilities such as Levitate, Flash Fire or Thick Fat change a species'
+defensive profile. Each ability is a per-type factor applied to the type
+vector, and the result is snapped back to the x0 ... x4 classes the
+analysis counts. Modes choose what a species with several abilities gets:
+
+    "best"  the ability giving the best single-member net score
+    "all"   a modifier only counts if every possible ability has it
+            (per-type worst case, what the species always has)
+
+AbilityVectors compiles the vectors of a whole Pokedex once per dataset,
+chart and mode, so analyses with abilities are row lookups like type-only
+ones.
+"""
+
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from poketype import engine
+from poketype.batch import NET_SCORE_LUT, pack_defense_vectors
+from poketype.store import PokedexStore
+from poketype.typechart import DEFAULT_CHART
+
+ABILITY_MODES: Tuple[str, ...] = ("best", "all")
+
+# Attacking type -> damage factor. Filter, Solid Rock and Prism Armor only
+# scale super effective hits by 0.75, which never changes a class.
+ABILITY_MODIFIERS: Dict[str, Dict[str, float]] = {
+    "Levitate": {"Ground": 0},
+    "Earth Eater": {"Ground": 0},
+    "Flash Fire": {"Fire": 0},
+    "Well-Baked Body": {"Fire": 0},
+    "Water Absorb": {"Water": 0},
+    "Storm Drain": {"Water": 0},
+    "Dry Skin": {"Water": 0, "Fire": 1.25},
+    "Volt Absorb": {"Electric": 0},
+    "Lightning Rod": {"Electric": 0},
+    "Motor Drive": {"Electric": 0},
+    "Sap Sipper": {"Grass": 0},
+    "Thick Fat": {"Fire": 0.5, "Ice": 0.5},
+    "Heatproof": {"Fire": 0.5},
+    "Water Bubble": {"Fire": 0.5},
+    "Purifying Salt": {"Ghost": 0.5},
+    "Fluffy": {"Fire": 2},
+}
+
+# Only super effective hits connect
+WONDER_GUARD = "Wonder Guard"
+
+# Multiplier of each class code, as counted by analyze_team_by_type
+CLASS_MULTIPLIERS = np.array([0.0, 0.25, 0.5, 1.0, 2.0, 4.0])
+
+
+def build_ability_factors() -> Dict[str, np.ndarray]:
+    """18 damage factors in TYPES order for each ability in ABILITY_MODIFIERS."""
+    factors = {}
+    for ability, modifiers in ABILITY_MODIFIERS.items():
+        row = np.ones(engine.NUM_TYPES)
+        for atk_type, factor in modifiers.items():
+            row[engine.TYPE_INDEX[atk_type]] = factor
+        row.flags.writeable = False
+        factors[ability] = row
+    return factors
+
+
+ABILITY_FACTORS = build_ability_factors()
+
+
+def class_codes(vectors: np.ndarray) -> np.ndarray:
+    """
+    Nearest class code (index into CLASS_MULTIPLIERS) of each multiplier:
+    x1.25 counts as x1, x0.125 as x0.25 and x8 as x4.
+    """
+    positive = vectors > 0
+    exponents = np.rint(np.log2(np.where(positive, vectors, 1.0)))
+    codes = np.clip(exponents, -2, 2).astype(np.int8) + 3
+    codes[~positive] = 0
+    return codes
+
+
+def ability_vector(pokemon_types: Sequence[str], ability: str, chart: int = DEFAULT_CHART) -> np.ndarray:
+    """Snapped defensive vector of a typing with one ability."""
+    vector = engine.defense_vector(pokemon_types, chart)
+    if ability in ABILITY_FACTORS:
+        vector = vector * ABILITY_FACTORS[ability]
+    elif ability == WONDER_GUARD:
+        vector = np.where(vector >= 2, vector, 0.0)
+    return CLASS_MULTIPLIERS[class_codes(vector)]
+
+
+def species_vector(pokemon_types: Sequence[str], abilities: Sequence[str], mode: str,
+                   chart: int = DEFAULT_CHART) -> np.ndarray:
+    """Defensive vector of a typing whose ability is one of `abilities`, see ABILITY_MODES."""
+    if mode not in ABILITY_MODES:
+        raise ValueError(f"unknown ability mode {mode!r}, expected one of {ABILITY_MODES}")
+    # Abilities without a defensive effect all give the plain typing ("")
+    candidates = list(dict.fromkeys(
+        ability if ability in ABILITY_FACTORS or ability == WONDER_GUARD else "" for ability in abilities
+    ))
+    if len(candidates) <= 1:
+        return ability_vector(pokemon_types, candidates[0] if candidates else "", chart)
+    vectors = np.stack([ability_vector(pokemon_types, ability, chart) for ability in candidates])
+    if mode == "all":
+        return vectors.max(axis=0)
+    # Net score of each ability over the chart's types; ties keep slot order
+    scores = NET_SCORE_LUT[pack_defense_vectors(vectors)][:, list(engine.CHART_TYPE_IDS[chart])].sum(axis=1)
+    return vectors[int(np.argmax(scores))]
+
+
+class AbilityVectors:
+    """
+    Ability-aware defensive class codes of every species in a Pokedex.
+    Species sharing a typing and ability list are computed once.
+    """
+
+    def __init__(self, pokemon_dict: Mapping[str, Mapping], mode: str, chart: int = DEFAULT_CHART):
+        if mode not in ABILITY_MODES:
+            raise ValueError(f"unknown ability mode {mode!r}, expected one of {ABILITY_MODES}")
+        self.mode = mode
+        self.chart = chart
+        self.ids: List[str] = list(pokemon_dict)
+        self.position: Dict[str, int] = {pokemon_id: row for row, pokemon_id in enumerate(self.ids)}
+        groups: Dict[Tuple[Tuple[str, ...], Tuple[str, ...]], np.ndarray] = {}
+        codes = np.empty((len(self.ids), engine.NUM_TYPES), dtype=np.int8)
+        is_store = isinstance(pokemon_dict, PokedexStore)
+        for row, pokemon_id in enumerate(self.ids):
+            if is_store:
+                group = (tuple(pokemon_dict.get_types(row)), pokemon_dict.abilities[row])
+            else:
+                data = pokemon_dict[pokemon_id]
+                group = (tuple(data["types"]), tuple(data.get("abilities", ())))
+            group_codes = groups.get(group)
+            if group_codes is None:
+                group_codes = groups[group] = class_codes(species_vector(group[0], group[1], mode, chart))
+            codes[row] = group_codes
+        codes.flags.writeable = False
+        self.codes = codes
+
+    def vector(self, pokemon_id: str) -> np.ndarray:
+        return CLASS_MULTIPLIERS[self.codes[self.position[pokemon_id]]]
+
+    def team_key(self, team: Sequence[str]) -> Tuple[bytes, ...]:
+        """Sorted class-code rows of the known members, an analysis cache key."""
+        rows = [self.position[pokemon_id] for pokemon_id in team if pokemon_id in self.position]
+        return tuple(sorted(row.tobytes() for row in self.codes[rows]))
+
+
+def species_defense_vector(pokemon_id: str, pokemon_dict: Mapping[str, Mapping], mode: Optional[str],
+                           chart: int = DEFAULT_CHART) -> np.ndarray:
+    """Defensive vector of one species, with abilities applied unless mode is None."""
+    data = pokemon_dict[pokemon_id]
+    if mode is None:
+        return engine.defense_vector(data["types"], chart)
+    if isinstance(pokemon_dict, PokedexStore):
+        return pokemon_dict.ability_vectors(mode, chart).vector(pokemon_id)
+    return species_vector(data["types"], data.get("abilities", ()), mode, chart)
+
+
+def team_ability_key(team: Sequence[str], pokemon_dict: Mapping[str, Mapping], mode: str,
+                     chart: int = DEFAULT_CHART) -> Tuple[bytes, ...]:
+    """
+    Canonical key of a team under an ability mode: the sorted class-code
+    rows of its members. Like team_combo_key, team order and species
+    identity do not matter.
+    """
+    if isinstance(pokemon_dict, PokedexStore):
+        return pokemon_dict.ability_vectors(mode, chart).team_key(team)
+    rows = [
+        class_codes(species_vector(pokemon_dict[pokemon_id]["types"], pokemon_dict[pokemon_id].get("abilities", ()),
+                                   mode, chart)).tobytes()
+        for pokemon_id in team if pokemon_id in pokemon_dict
+    ]
+    return tuple(sorted(rows))
+
+
+def ability_key_matrix(key: Tuple[bytes, ...]) -> np.ndarray:
+    """(members x 18) defensive multiplier matrix of a team_ability_key."""
+    if not key:
+        return np.empty((0, engine.NUM_TYPES))
+    return CLASS_MULTIPLIERS[np.frombuffer(b"".join(key), dtype=np.int8).reshape(len(key), engine.NUM_TYPES)]
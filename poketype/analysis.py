@@ -0,0 +1,298 @@
+"""
+Team analysis by type.
+All functions that need the Pokedex take an optional pokemon_dict; when it is
+omitted the process-wide dataset from poketype.dataset is used. Functions
+that apply the type chart take a chart (see typechart.CHARTS), the current
+Gen 6+ chart by default; results only cover the types that chart has.
+Team functions also take an ability_mode (see abilities.ABILITY_MODES) to
+apply defensive abilities; None, the default, is type-only.
+"""
+
+from typing import TYPE_CHECKING, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from poketype import engine
+from poketype.abilities import ability_key_matrix, species_defense_vector, species_vector, team_ability_key
+from poketype.cache import LRUCache
+from poketype.dataset import get_pokemon
+from poketype.indexes import GENERATION_LABELS
+from poketype.profiling import profiled
+from poketype.rating import RATING_COLORS, get_net_score, get_rating
+from poketype.store import PokedexStore
+from poketype.typechart import DEFAULT_CHART, TYPES
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Team results shared by every session, keyed by the team's canonical profiles
+ANALYSIS_CACHE = LRUCache(maxsize=4096)
+
+
+def calc_multiplier(attack_type: str, pokemon_types: List[str], chart: int = DEFAULT_CHART) -> float:
+    """Calculate damage multiplier for an attack type vs a Pokemon's types."""
+    return engine.get_multiplier(attack_type, pokemon_types, chart)
+
+
+def get_team_defense_matrix(team: List[str], pokemon_dict: Optional[Mapping[str, Mapping]] = None,
+                            chart: int = DEFAULT_CHART, ability_mode: Optional[str] = None) -> np.ndarray:
+    """
+    Return the (members x 18) defensive multiplier matrix for a team.
+    Pokemon not found in the database are skipped.
+    """
+    if pokemon_dict is None:
+        pokemon_dict = get_pokemon()
+    if ability_mode is not None:
+        members = [pokemon_id for pokemon_id in team if pokemon_id in pokemon_dict]
+        if not members:
+            return np.empty((0, engine.NUM_TYPES))
+        return np.stack([
+            species_defense_vector(pokemon_id, pokemon_dict, ability_mode, chart) for pokemon_id in members
+        ])
+    if isinstance(pokemon_dict, PokedexStore):
+        return pokemon_dict.defense_matrix(team, chart)
+    return engine.defense_matrix(
+        [pokemon_dict[pokemon_id]["types"] for pokemon_id in team if pokemon_id in pokemon_dict], chart
+    )
+
+
+def team_combo_key(team: List[str], pokemon_dict: Optional[Mapping[str, Mapping]] = None) -> Tuple[Tuple, ...]:
+    """
+    Canonical key of a team for the analysis cache: the sorted multiset of
+    its members' type combinations. Team order and species identity do not
+    matter, only typings. Members are keyed as (combo code,), or as
+    (-1, *sorted type names) for typings outside the combo table.
+    Pokemon not found in the database are skipped.
+    """
+    if pokemon_dict is None:
+        pokemon_dict = get_pokemon()
+    if isinstance(pokemon_dict, PokedexStore):
+        rows = [pokemon_dict.position[pokemon_id] for pokemon_id in team if pokemon_id in pokemon_dict.position]
+        codes = pokemon_dict.combo[rows].tolist()
+        typings = [pokemon_dict.get_types(row) for row, code in zip(rows, codes) if code < 0]
+    else:
+        types_list = [pokemon_dict[pokemon_id]["types"] for pokemon_id in team if pokemon_id in pokemon_dict]
+        codes = [engine.combo_code(types) for types in types_list]
+        typings = [types for types, code in zip(types_list, codes) if code < 0]
+
+    members = [(code,) for code in codes if code >= 0]
+    members.extend((-1,) + tuple(sorted(types)) for types in typings)
+    return tuple(sorted(members))
+
+
+def team_profile_key(team: List[str], pokemon_dict: Optional[Mapping[str, Mapping]] = None,
+                     chart: int = DEFAULT_CHART, ability_mode: Optional[str] = None) -> Tuple:
+    """
+    Analysis cache key of a team: team_combo_key when type-only, else
+    ("abilities", mode, *team_ability_key), the members' ability-aware
+    class rows.
+    """
+    if ability_mode is None:
+        return team_combo_key(team, pokemon_dict)
+    if pokemon_dict is None:
+        pokemon_dict = get_pokemon()
+    return ("abilities", ability_mode) + team_ability_key(team, pokemon_dict, ability_mode, chart)
+
+
+def profile_key_matrix(key: Tuple, chart: int = DEFAULT_CHART) -> np.ndarray:
+    """(members x 18) defensive multiplier matrix of a team_profile_key."""
+    if key[:1] == ("abilities",):
+        return ability_key_matrix(key[2:])
+    return combo_key_matrix(key, chart)
+
+
+def combo_key_matrix(key: Tuple[Tuple, ...], chart: int = DEFAULT_CHART) -> np.ndarray:
+    """(members x 18) defensive multiplier matrix of a team_combo_key."""
+    table = engine.defense_table(chart)
+    if all(member[0] >= 0 for member in key):
+        return table[[member[0] for member in key]]
+    return np.stack([
+        table[member[0]] if member[0] >= 0 else engine.defense_vector(member[1:], chart)
+        for member in key
+    ])
+
+
+@profiled()
+def summarize_team(team: List[str], pokemon_dict: Optional[Mapping[str, Mapping]] = None,
+                   chart: int = DEFAULT_CHART, ability_mode: Optional[str] = None) -> "pd.DataFrame":
+    """
+    Generate a summary table of type effectiveness against the team.
+    Returns DataFrame with columns for each multiplier count and risk score.
+    Results are cached by team profiles; callers get their own copy.
+    """
+    import pandas as pd
+
+    if not team:
+        return pd.DataFrame()
+
+    key = team_profile_key(team, pokemon_dict, chart, ability_mode)
+    summary = ANALYSIS_CACHE.get_or_compute(
+        ("summary", chart, key), lambda: _summarize_matrix(profile_key_matrix(key, chart), chart)
+    )
+    return summary.copy()
+
+
+def _summarize_matrix(matrix: np.ndarray, chart: int = DEFAULT_CHART) -> "pd.DataFrame":
+    import pandas as pd
+
+    results = []
+
+    for atk_index in engine.CHART_TYPE_IDS[chart]:
+        atk_type = TYPES[atk_index]
+        multipliers = matrix[:, atk_index]
+
+        # Count multipliers
+        counts = {
+            "x0": int((multipliers == 0).sum()),
+            "x0.25": int((multipliers == 0.25).sum()),
+            "x0.5": int((multipliers == 0.5).sum()),
+            "x1": int((multipliers == 1).sum()),
+            "x2": int((multipliers == 2).sum()),
+            "x4": int((multipliers == 4).sum()),
+        }
+
+        # Calculate risk score
+        risk = (counts["x2"] + 2 * counts["x4"]
+                - counts["x0.5"] - 2 * counts["x0.25"] - 3 * counts["x0"])
+
+        worst = float(multipliers.max()) if len(multipliers) else 1
+        best = float(multipliers.min()) if len(multipliers) else 1
+
+        results.append({
+            "Type": atk_type,
+            "x0": counts["x0"],
+            "x0.25": counts["x0.25"],
+            "x0.5": counts["x0.5"],
+            "x1": counts["x1"],
+            "x2": counts["x2"],
+            "x4": counts["x4"],
+            "Worst": worst,
+            "Best": best,
+            "Risk": risk,
+        })
+
+    return pd.DataFrame(results)
+
+
+def get_risk_color(risk: int) -> str:
+    """Return color based on risk score."""
+    if risk <= -3:
+        return "#22c55e"
+    elif risk <= -1:
+        return "#86efac"
+    elif risk <= 1:
+        return "#fef08a"
+    elif risk <= 3:
+        return "#fca5a5"
+    else:
+        return "#ef4444"
+
+
+def get_pokemon_weaknesses_resistances(pokemon_types: List[str], chart: int = DEFAULT_CHART,
+                                       abilities: Sequence[str] = (),
+                                       ability_mode: Optional[str] = None) -> Tuple[List[str], List[str], List[str]]:
+    """
+    Calculate weaknesses, resistances and immunities for a Pokemon based on its types,
+    and on its abilities when an ability_mode is given.
+    Returns (weaknesses, resistances, immunities) as lists of type names.
+    """
+    weaknesses = []
+    resistances = []
+    immunities = []
+
+    if ability_mode is None:
+        vector = engine.defense_vector(pokemon_types, chart)
+    else:
+        vector = species_vector(pokemon_types, abilities, ability_mode, chart)
+
+    for atk_type, mult in zip(TYPES, vector.tolist()):
+        if mult == 0:
+            immunities.append(atk_type)
+        elif mult < 1:
+            resistances.append(atk_type)
+        elif mult > 1:
+            weaknesses.append(atk_type)
+
+    return weaknesses, resistances, immunities
+
+
+@profiled()
+def analyze_team_by_type(team: List[str], pokemon_dict: Optional[Mapping[str, Mapping]] = None,
+                         chart: int = DEFAULT_CHART, ability_mode: Optional[str] = None) -> List[Dict]:
+    """
+    Analyze team vulnerabilities by attacking type.
+    Returns list of dicts with detailed type analysis data.
+    Results are cached by chart and team profiles; callers get their own copies.
+    """
+    key = team_profile_key(team, pokemon_dict, chart, ability_mode)
+    analysis = ANALYSIS_CACHE.get_or_compute(
+        ("analyze", chart, key), lambda: _analyze_matrix(profile_key_matrix(key, chart), chart)
+    )
+    return [dict(item) for item in analysis]
+
+
+def _analyze_matrix(matrix: np.ndarray, chart: int = DEFAULT_CHART) -> List[Dict]:
+    results = []
+
+    # Per-type multiplier counts, one array op per bucket
+    immune_counts = (matrix == 0).sum(axis=0).tolist()       # x0
+    resist_4x_counts = (matrix == 0.25).sum(axis=0).tolist() # x0.25
+    resist_2x_counts = (matrix == 0.5).sum(axis=0).tolist()  # x0.5
+    neutral_counts = (matrix == 1).sum(axis=0).tolist()      # x1
+    weak_2x_counts = (matrix == 2).sum(axis=0).tolist()      # x2
+    weak_4x_counts = (matrix >= 4).sum(axis=0).tolist()      # x4
+
+    for atk_index in engine.CHART_TYPE_IDS[chart]:
+        atk_type = TYPES[atk_index]
+        immune_count = immune_counts[atk_index]
+        resist_4x_count = resist_4x_counts[atk_index]
+        resist_2x_count = resist_2x_counts[atk_index]
+        neutral_count = neutral_counts[atk_index]
+        weak_2x_count = weak_2x_counts[atk_index]
+        weak_4x_count = weak_4x_counts[atk_index]
+
+        net_score = get_net_score(immune_count, resist_4x_count, resist_2x_count, weak_2x_count, weak_4x_count)
+        rating = get_rating(immune_count, resist_4x_count, resist_2x_count, weak_2x_count, weak_4x_count, net_score)
+        rating_color = RATING_COLORS[rating]
+
+        results.append({
+            "type": atk_type,
+            "immune": immune_count,
+            "resist_4x": resist_4x_count,
+            "resist_2x": resist_2x_count,
+            "neutral": neutral_count,
+            "weak_2x": weak_2x_count,
+            "weak_4x": weak_4x_count,
+            "rating": rating,
+            "rating_color": rating_color,
+            "net_score": net_score
+        })
+
+    # Sort alphabetically by type name
+    results.sort(key=lambda x: x["type"])
+
+    return results
+
+
+@profiled()
+def get_pokemon_by_generation(pokemon_dict: Mapping[str, Mapping]) -> Dict[str, List[Tuple[str, str]]]:
+    """
+    Organize Pokemon by generation for the selector.
+    Returns dict with gen keys and list of (pokemon_id, display_name) tuples.
+    A PokedexStore answers from its precomputed indexes.
+    """
+    if isinstance(pokemon_dict, PokedexStore):
+        return {label: list(members) for label, members in pokemon_dict.indexes.by_generation.items()}
+
+    generations: Dict[str, List[Tuple[str, str]]] = {label: [] for label in GENERATION_LABELS.values()}
+
+    for pokemon_id, data in pokemon_dict.items():
+        gen = data.get("gen", 1)
+        gen_key = GENERATION_LABELS.get(gen, GENERATION_LABELS[1])
+        generations[gen_key].append((pokemon_id, data["name"]))
+
+    # Sort each generation by dex number then name
+    for gen_key in generations:
+        generations[gen_key].sort(key=lambda x: (pokemon_dict[x[0]]["num"], x[1]))
+
+    return generations
@@ -0,0 +1,308 @@
+"""
+Local HTTP JSON API over the analysis core.
+
+    python -m poketype.api --port 8000
+
+Endpoints (JSON in, JSON out):
+
+    GET  /health                        dataset size and version
+    GET  /stats                         response and analysis cache stats
+    GET  /species/<id or name>          one Pokedex entry
+    GET  /weaknesses?types=Fire,Flying  weaknesses, resistances, immunities
+    GET  /weaknesses?species=<id>       same, for a species' typing
+    POST /analyze        {"team": [...]}            analyze_team_by_type
+    POST /analyze/batch  {"teams": [[...], ...]}    one result per team
+
+Team members can be Pokedex ids or display names ("Rotom-Wash"); unknown
+names are listed per team and skipped. /weaknesses (generation=N) and the
+analyze endpoints ({"generation": N}) can use an older generation's type
+chart, and /weaknesses?species= (abilities=best|all) and the analyze
+endpoints ({"abilities": "best"}) can apply defensive abilities. Requests are served on one thread
+each, and the encoded analysis of every canonical team (see
+team_combo_key) is kept in an LRU response cache.
+"""
+
+import argparse
+import json
+import sys
+import traceback
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Mapping, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from poketype.abilities import ABILITY_MODES
+from poketype.analysis import (ANALYSIS_CACHE, analyze_team_by_type, get_pokemon_weaknesses_resistances,
+                               team_profile_key)
+from poketype.cache import LRUCache
+from poketype.showdown import resolve_species, resolve_team, species_name_index
+from poketype.typechart import DEFAULT_CHART, chart_for_generation
+
+# Request limits
+MAX_BODY_BYTES = 8 * 1024 * 1024
+MAX_BATCH_TEAMS = 1000
+MAX_TEAM_SIZE = 24
+
+RESPONSE_CACHE_SIZE = 8192
+
+
+class APIError(Exception):
+    """Error answered to the client with an HTTP status and a message."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class APIServer(ThreadingHTTPServer):
+    """Threaded JSON API over one Pokedex."""
+
+    daemon_threads = True
+
+    def __init__(self, pokemon_dict: Mapping[str, Mapping], host: str = "127.0.0.1", port: int = 8000,
+                 cache_size: int = RESPONSE_CACHE_SIZE):
+        super().__init__((host, port), APIHandler)
+        self.pokemon = pokemon_dict
+        self.name_index = species_name_index(pokemon_dict)
+        # Canonical team key -> encoded analysis JSON
+        self.response_cache = LRUCache(maxsize=cache_size)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def encoded_analysis(self, team: List[str], chart: int = DEFAULT_CHART,
+                         ability_mode: Optional[str] = None) -> bytes:
+        """JSON of analyze_team_by_type for resolved ids, cached by chart and canonical team."""
+        key = (chart, team_profile_key(team, self.pokemon, chart, ability_mode))
+        return self.response_cache.get_or_compute(
+            key, lambda: json.dumps(
+                analyze_team_by_type(team, self.pokemon, chart=chart, ability_mode=ability_mode)
+            ).encode()
+        )
+
+    def team_response(self, members: List, chart: int = DEFAULT_CHART, ability_mode: Optional[str] = None) -> bytes:
+        if not isinstance(members, list) or not all(isinstance(member, str) for member in members):
+            raise APIError(400, "a team must be a list of species ids or names")
+        if len(members) > MAX_TEAM_SIZE:
+            raise APIError(400, f"a team can have at most {MAX_TEAM_SIZE} members")
+        resolved = resolve_team(members, self.pokemon, self.name_index)
+        # Spliced so cached analyses are not decoded and re-encoded
+        return b'{"team":%s,"unknown":%s,"analysis":%s}' % (
+            json.dumps(resolved["species"]).encode(),
+            json.dumps(resolved["unknown"]).encode(),
+            self.encoded_analysis(resolved["species"], chart, ability_mode),
+        )
+
+
+class APIHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; avoid the delayed-ACK stall
+    disable_nagle_algorithm = True
+    server: APIServer
+
+    def log_message(self, format, *args):
+        pass
+
+    # -------------------------------------------------------------------------
+    # Plumbing
+    # -------------------------------------------------------------------------
+
+    def _send(self, status: int, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_body(self) -> Optional[bytes]:
+        """
+        Read the request body; None (and close the connection) if too large.
+        A malformed Content-Length raises APIError: the body cannot be
+        skipped, so the connection is closed too.
+        """
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.close_connection = True
+            raise APIError(400, "invalid Content-Length")
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            return None
+        return self.rfile.read(length)
+
+    def _read_json(self) -> Dict:
+        if self._body is None:
+            raise APIError(413, f"request body larger than {MAX_BODY_BYTES} bytes")
+        try:
+            payload = json.loads(self._body or b"{}")
+        except ValueError:
+            raise APIError(400, "request body is not valid JSON")
+        if not isinstance(payload, dict):
+            raise APIError(400, "request body must be a JSON object")
+        return payload
+
+    def _dispatch(self, routes: Dict[str, object]) -> None:
+        url = urlsplit(self.path)
+        path = url.path.rstrip("/") or "/"
+        try:
+            if path.startswith("/species/"):
+                handler, argument = routes.get("/species/"), unquote(path[len("/species/"):])
+            else:
+                handler, argument = routes.get(path), parse_qs(url.query)
+            if handler is None:
+                raise APIError(404, f"no endpoint {self.command} {path}")
+            status, body = handler(argument)
+        except APIError as e:
+            status, body = e.status, json.dumps({"error": e.message}).encode()
+        except Exception:
+            # Answer instead of dropping the connection; the details go to the server log
+            traceback.print_exc(file=sys.stderr)
+            status, body = 500, json.dumps({"error": "internal server error"}).encode()
+        self._send(status, body)
+
+    def do_GET(self):
+        self._dispatch({
+            "/health": self.get_health,
+            "/stats": self.get_stats,
+            "/species/": self.get_species,
+            "/weaknesses": self.get_weaknesses,
+        })
+
+    def do_POST(self):
+        # Always consumed, so errors do not leave it in a kept-alive connection
+        try:
+            self._body = self._read_body()
+        except APIError as e:
+            self._send(e.status, json.dumps({"error": e.message}).encode())
+            return
+        self._dispatch({
+            "/analyze": self.post_analyze,
+            "/analyze/batch": self.post_analyze_batch,
+        })
+
+    # -------------------------------------------------------------------------
+    # Endpoints
+    # -------------------------------------------------------------------------
+
+    def get_health(self, query) -> Tuple[int, bytes]:
+        pokemon = self.server.pokemon
+        return 200, json.dumps({
+            "status": "ok",
+            "species": len(pokemon),
+            "dataset_version": getattr(pokemon, "version", ""),
+        }).encode()
+
+    def get_stats(self, query) -> Tuple[int, bytes]:
+        return 200, json.dumps({
+            "response_cache": self.server.response_cache.stats(),
+            "analysis_cache": ANALYSIS_CACHE.stats(),
+        }).encode()
+
+    def get_species(self, name: str) -> Tuple[int, bytes]:
+        pokemon = self.server.pokemon
+        species_id = resolve_species(name, pokemon, self.server.name_index)
+        if species_id is None:
+            raise APIError(404, f"unknown species {name!r}")
+        return 200, json.dumps(dict(pokemon[species_id], id=species_id)).encode()
+
+    def get_weaknesses(self, query) -> Tuple[int, bytes]:
+        abilities: List[str] = []
+        ability_mode = None
+        if "species" in query:
+            name = query["species"][0]
+            species_id = resolve_species(name, self.server.pokemon, self.server.name_index)
+            if species_id is None:
+                raise APIError(404, f"unknown species {name!r}")
+            types = list(self.server.pokemon[species_id]["types"])
+            abilities = list(self.server.pokemon[species_id].get("abilities", ()))
+            ability_mode = parse_ability_mode(query["abilities"][0] if "abilities" in query else None)
+        elif "types" in query:
+            types = [t.strip() for value in query["types"] for t in value.split(",") if t.strip()]
+        else:
+            raise APIError(400, "pass types=Type1,Type2 or species=<id>")
+        chart = parse_chart(query["generation"][0] if "generation" in query else None)
+        weaknesses, resistances, immunities = get_pokemon_weaknesses_resistances(types, chart, abilities, ability_mode)
+        return 200, json.dumps({
+            "types": types,
+            "weaknesses": weaknesses,
+            "resistances": resistances,
+            "immunities": immunities,
+        }).encode()
+
+    def post_analyze(self, query) -> Tuple[int, bytes]:
+        payload = self._read_json()
+        if "team" not in payload:
+            raise APIError(400, 'expected {"team": [...]}')
+        return 200, self.server.team_response(payload["team"], parse_chart(payload.get("generation")),
+                                              parse_ability_mode(payload.get("abilities")))
+
+    def post_analyze_batch(self, query) -> Tuple[int, bytes]:
+        payload = self._read_json()
+        teams = payload.get("teams")
+        if not isinstance(teams, list):
+            raise APIError(400, 'expected {"teams": [[...], ...]}')
+        if len(teams) > MAX_BATCH_TEAMS:
+            raise APIError(413, f"at most {MAX_BATCH_TEAMS} teams per batch")
+        chart = parse_chart(payload.get("generation"))
+        ability_mode = parse_ability_mode(payload.get("abilities"))
+        results = [self.server.team_response(team, chart, ability_mode) for team in teams]
+        return 200, b'{"results":[%s]}' % b",".join(results)
+
+
+def parse_chart(generation) -> int:
+    """Type chart of a requested generation (None = current chart)."""
+    if generation is None:
+        return DEFAULT_CHART
+    try:
+        generation = int(generation)
+    except (TypeError, ValueError):
+        raise APIError(400, "generation must be an integer")
+    if generation < 1:
+        raise APIError(400, "generation must be 1 or later")
+    return chart_for_generation(generation)
+
+
+def parse_ability_mode(ability_mode) -> Optional[str]:
+    """Requested ability mode, None for type-only."""
+    if ability_mode is not None and ability_mode not in ABILITY_MODES:
+        raise APIError(400, f"abilities must be one of {', '.join(ABILITY_MODES)}")
+    return ability_mode
+
+
+def serve(pokemon_dict: Mapping[str, Mapping], host: str = "127.0.0.1", port: int = 8000) -> None:
+    """Serve the API until interrupted."""
+    server = APIServer(pokemon_dict, host, port)
+    print(f"Serving {len(pokemon_dict)} species on {server.base_url}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m poketype.api", description="Team coverage JSON API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--snapshot", help="Pokedex snapshot path (default: the shared cache)")
+    args = parser.parse_args(argv)
+
+    from poketype.pokedex import load_snapshot
+    from poketype.store import PokedexStore
+
+    try:
+        pokemon = PokedexStore.from_snapshot(load_snapshot(args.snapshot))
+    except Exception as e:
+        print(f"error: could not load the Pokedex: {e}", file=sys.stderr)
+        return 1
+    serve(pokemon, args.host, args.port)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,197 @@
+"""
+Batched team scoring.
+Scores many teams in one vectorized pass. Teams are given as an
+(N teams x slots) array of species indices into a SpeciesIndex, with -1 for
+empty slots, and the results match analyze_team_by_type team by team.
+"""
+
+from typing import Dict, List, Mapping, Sequence
+
+import numpy as np
+
+from poketype import engine
+from poketype.rating import RATINGS, RATING_COLORS
+from poketype.typechart import DEFAULT_CHART, TYPES
+
+# =============================================================================
+# MULTIPLIER CLASSES
+# Each class count is packed into 3 bits of an int32, so summing the packed
+# rows of up to 7 members counts all six classes at once without overflow.
+# =============================================================================
+
+COUNT_KEYS = ("immune", "resist_4x", "resist_2x", "neutral", "weak_2x", "weak_4x")
+
+CLASS_BITS = 3
+CLASS_MASK = (1 << CLASS_BITS) - 1
+MAX_SLOTS = CLASS_MASK
+
+CHUNK_SIZE = 65536
+
+
+def pack_defense_vectors(vectors: np.ndarray) -> np.ndarray:
+    """
+    Pack defensive multiplier vectors into per-type class bit fields.
+    Multipliers outside the coverage buckets (e.g. x0.125) are not counted,
+    same as analyze_team_by_type.
+    """
+    packed = np.zeros(vectors.shape, dtype=np.int32)
+    buckets = (
+        vectors == 0,
+        vectors == 0.25,
+        vectors == 0.5,
+        vectors == 1,
+        vectors == 2,
+        vectors >= 4,
+    )
+    for class_id, bucket in enumerate(buckets):
+        packed[bucket] = 1 << (CLASS_BITS * class_id)
+    return packed
+
+
+class SpeciesIndex:
+    """
+    Integer index over a Pokemon dict for batch scoring.
+    Species index i refers to ids[i]; the packed table has one extra all-zero
+    row at the end that empty (-1) slots resolve to.
+    """
+
+    def __init__(self, pokemon_dict: Mapping[str, Mapping], chart: int = DEFAULT_CHART):
+        self.chart = chart
+        self.ids: List[str] = list(pokemon_dict)
+        self.position: Dict[str, int] = {pokemon_id: i for i, pokemon_id in enumerate(self.ids)}
+        vectors = engine.defense_matrix([pokemon_dict[pokemon_id]["types"] for pokemon_id in self.ids], chart)
+        self.packed = np.zeros((len(self.ids) + 1, engine.NUM_TYPES), dtype=np.int32)
+        self.packed[:-1] = pack_defense_vectors(vectors)
+        self.packed.flags.writeable = False
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def encode_teams(self, teams: Sequence[Sequence[str]], slots: int = 6) -> np.ndarray:
+        """
+        Convert teams of species ids into an (N x slots) index array.
+        Unknown ids become empty slots, like analyze_team_by_type skipping them.
+        """
+        encoded = np.full((len(teams), slots), -1, dtype=np.int32)
+        for row, team in enumerate(teams):
+            codes = [self.position.get(pokemon_id, -1) for pokemon_id in team][:slots]
+            encoded[row, :len(codes)] = codes
+        return encoded
+
+
+# =============================================================================
+# BATCH SCORING
+# =============================================================================
+
+def rate_counts(counts: Dict[str, np.ndarray], net_score: np.ndarray) -> np.ndarray:
+    """Vectorized rating ladder, returns indices into RATINGS."""
+    immune = counts["immune"]
+    resisted = counts["resist_2x"] + counts["resist_4x"]
+    weak_2x = counts["weak_2x"]
+    weak_4x = counts["weak_4x"]
+    conditions = [
+        (immune >= 2) | ((immune >= 1) & (resisted >= 2)),
+        (immune >= 1) & (weak_2x == 0) & (weak_4x == 0),
+        net_score >= 6,
+        net_score >= 4,
+        net_score >= 2,
+        net_score >= 0,
+        net_score >= -2,
+        net_score >= -4,
+        net_score >= -6,
+        (weak_4x >= 2) | ((weak_4x >= 1) & (weak_2x >= 2)),
+    ]
+    choices = [RATINGS.index(r) for r in ("S+", "S", "A+", "A", "B+", "B", "C+", "C", "D", "F")]
+    return np.select(conditions, choices, default=RATINGS.index("E")).astype(np.int8)
+
+
+def unpack_counts(packed: np.ndarray) -> Dict[str, np.ndarray]:
+    """Split packed class fields back into the six multiplier counts."""
+    return {
+        key: ((packed >> (CLASS_BITS * class_id)) & CLASS_MASK).astype(np.int8)
+        for class_id, key in enumerate(COUNT_KEYS)
+    }
+
+
+def get_net_scores(counts: Dict[str, np.ndarray]) -> np.ndarray:
+    """Vectorized get_net_score."""
+    return (
+        counts["immune"].astype(np.int16) * 4
+        + counts["resist_4x"] * 3
+        + counts["resist_2x"] * 2
+        - counts["weak_2x"].astype(np.int16) * 2
+        - counts["weak_4x"] * 4
+    )
+
+
+def _build_lookup_tables():
+    """
+    Net score and rating for every possible packed value.
+    Rating a team is then a table lookup instead of the ladder.
+    """
+    packed = np.arange(1 << (CLASS_BITS * len(COUNT_KEYS)), dtype=np.int32)
+    counts = unpack_counts(packed)
+    net_score = get_net_scores(counts)
+    rating = rate_counts(counts, net_score)
+    net_score.flags.writeable = False
+    rating.flags.writeable = False
+    return net_score, rating
+
+
+# NET_SCORE_LUT[packed] / RATING_LUT[packed] for a single type's packed counts
+NET_SCORE_LUT, RATING_LUT = _build_lookup_tables()
+
+
+def score_teams(teams: np.ndarray, species: SpeciesIndex) -> Dict[str, np.ndarray]:
+    """
+    Score N teams at once.
+    Returns a dict of (N x 18) arrays in TYPES order: the six multiplier
+    counts (int8), "net_score" (int16) and "rating" (int8 index into RATINGS).
+    """
+    teams = np.asarray(teams)
+    if teams.ndim != 2 or teams.shape[1] > MAX_SLOTS:
+        raise ValueError(f"teams must be an (N x slots) array with at most {MAX_SLOTS} slots")
+
+    n_teams = teams.shape[0]
+    shape = (n_teams, engine.NUM_TYPES)
+    scores = {key: np.empty(shape, dtype=np.int8) for key in COUNT_KEYS}
+    scores["net_score"] = np.empty(shape, dtype=np.int16)
+    scores["rating"] = np.empty(shape, dtype=np.int8)
+    empty_row = len(species)
+
+    # Work in chunks to bound the size of temporaries
+    for start in range(0, n_teams, CHUNK_SIZE):
+        chunk = teams[start:start + CHUNK_SIZE]
+        rows = np.where(chunk < 0, empty_row, chunk)
+        packed = np.zeros((len(chunk), engine.NUM_TYPES), dtype=np.int32)
+        for slot in range(chunk.shape[1]):
+            packed += species.packed[rows[:, slot]]
+        stop = start + len(chunk)
+        for key, values in unpack_counts(packed).items():
+            scores[key][start:stop] = values
+        scores["net_score"][start:stop] = NET_SCORE_LUT[packed]
+        scores["rating"][start:stop] = RATING_LUT[packed]
+
+    return scores
+
+
+def get_team_results(scores: Dict[str, np.ndarray], team_row: int, chart: int = DEFAULT_CHART) -> List[Dict]:
+    """
+    Convert one team of score_teams output into the analyze_team_by_type
+    result shape (list of per-type dicts sorted by type name), keeping the
+    types of the chart the SpeciesIndex was built for.
+    """
+    results = []
+    for atk_index in engine.CHART_TYPE_IDS[chart]:
+        atk_type = TYPES[atk_index]
+        item = {"type": atk_type}
+        for key in COUNT_KEYS:
+            item[key] = int(scores[key][team_row, atk_index])
+        rating = RATINGS[scores["rating"][team_row, atk_index]]
+        item["rating"] = rating
+        item["rating_color"] = RATING_COLORS[rating]
+        item["net_score"] = int(scores["net_score"][team_row, atk_index])
+        results.append(item)
+
+    results.sort(key=lambda x: x["type"])
+    return results
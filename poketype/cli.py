@@ -0,0 +1,222 @@
+"""
+Command-line team analysis.
+
+Reads Pokemon Showdown team exports from files, directories or stdin,
+analyzes every team with analyze_team_by_type (and optionally
+summarize_team) and writes one JSON Lines record, or one CSV row per
+attacking type, per team.
+
+    python -m poketype teams.txt exports/ --format csv --workers 4
+    cat dump.txt | python -m poketype - > results.jsonl
+    python -m poketype gen3_teams.txt --generation 3
+
+--generation analyzes with the type chart of that generation, and
+--abilities best|all applies defensive abilities (see poketype.abilities).
+
+Input is streamed, and with --workers the teams are analyzed in a process
+pool with a bounded number of batches in flight; output keeps input order.
+"""
+
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, TextIO
+
+from poketype.abilities import ABILITY_MODES
+from poketype.analysis import analyze_team_by_type, summarize_team
+from poketype.dataset import set_pokemon
+from poketype.showdown import iter_teams, resolve_team, species_name_index
+from poketype.typechart import DEFAULT_CHART, chart_for_generation
+
+# Teams per task sent to a worker, and batches in flight per worker
+BATCH_SIZE = 64
+BATCHES_PER_WORKER = 4
+
+COUNT_COLUMNS = ("immune", "resist_4x", "resist_2x", "neutral", "weak_2x", "weak_4x", "rating", "net_score")
+SUMMARY_COLUMNS = ("Worst", "Best", "Risk")
+
+# Per-process dataset, set by _init_worker
+_POKEMON: Mapping[str, Mapping] = {}
+_NAME_INDEX: Dict[str, str] = {}
+_WITH_SUMMARY = False
+_CHART = DEFAULT_CHART
+_ABILITY_MODE: Optional[str] = None
+
+
+def iter_input_files(paths: List[str]) -> Iterator[str]:
+    """Expand directories (recursively, sorted) into files; "-" is stdin."""
+    for path in paths:
+        if path != "-" and Path(path).is_dir():
+            for child in sorted(Path(path).rglob("*")):
+                if child.is_file():
+                    yield str(child)
+        else:
+            yield path
+
+
+def iter_source_teams(paths: List[str]) -> Iterator[Dict]:
+    """Teams from every input, tagged with their source and position in it."""
+    for path in iter_input_files(paths):
+        if path == "-":
+            teams = iter_teams(sys.stdin)
+            for index, team in enumerate(teams):
+                yield dict(team, source="<stdin>", team=index)
+            continue
+        with open(path, encoding="utf-8", errors="replace") as f:
+            for index, team in enumerate(iter_teams(f)):
+                yield dict(team, source=path, team=index)
+
+
+def _init_worker(pokemon_dict: Mapping[str, Mapping], with_summary: bool, chart: int = DEFAULT_CHART,
+                 ability_mode: Optional[str] = None) -> None:
+    global _POKEMON, _NAME_INDEX, _WITH_SUMMARY, _CHART, _ABILITY_MODE
+    _POKEMON = pokemon_dict
+    _NAME_INDEX = species_name_index(pokemon_dict)
+    _WITH_SUMMARY = with_summary
+    _CHART = chart
+    _ABILITY_MODE = ability_mode
+    set_pokemon(pokemon_dict)
+
+
+def analyze_export_team(team: Dict) -> Dict:
+    """Resolve and analyze one parsed team into an output record."""
+    resolved = resolve_team(team["species"], _POKEMON, _NAME_INDEX)
+    record = {
+        "source": team["source"],
+        "team": team["team"],
+        "name": team["name"],
+        "format": team["format"],
+        "species": resolved["species"],
+        "unknown": resolved["unknown"],
+        "analysis": analyze_team_by_type(resolved["species"], _POKEMON, chart=_CHART, ability_mode=_ABILITY_MODE),
+    }
+    if _WITH_SUMMARY:
+        summary = summarize_team(resolved["species"], _POKEMON, chart=_CHART, ability_mode=_ABILITY_MODE)
+        record["summary"] = summary.to_dict("records")
+    return record
+
+
+def _analyze_batch(teams: List[Dict]) -> List[Dict]:
+    return [analyze_export_team(team) for team in teams]
+
+
+def analyze_teams(teams: Iterable[Dict], pokemon_dict: Mapping[str, Mapping], workers: int = 1,
+                  with_summary: bool = False, chart: int = DEFAULT_CHART,
+                  ability_mode: Optional[str] = None) -> Iterator[Dict]:
+    """
+    Analyze parsed teams in input order. With workers > 1 batches of teams
+    go to a process pool, at most BATCHES_PER_WORKER per worker in flight,
+    so memory stays bounded however long the input is.
+    """
+    if workers <= 1:
+        _init_worker(pokemon_dict, with_summary, chart, ability_mode)
+        for team in teams:
+            yield analyze_export_team(team)
+        return
+
+    teams = iter(teams)
+    with multiprocessing.Pool(workers, initializer=_init_worker, initargs=(pokemon_dict, with_summary, chart, ability_mode)) as pool:
+        pending = deque()
+        while True:
+            while len(pending) < workers * BATCHES_PER_WORKER:
+                batch = list(islice(teams, BATCH_SIZE))
+                if not batch:
+                    break
+                pending.append(pool.apply_async(_analyze_batch, (batch,)))
+            if not pending:
+                break
+            yield from pending.popleft().get()
+
+
+def write_jsonl(records: Iterable[Dict], out: TextIO) -> int:
+    count = 0
+    for record in records:
+        out.write(json.dumps(record, ensure_ascii=False))
+        out.write("\n")
+        count += 1
+    return count
+
+
+def write_csv(records: Iterable[Dict], out: TextIO, with_summary: bool = False) -> int:
+    """One row per team and attacking type."""
+    writer = csv.writer(out, lineterminator="\n")
+    header = ["source", "team", "name", "format", "species", "unknown", "type"] + list(COUNT_COLUMNS)
+    if with_summary:
+        header += list(SUMMARY_COLUMNS)
+    writer.writerow(header)
+
+    count = 0
+    for record in records:
+        prefix = [record["source"], record["team"], record["name"], record["format"],
+                  " ".join(record["species"]), " ".join(record["unknown"])]
+        summary = {row["Type"]: row for row in record.get("summary", [])}
+        for item in record["analysis"]:
+            row = prefix + [item["type"]] + [item[column] for column in COUNT_COLUMNS]
+            if with_summary:
+                type_summary = summary.get(item["type"], {})
+                row += [type_summary.get(column, "") for column in SUMMARY_COLUMNS]
+            writer.writerow(row)
+        count += 1
+    return count
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m poketype",
+        description="Analyze the defensive type coverage of Pokemon Showdown team exports.",
+    )
+    parser.add_argument("paths", nargs="*", default=["-"],
+                        help="export files or directories, - for stdin (default)")
+    parser.add_argument("--format", choices=("jsonl", "csv"), default="jsonl", dest="output_format")
+    parser.add_argument("-o", "--output", help="output file (default: stdout)")
+    parser.add_argument("--workers", type=int, default=1, help="analysis processes (default: 1)")
+    parser.add_argument("--summary", action="store_true", help="include summarize_team results")
+    parser.add_argument("--generation", type=int, help="use this generation's type chart (default: current)")
+    parser.add_argument("--abilities", choices=ABILITY_MODES, dest="ability_mode",
+                        help="apply defensive abilities: each species' best one, or only what all its abilities share")
+    parser.add_argument("--snapshot", help="Pokedex snapshot path (default: the shared cache)")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    for path in args.paths:
+        if path != "-" and not Path(path).exists():
+            print(f"error: {path} does not exist", file=sys.stderr)
+            return 2
+
+    from poketype.pokedex import load_snapshot
+    from poketype.store import PokedexStore
+
+    start = time.perf_counter()
+    try:
+        pokemon = PokedexStore.from_snapshot(load_snapshot(args.snapshot))
+    except Exception as e:
+        print(f"error: could not load the Pokedex: {e}", file=sys.stderr)
+        return 1
+
+    records = analyze_teams(iter_source_teams(args.paths), pokemon, args.workers, args.summary,
+                            chart_for_generation(args.generation), args.ability_mode)
+    out = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+    try:
+        if args.output_format == "csv":
+            count = write_csv(records, out, args.summary)
+        else:
+            count = write_jsonl(records, out)
+    except BrokenPipeError:
+        # Output piped into head & co.; silence the flush at exit
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    finally:
+        if args.output:
+            out.close()
+
+    print(f"{count} teams analyzed in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+    return 0
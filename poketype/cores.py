@@ -0,0 +1,165 @@
+"""
+Defensive core finder.
+A defensive core is a set of 2 or 3 typings where every member's
+weaknesses are resisted (or ignored) by at least one partner. Cores are
+enumerated over the type combinations present in a Pokedex, not over
+species: each typing's weaknesses and resistances/immunities (the sets
+get_pokemon_weaknesses_resistances returns) are 18-bit masks, so checking
+all ~800k three-typing cores is a handful of bitwise array ops. Valid cores
+are ranked by net score and mapped back to the species of each typing.
+"""
+
+from typing import Collection, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from poketype import engine
+from poketype.batch import NET_SCORE_LUT, pack_defense_vectors
+from poketype.optimizer import RATING_POINTS_LUT
+from poketype.store import PokedexStore
+from poketype.typechart import DEFAULT_CHART, TYPES
+
+CORE_SIZES: Tuple[int, ...] = (2, 3)
+
+
+def type_masks(vectors: np.ndarray, type_ids: Collection[int]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Weakness and resistance-or-immunity bit masks (bit i = TYPES[i]) of each
+    row of a (rows x 18) defensive matrix, over the given attacking types.
+    """
+    bits = np.zeros(engine.NUM_TYPES, dtype=np.int64)
+    bits[list(type_ids)] = 1 << np.array(list(type_ids), dtype=np.int64)
+    weak = ((vectors > 1) * bits).sum(axis=1)
+    cover = ((vectors < 1) * bits).sum(axis=1)
+    return weak, cover
+
+
+class DefensiveCores:
+    """
+    Every valid 2- and 3-typing core of one Pokedex under a type chart.
+    cores[size] is a (cores x size) array of engine.COMBOS codes, best net
+    score first; net_score[size] and rating_points[size] are aligned with it.
+    """
+
+    def __init__(self, pokemon_dict: Mapping[str, Mapping], chart: int = DEFAULT_CHART):
+        self.chart = chart
+        chart_types = engine.CHART_TYPE_IDS[chart]
+        chart_type_set = set(chart_types)
+
+        # Species of each typing the chart has, in Pokedex order
+        species: Dict[int, List[str]] = {}
+        if isinstance(pokemon_dict, PokedexStore):
+            ids, codes = pokemon_dict.ids, pokemon_dict.combo.tolist()
+        else:
+            ids = list(pokemon_dict)
+            codes = [engine.combo_code(pokemon_dict[pokemon_id]["types"]) for pokemon_id in ids]
+        for pokemon_id, code in zip(ids, codes):
+            if code >= 0 and chart_type_set.issuperset(engine.COMBOS[code]):
+                species.setdefault(code, []).append(pokemon_id)
+        self.species: Dict[int, Tuple[str, ...]] = {code: tuple(members) for code, members in species.items()}
+        self.combos = np.array(sorted(species), dtype=np.intp)
+
+        vectors = engine.defense_table(chart)[self.combos]
+        self.weak, self.cover = type_masks(vectors, chart_types)
+        self.packed = pack_defense_vectors(vectors)
+        self._chart_types = list(chart_types)
+
+        self.cores: Dict[int, np.ndarray] = {}
+        self.net_score: Dict[int, np.ndarray] = {}
+        self.rating_points: Dict[int, np.ndarray] = {}
+        for size, rows in ((2, self._pairs()), (3, self._triples())):
+            self._rank(size, rows)
+
+    def _pairs(self) -> np.ndarray:
+        """(cores x 2) row indices of the valid two-typing cores."""
+        first, second = np.triu_indices(len(self.combos), k=1)
+        weak, cover = self.weak, self.cover
+        valid = ((weak[first] & ~cover[second]) == 0) & ((weak[second] & ~cover[first]) == 0)
+        return np.stack([first[valid], second[valid]], axis=1)
+
+    def _triples(self) -> np.ndarray:
+        """
+        (cores x 3) row indices of the valid three-typing cores. For a pair
+        (i, j), `need` is what neither covers of the other's weaknesses and
+        must be covered by the third member k, whose own weaknesses must be
+        covered by i or j.
+        """
+        size = len(self.combos)
+        first, second = np.triu_indices(size, k=1)
+        weak, cover = self.weak, self.cover
+        need = (weak[first] & ~cover[second]) | (weak[second] & ~cover[first])
+        union = cover[first] | cover[second]
+        third = np.arange(size)
+        valid = (
+            ((need[:, None] & ~cover[None, :]) == 0)
+            & ((weak[None, :] & ~union[:, None]) == 0)
+            & (third[None, :] > second[:, None])
+        )
+        pair_rows, thirds = np.nonzero(valid)
+        return np.stack([first[pair_rows], second[pair_rows], thirds], axis=1)
+
+    def _rank(self, size: int, rows: np.ndarray) -> None:
+        totals = self.packed[rows].sum(axis=1)[:, self._chart_types]
+        net_score = NET_SCORE_LUT[totals].sum(axis=1).astype(np.int32)
+        rating_points = RATING_POINTS_LUT[totals].sum(axis=1).astype(np.int32)
+        # Best net score, then rating points, then combo order
+        order = np.lexsort(tuple(rows[:, ::-1].T) + (-rating_points, -net_score))
+        self.cores[size] = self.combos[rows[order]]
+        self.net_score[size] = net_score[order]
+        self.rating_points[size] = rating_points[order]
+
+    def top(self, size: int = 3, limit: Optional[int] = 10, generation: Optional[int] = None,
+            form_types: Optional[Collection[str]] = None,
+            pokemon_dict: Optional[Mapping[str, Mapping]] = None) -> List[Dict]:
+        """
+        Best cores of a size. generation and form_types keep only species
+        matching them (read from pokemon_dict, which must be the Pokedex
+        the cores were built from); cores with a typing left without
+        species are skipped.
+        """
+        if size not in CORE_SIZES:
+            raise ValueError(f"unknown core size {size}, expected one of {CORE_SIZES}")
+        species = self.species
+        if generation is not None or form_types is not None:
+            allowed = None if form_types is None else set(form_types)
+            species = {
+                code: tuple(
+                    pokemon_id for pokemon_id in members
+                    if (generation is None or pokemon_dict[pokemon_id].get("gen", 1) == generation)
+                    and (allowed is None or pokemon_dict[pokemon_id].get("form_type", "base") in allowed)
+                )
+                for code, members in species.items()
+            }
+
+        results = []
+        for core, net_score, rating_points in zip(self.cores[size].tolist(), self.net_score[size].tolist(),
+                                                  self.rating_points[size].tolist()):
+            if not all(species[code] for code in core):
+                continue
+            results.append({
+                "types": [[TYPES[type_id] for type_id in engine.COMBOS[code]] for code in core],
+                "species": [list(species[code]) for code in core],
+                "net_score": net_score,
+                "rating_points": rating_points,
+            })
+            if limit is not None and len(results) >= limit:
+                break
+        return results
+
+
+def find_cores(pokemon_dict: Optional[Mapping[str, Mapping]] = None, size: int = 3,
+               chart: int = DEFAULT_CHART, **filters) -> List[Dict]:
+    """
+    Best defensive cores of a size among the typings of a Pokedex.
+    A versioned PokedexStore keeps its DefensiveCores per chart across
+    calls; plain dicts build one per call. See DefensiveCores.top for
+    filters.
+    """
+    if pokemon_dict is None:
+        from poketype.dataset import get_pokemon
+        pokemon_dict = get_pokemon()
+    if isinstance(pokemon_dict, PokedexStore):
+        cores = pokemon_dict.defensive_cores(chart)
+    else:
+        cores = DefensiveCores(pokemon_dict, chart)
+    return cores.top(size, pokemon_dict=pokemon_dict, **filters)
@@ -0,0 +1,290 @@
+"""
+Concurrent loading of Pokemon Showdown data files.
+
+    data, timings = load_data_files(["pokedex", "learnsets", "moves"])
+
+Every requested file is fetched at once: one asyncio task per file, each
+streaming its response on a worker thread through a shared requests
+Session (pooled keep-alive connections, reused across loads). Responses
+are never held whole: chunks feed a JSONObjectStream that yields the
+top-level entries as soon as they are complete (quoting the bare keys of
+the .js files first), and each file's reducer
+keeps only the fields the analysis needs. timings reports, per file, the
+time to the response headers, the total time, bytes and entries read,
+or the error of a file that failed; the other files still load.
+"""
+
+import asyncio
+import codecs
+import json
+import re
+import threading
+import time
+from typing import Callable, Dict, Iterable, Iterator, Mapping, Optional, Tuple
+
+from poketype.pokedex import FETCH_TIMEOUT, parse_pokedex
+
+SHOWDOWN_DATA_URL = "https://play.pokemonshowdown.com/data"
+
+# Bytes read from a response per iteration
+CHUNK_SIZE = 1 << 16
+
+_WHITESPACE = " \t\n\r"
+
+# A string, an identifier with the whitespace after it, other text, or the
+# opening quote of a string the chunk cut
+_JS_TOKEN = re.compile(
+    r'(?P<string>"[^"\\]*(?:\\.[^"\\]*)*")|(?P<name>[A-Za-z_$][\w$]*)\s*|(?P<other>[^"A-Za-z_$]+)|"'
+)
+
+
+class BareKeyQuoter:
+    """
+    Incrementally quotes the bare identifier keys of a JavaScript object
+    literal, as Showdown's .js data files write them ({noability:{...}}
+    becomes {"noability":{...}}); the output can go to a JSONObjectStream.
+    An identifier or string cut by the end of a chunk is held back until the
+    next one.
+    """
+
+    def __init__(self):
+        self._pending = ""
+        # Last non-whitespace character outside strings
+        self._last = ""
+
+    def feed(self, text: str) -> str:
+        text = self._pending + text
+        self._pending = ""
+        last = self._last
+        parts = []
+        for match in _JS_TOKEN.finditer(text):
+            token = match.group()
+            kind = match.lastgroup
+            if kind == "string":
+                last = '"'
+            elif kind == "name":
+                end = match.end()
+                if end == len(text):
+                    # The name, or the whitespace before its ":", may go on
+                    self._pending = text[match.start():]
+                    break
+                name = match.group("name")
+                if last in "{," and text[end] == ":":
+                    token = f'"{name}"{token[len(name):]}'
+                last = name[-1]
+            elif kind == "other":
+                stripped = token.rstrip()
+                if stripped:
+                    last = stripped[-1]
+            else:
+                self._pending = text[match.start():]
+                break
+            parts.append(token)
+        self._last = last
+        return "".join(parts)
+
+
+class JSONObjectStream:
+    """
+    Incremental parser of one top-level JSON object, fed text chunks and
+    yielding its (key, value) pairs. Anything before the opening brace
+    (the "exports.BattleAbilities = " of Showdown's .js data files) and
+    after the closing one is ignored. bare_keys=True also accepts the
+    unquoted keys of those files (see BareKeyQuoter).
+    """
+
+    def __init__(self, bare_keys: bool = False):
+        self._quoter = BareKeyQuoter() if bare_keys else None
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._started = False
+        self.done = False
+
+    def _skip(self, buffer: str, pos: int) -> int:
+        while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+            pos += 1
+        return pos
+
+    def feed(self, text: str) -> Iterator[Tuple[str, object]]:
+        if self.done:
+            return
+        if self._quoter is not None:
+            text = self._quoter.feed(text)
+        buffer = self._buffer + text
+        pos = 0
+        if not self._started:
+            pos = buffer.find("{")
+            if pos < 0:
+                self._buffer = ""
+                return
+            self._started = True
+            pos += 1
+        while True:
+            pos = self._skip(buffer, pos)
+            if pos >= len(buffer):
+                break
+            if buffer[pos] == "}":
+                self.done = True
+                pos += 1
+                break
+            # An entry is only taken once the separator after its value has
+            # arrived, so a number or literal cut by a chunk is never misread
+            try:
+                key, end = self._decoder.raw_decode(buffer, pos)
+                end = self._skip(buffer, end)
+                if end >= len(buffer):
+                    break
+                if buffer[end] != ":" or not isinstance(key, str):
+                    raise ValueError(f"expected a key at offset {pos}")
+                value, end = self._decoder.raw_decode(buffer, self._skip(buffer, end + 1))
+            except json.JSONDecodeError:
+                # Entry not complete yet; malformed input ends up in close()
+                break
+            end = self._skip(buffer, end)
+            if end >= len(buffer) or buffer[end] not in ",}":
+                # A number cut by a chunk ("-12." then "5") decodes as a shorter
+                # one; wait for the rest, close() reports it if it never comes
+                break
+            yield key, value
+            pos = end + 1 if buffer[end] == "," else end
+        self._buffer = buffer[pos:]
+
+    def close(self) -> None:
+        """Raise ValueError if the object was not complete (truncated or malformed)."""
+        if not self.done:
+            raise ValueError(f"incomplete JSON object, unparsed: {self._buffer[:80]!r}")
+
+
+# =============================================================================
+# REDUCERS: raw entry -> what is kept of it
+# =============================================================================
+
+def _learnset(entry: Mapping) -> Tuple[str, ...]:
+    """Move ids a species can learn, without the per-generation sources."""
+    return tuple(sorted(entry.get("learnset", ())))
+
+
+def _move(entry: Mapping) -> Dict:
+    return {
+        "name": entry.get("name", ""),
+        "type": entry.get("type", ""),
+        "category": entry.get("category", ""),
+        "base_power": entry.get("basePower", 0),
+        "accuracy": entry.get("accuracy", True),
+        "priority": entry.get("priority", 0),
+    }
+
+
+def _ability(entry: Mapping) -> Dict:
+    return {"name": entry.get("name", ""), "rating": entry.get("rating")}
+
+
+def _formats_data(entry: Mapping) -> Dict:
+    return {key: entry[key] for key in ("tier", "doublesTier", "natDexTier", "isNonstandard") if key in entry}
+
+
+class DataFile:
+    """A Showdown data file: its path under the data URL and how it is reduced."""
+
+    def __init__(self, path: str, reduce_entry: Optional[Callable[[Mapping], object]] = None,
+                 finish: Optional[Callable[[Dict], Dict]] = None):
+        self.path = path
+        # .js files are JavaScript object literals with unquoted keys
+        self.bare_keys = path.endswith(".js")
+        # None keeps entries as parsed
+        self.reduce_entry = reduce_entry or (lambda entry: entry)
+        self.finish = finish
+
+
+DATA_FILES: Dict[str, DataFile] = {
+    "pokedex": DataFile("pokedex.json", finish=parse_pokedex),
+    "learnsets": DataFile("learnsets.json", _learnset),
+    "moves": DataFile("moves.json", _move),
+    "abilities": DataFile("abilities.js", _ability),
+    "formats_data": DataFile("formats-data.js", _formats_data),
+}
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def shared_session():
+    """Process-wide requests Session, pooling one connection per concurrent file."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                import requests
+
+                session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=len(DATA_FILES))
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _session = session
+    return _session
+
+
+def fetch_data_file(url: str, data_file: DataFile, session=None, timeout: float = FETCH_TIMEOUT) -> Tuple[Dict, Dict]:
+    """Stream, parse and reduce one file; returns its data and timing."""
+    session = session or shared_session()
+    start = time.perf_counter()
+    data: Dict = {}
+    stream = JSONObjectStream(bare_keys=data_file.bare_keys)
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    size = 0
+    with session.get(url, timeout=timeout, stream=True) as response:
+        headers = time.perf_counter() - start
+        response.raise_for_status()
+        for chunk in response.iter_content(CHUNK_SIZE):
+            size += len(chunk)
+            for key, entry in stream.feed(decoder.decode(chunk)):
+                data[key] = data_file.reduce_entry(entry)
+    for key, entry in stream.feed(decoder.decode(b"", final=True)):
+        data[key] = data_file.reduce_entry(entry)
+    stream.close()
+    entries = len(data)
+    if data_file.finish is not None:
+        data = data_file.finish(data)
+    return data, {
+        "url": url,
+        "headers_seconds": headers,
+        "seconds": time.perf_counter() - start,
+        "bytes": size,
+        "entries": entries,
+    }
+
+
+async def fetch_data_files(names: Optional[Iterable[str]] = None, base_url: str = SHOWDOWN_DATA_URL,
+                           session=None, timeout: float = FETCH_TIMEOUT) -> Tuple[Dict[str, Dict], Dict[str, Dict]]:
+    """
+    Fetch data files concurrently (all of DATA_FILES by default).
+    Returns (data, timings) keyed by file name; a failed file is left out
+    of data and its timing has an "error".
+    """
+    names = list(DATA_FILES) if names is None else list(names)
+    session = session or shared_session()
+    start = time.perf_counter()
+
+    async def fetch(name: str) -> Tuple[str, Optional[Dict], Dict]:
+        url = f"{base_url.rstrip('/')}/{DATA_FILES[name].path}"
+        try:
+            data, timing = await asyncio.to_thread(fetch_data_file, url, DATA_FILES[name], session, timeout)
+        except Exception as e:
+            return name, None, {"url": url, "seconds": time.perf_counter() - start,
+                                "error": f"{type(e).__name__}: {e}"}
+        return name, data, timing
+
+    data, timings = {}, {}
+    for name, file_data, timing in await asyncio.gather(*(fetch(name) for name in names)):
+        if file_data is not None:
+            data[name] = file_data
+        timings[name] = timing
+    timings["total"] = {"seconds": time.perf_counter() - start}
+    return data, timings
+
+
+def load_data_files(names: Optional[Iterable[str]] = None, base_url: str = SHOWDOWN_DATA_URL,
+                    session=None, timeout: float = FETCH_TIMEOUT) -> Tuple[Dict[str, Dict], Dict[str, Dict]]:
+    """Blocking fetch_data_files, for callers outside an event loop."""
+    return asyncio.run(fetch_data_files(names, base_url, session, timeout))
@@ -0,0 +1,28 @@
+"""
+Process-wide Pokedex, loaded lazily on first use.
+"""
+
+import threading
+from typing import Dict, Mapping, Optional
+
+_lock = threading.Lock()
+_pokemon: Optional[Mapping[str, Dict]] = None
+
+
+def get_pokemon() -> Mapping[str, Dict]:
+    """Return the Pokedex, loading the snapshot on first call."""
+    global _pokemon
+    if _pokemon is None:
+        with _lock:
+            if _pokemon is None:
+                from poketype.pokedex import load_snapshot
+                from poketype.store import PokedexStore
+                _pokemon = PokedexStore.from_snapshot(load_snapshot())
+    return _pokemon
+
+
+def set_pokemon(pokemon_dict: Mapping[str, Dict]) -> None:
+    """Use an already loaded Pokedex (e.g. the app's cached copy or a fixture)."""
+    global _pokemon
+    with _lock:
+        _pokemon = pokemon_dict
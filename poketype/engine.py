@@ -0,0 +1,170 @@
+"""
+Compiled type-effectiveness engine.
+The type charts are compiled once into a (chart x 18 x 18) array indexed by
+type id, and every mono- and dual-type defensive profile (171 combinations)
+is precomputed so a species' full 18-type profile is a single row lookup.
+The current chart's table is built at import, older charts' on first use.
+"""
+
+import threading
+from itertools import combinations
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from poketype.typechart import (CHART_CHANGES, CHART_MISSING_TYPES, CHART_TYPES, CHARTS, DEFAULT_CHART, TYPES,
+                                TYPE_CHART)
+
+# =============================================================================
+# TYPE INDEXING
+# =============================================================================
+
+NUM_TYPES = len(TYPES)
+
+TYPE_INDEX: Dict[str, int] = {t: i for i, t in enumerate(TYPES)}
+
+
+def build_chart_matrix(type_chart: Dict[str, Dict[str, float]]) -> np.ndarray:
+    """
+    Compile a TYPE_CHART-style dict into an (attack x defense) float array.
+    Missing entries default to 1.0, same as the dict lookups.
+    """
+    matrix = np.ones((NUM_TYPES, NUM_TYPES), dtype=np.float64)
+    for atk_type, row in type_chart.items():
+        for def_type, mult in row.items():
+            matrix[TYPE_INDEX[atk_type], TYPE_INDEX[def_type]] = mult
+    matrix.flags.writeable = False
+    return matrix
+
+
+def build_chart_tensor() -> np.ndarray:
+    """
+    Stack every chart in CHARTS into a (chart x attack x defense) array:
+    TYPE_CHART with each chart's changes, and its missing types neutral.
+    """
+    tensor = np.empty((len(CHARTS), NUM_TYPES, NUM_TYPES), dtype=np.float64)
+    for chart in range(len(CHARTS)):
+        matrix = build_chart_matrix(TYPE_CHART).copy()
+        for (atk_type, def_type), mult in CHART_CHANGES[chart].items():
+            matrix[TYPE_INDEX[atk_type], TYPE_INDEX[def_type]] = mult
+        for missing in CHART_MISSING_TYPES[chart]:
+            matrix[TYPE_INDEX[missing], :] = 1
+            matrix[:, TYPE_INDEX[missing]] = 1
+        tensor[chart] = matrix
+    tensor.flags.writeable = False
+    return tensor
+
+
+# CHART_TENSOR[chart, attack_id, defense_id] = multiplier
+CHART_TENSOR = build_chart_tensor()
+
+# EFFECTIVENESS[attack_id, defense_id] = multiplier in the current chart
+EFFECTIVENESS = CHART_TENSOR[DEFAULT_CHART]
+
+# Type ids that exist in each chart
+CHART_TYPE_IDS: Tuple[Tuple[int, ...], ...] = tuple(
+    tuple(TYPE_INDEX[t] for t in chart_types) for chart_types in CHART_TYPES
+)
+
+# =============================================================================
+# DEFENSIVE COMBINATIONS - 18 mono types + 153 dual types
+# =============================================================================
+
+# Each combination is a sorted tuple of type ids: (i,) or (i, j) with i < j
+COMBOS: List[Tuple[int, ...]] = (
+    [(i,) for i in range(NUM_TYPES)]
+    + list(combinations(range(NUM_TYPES), 2))
+)
+
+COMBO_INDEX: Dict[Tuple[int, ...], int] = {combo: code for code, combo in enumerate(COMBOS)}
+
+
+def build_defense_table(chart: np.ndarray) -> np.ndarray:
+    """
+    Build the (combo x attack type) table of defensive multipliers.
+    Row c is the multiplier of every attacking type against COMBOS[c].
+    """
+    table = np.empty((len(COMBOS), NUM_TYPES), dtype=np.float64)
+    for code, combo in enumerate(COMBOS):
+        table[code] = np.prod(chart[:, list(combo)], axis=1)
+    table.flags.writeable = False
+    return table
+
+
+# DEFENSE_TABLE[combo_code, attack_id] = multiplier in the current chart
+DEFENSE_TABLE = build_defense_table(EFFECTIVENESS)
+
+_DEFENSE_TABLES: Dict[int, np.ndarray] = {DEFAULT_CHART: DEFENSE_TABLE}
+_DEFENSE_TABLES_LOCK = threading.Lock()
+
+
+def defense_table(chart: int = DEFAULT_CHART) -> np.ndarray:
+    """
+    DEFENSE_TABLE for a chart, built on first use. Only the combos holding
+    a defending type whose column differs from the current chart are
+    recomputed; every other row is copied.
+    """
+    table = _DEFENSE_TABLES.get(chart)
+    if table is None:
+        with _DEFENSE_TABLES_LOCK:
+            table = _DEFENSE_TABLES.get(chart)
+            if table is None:
+                chart_matrix = CHART_TENSOR[chart]
+                changed = set(np.nonzero((chart_matrix != EFFECTIVENESS).any(axis=0))[0].tolist())
+                table = DEFENSE_TABLE.copy()
+                for code, combo in enumerate(COMBOS):
+                    if changed.intersection(combo):
+                        table[code] = np.prod(chart_matrix[:, list(combo)], axis=1)
+                table.flags.writeable = False
+                _DEFENSE_TABLES[chart] = table
+    return table
+
+# Neutral profile for Pokemon without any known type
+NEUTRAL_VECTOR = np.ones(NUM_TYPES, dtype=np.float64)
+NEUTRAL_VECTOR.flags.writeable = False
+
+# =============================================================================
+# LOOKUPS
+# =============================================================================
+
+def combo_code(pokemon_types: Sequence[str]) -> int:
+    """
+    Return the combination code for a list of type names.
+    Unknown type names are ignored (they are neutral in TYPE_CHART lookups).
+    Returns -1 if the typing is not a mono or dual type (no known types,
+    duplicated types or more than two types).
+    """
+    key = tuple(sorted(TYPE_INDEX[t] for t in pokemon_types if t in TYPE_INDEX))
+    return COMBO_INDEX.get(key, -1)
+
+
+def defense_vector(pokemon_types: Sequence[str], chart: int = DEFAULT_CHART) -> np.ndarray:
+    """
+    Return the 18-element defensive multiplier vector for a typing,
+    in TYPES order.
+    """
+    code = combo_code(pokemon_types)
+    if code >= 0:
+        return defense_table(chart)[code]
+
+    # Typings outside the table (typeless, 3+ types) are multiplied out
+    chart_matrix = CHART_TENSOR[chart]
+    vector = NEUTRAL_VECTOR.copy()
+    for def_type in pokemon_types:
+        if def_type in TYPE_INDEX:
+            vector *= chart_matrix[:, TYPE_INDEX[def_type]]
+    return vector
+
+
+def defense_matrix(type_lists: Sequence[Sequence[str]], chart: int = DEFAULT_CHART) -> np.ndarray:
+    """
+    Stack the defensive vectors of several typings into an (n x 18) array.
+    """
+    if not type_lists:
+        return np.empty((0, NUM_TYPES), dtype=np.float64)
+    return np.stack([defense_vector(types, chart) for types in type_lists])
+
+
+def get_multiplier(attack_type: str, pokemon_types: Sequence[str], chart: int = DEFAULT_CHART) -> float:
+    """Multiplier of a single attacking type against a typing."""
+    return float(defense_vector(pokemon_types, chart)[TYPE_INDEX[attack_type]])
@@ -0,0 +1,221 @@
+"""
+HTML builders for the Streamlit UI: type badges, sprites and the coverage
+table. Pure string functions, so they can be reused and measured headless.
+"""
+
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from poketype.analysis import get_pokemon_weaknesses_resistances
+from poketype.cache import LRUCache
+from poketype.typechart import DEFAULT_CHART
+
+# Type colors for badges
+TYPE_COLORS: Dict[str, str] = {
+    "Normal": "#A8A878", "Fire": "#F08030", "Water": "#6890F0", "Electric": "#F8D030",
+    "Grass": "#78C850", "Ice": "#98D8D8", "Fighting": "#C03028", "Poison": "#A040A0",
+    "Ground": "#E0C068", "Flying": "#A890F0", "Psychic": "#F85888", "Bug": "#A8B820",
+    "Rock": "#B8A038", "Ghost": "#705898", "Dragon": "#7038F8", "Dark": "#705848",
+    "Steel": "#B8B8D0", "Fairy": "#EE99AC"
+}
+
+# =============================================================================
+# SPRITES
+# =============================================================================
+
+def normalize_sprite_id(showdown_id: str, pokemon_data: Mapping = None) -> str:
+    """
+    Normalize the showdown ID for sprite URLs.
+    Showdown sprites use hyphenated form names like 'pikachu-alola', 'charizard-megax'.
+    But pokedex IDs are like 'pikachualola', 'charizardmegax'.
+    """
+    # If we have pokemon data, use base_species and forme to build proper sprite name
+    if pokemon_data:
+        base_species = pokemon_data.get("base_species", "")
+        forme = pokemon_data.get("forme", "")
+
+        if base_species and forme:
+            # Convert base species to lowercase, remove special chars
+            base_clean = base_species.lower().replace(" ", "").replace("-", "").replace("'", "").replace(".", "")
+            forme_clean = forme.lower().replace(" ", "").replace("-", "").replace("'", "").replace(".", "")
+            return f"{base_clean}-{forme_clean}"
+
+    # Fallback: just return the showdown_id as-is
+    return showdown_id.lower()
+
+
+def get_sprite_html(showdown_id: str, pokemon_data: Mapping = None, size: int = 48) -> str:
+    """
+    Generate HTML for a Pokemon sprite with fallback to base species.
+    Tries specific form sprite first, falls back to base species if it fails.
+    """
+    # Get base species ID for fallback
+    base_id = showdown_id.lower()
+
+    if pokemon_data:
+        base = pokemon_data.get("base_species", "")
+        if base and base != pokemon_data.get("name", ""):
+            base_id = base.lower().replace(" ", "").replace("-", "").replace("'", "").replace(".", "")
+
+    # Try the specific form sprite first
+    sprite_id = normalize_sprite_id(showdown_id, pokemon_data)
+    primary_url = f"https://play.pokemonshowdown.com/sprites/gen5/{sprite_id}.png"
+
+    # Fallback: base species
+    fallback_url = f"https://play.pokemonshowdown.com/sprites/gen5/{base_id}.png"
+
+    # Final fallback: pokeball
+    final_fallback = "https://play.pokemonshowdown.com/sprites/itemicons/poke-ball.png"
+
+    # onerror: try base species, then pokeball
+    onerror = f"this.onerror=function(){{this.src='{final_fallback}'}};this.src='{fallback_url}'"
+
+    return f'<img src="{primary_url}" onerror="{onerror}" style="width:{size}px;height:{size}px;object-fit:contain;">'
+
+
+def get_base_species_id(pokemon_data: Mapping) -> str:
+    """Get the base species ID for fallback sprites."""
+    if pokemon_data:
+        base = pokemon_data.get("base_species", "")
+        if base and base != pokemon_data.get("name", ""):
+            return base.lower().replace(" ", "").replace("-", "").replace("'", "").replace(".", "")
+    return ""
+
+
+# =============================================================================
+# BADGES
+# =============================================================================
+
+def render_type_badge(type_name: str) -> str:
+    """Render a type badge HTML."""
+    color = TYPE_COLORS.get(type_name, "#888")
+    return f'<span class="type-badge" style="background-color: {color};">{type_name}</span>'
+
+
+# =============================================================================
+# COVERAGE TABLE
+# =============================================================================
+
+COVERAGE_HEADERS = ["Type", "Immune", "4x Res", "2x Res", "Neutral", "2x Weak", "4x Weak", "Rating"]
+
+# Relative column widths, shared by the st.columns and single-payload layouts
+COVERAGE_COLUMN_WIDTHS = [1.1, 0.7, 0.7, 0.7, 0.7, 0.7, 0.7, 0.9]
+
+# Count columns and the color used when the count is non-zero
+COVERAGE_COUNT_COLORS = [
+    ("immune", "#22c55e"),
+    ("resist_4x", "#4ade80"),
+    ("resist_2x", "#86efac"),
+    ("neutral", None),
+    ("weak_2x", "#fca5a5"),
+    ("weak_4x", "#ef4444"),
+]
+
+COVERAGE_DIVIDER = '<hr style="margin:8px 0;border:none;border-top:1px solid rgba(255,255,255,0.2);">'
+
+
+def coverage_header_cells() -> List[str]:
+    """HTML of each coverage table header cell."""
+    return [f'<span class="coverage-header">{header}</span>' for header in COVERAGE_HEADERS]
+
+
+def coverage_row_cells(item: Mapping) -> List[str]:
+    """HTML of each cell of one analyze_team_by_type row."""
+    cells = [render_type_badge(item["type"])]
+    for key, active_color in COVERAGE_COUNT_COLORS:
+        if active_color is None:
+            color = "#9ca3af"
+        else:
+            color = active_color if item[key] > 0 else "#6b7280"
+        cells.append(f'<span class="stat-value" style="color:{color};">{item[key]}</span>')
+    cells.append(
+        f'<span class="rating-badge" style="background-color:{item["rating_color"]}20;color:{item["rating_color"]};">'
+        f'{item["rating"]}</span>'
+    )
+    return cells
+
+
+def coverage_table_html(analysis: List[Mapping]) -> str:
+    """
+    The whole coverage table (header, divider, one row per attacking type)
+    as a single CSS grid payload, laid out like the st.columns version.
+    """
+    template = " ".join(f"{width}fr" for width in COVERAGE_COLUMN_WIDTHS)
+    parts = [f'<div class="coverage-grid" style="grid-template-columns:{template};">']
+    # Cells are the grid items themselves, no wrapper per cell
+    parts.extend(coverage_header_cells())
+    parts.append(f'<div class="coverage-divider">{COVERAGE_DIVIDER}</div>')
+    for item in analysis:
+        parts.extend(coverage_row_cells(item))
+    parts.append('</div>')
+    return "".join(parts)
+
+
+# =============================================================================
+# TEAM DETAILS ROWS
+# =============================================================================
+
+EMPTY_CELL = '<span style="color:#666;font-family:Press Start 2P;font-size:0.5rem;">—</span>'
+
+# Rendered (pokemon, weakness, resistance) cells per (dataset version, species id)
+SPECIES_FRAGMENT_CACHE = LRUCache(maxsize=2048)
+
+
+def render_immunity_badge(type_name: str) -> str:
+    """Render a type badge HTML with the gold immunity border."""
+    color = TYPE_COLORS.get(type_name, "#888")
+    return f'<span class="type-badge" style="background-color: {color}; border: 2px solid #ffd700; box-shadow: 0 0 4px #ffd700;">{type_name}</span>'
+
+
+def species_detail_cells(pokemon_id: str, pokemon: Mapping, chart: int = DEFAULT_CHART,
+                         ability_mode: Optional[str] = None) -> Tuple[str, str, str]:
+    """
+    HTML of the three team details cells of one species:
+    sprite + name + types, weaknesses, resistances/immunities.
+    """
+    name = pokemon.get("name", "Unknown")
+    types = pokemon.get("types", [])
+    showdown_id = pokemon.get("showdown_id", pokemon_id)
+
+    weaknesses, resistances, immunities = get_pokemon_weaknesses_resistances(
+        types, chart, pokemon.get("abilities", ()), ability_mode
+    )
+
+    # Pokemon types badges
+    types_html = " ".join([render_type_badge(t) for t in types])
+
+    # Weakness badges
+    weakness_html = " ".join([render_type_badge(w) for w in weaknesses]) if weaknesses else EMPTY_CELL
+
+    # Resistance badges (immunities with special border)
+    resistance_parts = [render_type_badge(r) for r in resistances]
+    resistance_parts.extend(render_immunity_badge(i) for i in immunities)
+    resistance_html = " ".join(resistance_parts) if resistance_parts else EMPTY_CELL
+
+    # Sprite with fallbacks
+    sprite_html = get_sprite_html(showdown_id, pokemon, size=40)
+
+    badge_cell = '<div style="line-height:2.2;min-height:45px;display:flex;align-items:center;flex-wrap:wrap;gap:3px;">{}</div>'
+    return (
+        f'<div style="display:flex;align-items:center;gap:8px;min-height:45px;">'
+        f'{sprite_html}'
+        f'<div>'
+        f'<div class="poke-name-arcade">{name}</div>'
+        f'<div style="margin-top:4px;">{types_html}</div>'
+        f'</div></div>',
+        badge_cell.format(weakness_html),
+        badge_cell.format(resistance_html),
+    )
+
+
+def get_species_detail_cells(pokemon_dict: Mapping[str, Mapping], pokemon_id: str,
+                             version: str = "", chart: int = DEFAULT_CHART,
+                             ability_mode: Optional[str] = None) -> Tuple[str, str, str]:
+    """
+    Cached species_detail_cells, shared across sessions.
+    The key includes the dataset version so a refreshed Pokedex never
+    serves stale fragments, the type chart and the ability mode.
+    """
+    return SPECIES_FRAGMENT_CACHE.get_or_compute(
+        (version, chart, ability_mode, pokemon_id),
+        lambda: species_detail_cells(pokemon_id, pokemon_dict.get(pokemon_id, {}), chart, ability_mode),
+    )
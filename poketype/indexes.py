@@ -0,0 +1,101 @@
+"""
+Precomputed lookup indexes over a PokedexStore.
+Built once per dataset version and immutable afterwards: species by
+generation, form_type, base species and type, each pre-sorted by
+(num, name), plus the ready-made selector options for every generation.
+"""
+
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Tuple
+
+from poketype.store import FORM_TYPES
+from poketype.typechart import TYPES
+
+ALL_GENERATIONS = "All Generations"
+
+GENERATION_LABELS: Dict[int, str] = {
+    1: "Gen 1 - Kanto",
+    2: "Gen 2 - Johto",
+    3: "Gen 3 - Hoenn",
+    4: "Gen 4 - Sinnoh",
+    5: "Gen 5 - Unova",
+    6: "Gen 6 - Kalos",
+    7: "Gen 7 - Alola",
+    8: "Gen 8 - Galar/Hisui",
+    9: "Gen 9 - Paldea",
+}
+
+
+def _freeze(groups: Dict[str, List]) -> Mapping[str, Tuple]:
+    return MappingProxyType({key: tuple(values) for key, values in groups.items()})
+
+
+class SelectorOptions:
+    """Species selector options: display names in order and name -> id."""
+
+    __slots__ = ("names", "ids_by_name")
+
+    def __init__(self, names: Tuple[str, ...], ids_by_name: Mapping[str, str]):
+        self.names = names
+        self.ids_by_name = ids_by_name
+
+
+class PokedexIndexes:
+    """
+    Immutable indexes over one PokedexStore.
+    Group values are tuples of species ids sorted by (num, name), except
+    by_generation which holds (species id, name) pairs like
+    get_pokemon_by_generation.
+    """
+
+    def __init__(self, store):
+        ids = store.ids
+        names = store.names
+        num = store.num.tolist()
+        gen = store.gen.tolist()
+        form_type = store.form_type.tolist()
+
+        # One global (num, name) order; every group keeps it
+        order = sorted(range(len(ids)), key=lambda row: (num[row], names[row]))
+
+        by_generation: Dict[str, List[Tuple[str, str]]] = {label: [] for label in GENERATION_LABELS.values()}
+        by_form_type: Dict[str, List[str]] = {}
+        by_base_species: Dict[str, List[str]] = {}
+        by_type: Dict[str, List[str]] = {type_name: [] for type_name in TYPES}
+
+        for row in order:
+            pokemon_id = ids[row]
+            label = GENERATION_LABELS.get(gen[row], GENERATION_LABELS[1])
+            by_generation[label].append((pokemon_id, names[row]))
+            by_form_type.setdefault(FORM_TYPES[form_type[row]], []).append(pokemon_id)
+            by_base_species.setdefault(store.base_species[row], []).append(pokemon_id)
+            for type_name in store.get_types(row):
+                by_type.setdefault(type_name, []).append(pokemon_id)
+
+        self.by_generation: Mapping[str, Tuple[Tuple[str, str], ...]] = _freeze(by_generation)
+        self.by_form_type: Mapping[str, Tuple[str, ...]] = _freeze(by_form_type)
+        self.by_base_species: Mapping[str, Tuple[str, ...]] = _freeze(by_base_species)
+        self.by_type: Mapping[str, Tuple[str, ...]] = _freeze(by_type)
+
+        # Selector options, same ordering and name collisions as the old
+        # per-rerun dict/sort (last species with a given name wins)
+        selector = {
+            ALL_GENERATIONS: SelectorOptions(
+                tuple(sorted(set(names))),
+                MappingProxyType({names[row]: ids[row] for row in range(len(ids))}),
+            )
+        }
+        for label, members in self.by_generation.items():
+            selector[label] = SelectorOptions(
+                tuple(name for _, name in members),
+                MappingProxyType({name: pokemon_id for pokemon_id, name in members}),
+            )
+        self.selector: Mapping[str, SelectorOptions] = MappingProxyType(selector)
+
+    @property
+    def generation_labels(self) -> Tuple[str, ...]:
+        return tuple(self.by_generation)
+
+    def selector_options(self, label: str) -> SelectorOptions:
+        """Selector options for a generation label or ALL_GENERATIONS."""
+        return self.selector.get(label, SelectorOptions((), MappingProxyType({})))
@@ -0,0 +1,169 @@
+"""
+Species-vs-species STAB matchup matrix.
+
+matrix[a, d] is the class of the best STAB multiplier species a deals to
+species d, one int8 per pair (about 2 MB for 1,400 species). The matrix is
+built with array operations from the threat index profiles and persisted
+as an .npy file next to the Pokedex snapshot, named after the dataset
+version (and type chart, for the older ones), so worker processes
+memory-map one shared read-only copy.
+"""
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from poketype import engine
+from poketype.store import DERIVED_CACHE, PokedexStore
+from poketype.threats import best_stab_matrix
+from poketype.typechart import DEFAULT_CHART
+
+# Multiplier of each code; x0.125 and below count as x0.25, x8 as x4
+MATCHUP_MULTIPLIERS: Tuple[float, ...] = (0.0, 0.25, 0.5, 1.0, 2.0, 4.0)
+
+IMMUNE, RESIST_4X, RESIST_2X, NEUTRAL, SUPER_EFFECTIVE, SUPER_EFFECTIVE_4X = range(6)
+
+# Typeless attackers have no STAB at all
+NO_STAB = -1
+
+
+def multiplier_codes(multipliers: np.ndarray) -> np.ndarray:
+    """int8 matchup codes of an array of multipliers."""
+    codes = np.full(multipliers.shape, NEUTRAL, dtype=np.int8)
+    codes[multipliers == 0] = IMMUNE
+    codes[(multipliers > 0) & (multipliers <= 0.25)] = RESIST_4X
+    codes[multipliers == 0.5] = RESIST_2X
+    codes[multipliers == 2] = SUPER_EFFECTIVE
+    codes[multipliers >= 4] = SUPER_EFFECTIVE_4X
+    return codes
+
+
+def build_matchup_matrix(store: PokedexStore, out: Optional[np.ndarray] = None,
+                         chart: int = DEFAULT_CHART) -> np.ndarray:
+    """
+    (species x species) int8 matchup codes, rows attacking, in store order.
+    Written into `out` (e.g. a memmap) when given.
+    """
+    threat_index = store.threat_index
+
+    # Defensive columns: the 171 combos, then each odd typing in the store
+    defender_code = store.combo.astype(np.intp)
+    odd_rows = np.nonzero(defender_code < 0)[0]
+    defense = engine.defense_table(chart)
+    if len(odd_rows):
+        odd_vectors = engine.defense_matrix([store.get_types(row) for row in odd_rows], chart)
+        defender_code[odd_rows] = len(defense) + np.arange(len(odd_rows))
+        defense = np.vstack([defense, odd_vectors])
+
+    profile_codes = multiplier_codes(best_stab_matrix(threat_index.profiles, defense))
+    typeless = [code for code, profile in enumerate(threat_index.profiles) if not profile]
+    profile_codes[typeless] = NO_STAB
+
+    if out is None:
+        out = np.empty((len(store), len(store)), dtype=np.int8)
+    # (profiles x species) once, then one row gathered per attacker
+    profile_rows = profile_codes[:, defender_code]
+    attack_code = threat_index.attack_code
+    for start in range(0, len(store), 1024):
+        np.take(profile_rows, attack_code[start:start + 1024], axis=0, out=out[start:start + 1024])
+    return out
+
+
+def matrix_path(store: PokedexStore, directory: Union[str, Path], chart: int = DEFAULT_CHART) -> Path:
+    """File name tied to the dataset version, the exact row order and the chart."""
+    ids_hash = hashlib.sha256("\n".join(store.ids).encode("utf-8")).hexdigest()[:12]
+    suffix = "" if chart == DEFAULT_CHART else f"-chart{chart}"
+    return Path(directory) / f"matchups-{store.version}-{ids_hash}{suffix}.npy"
+
+
+def write_matchup_matrix(store: PokedexStore, path: Union[str, Path], chart: int = DEFAULT_CHART) -> None:
+    """Build the matrix straight into a new .npy file, replaced atomically."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    os.close(fd)
+    try:
+        matrix = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=np.int8, shape=(len(store), len(store)))
+        build_matchup_matrix(store, out=matrix, chart=chart)
+        matrix.flush()
+        del matrix
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class MatchupMatrix:
+    """Read-only species-vs-species matchup codes with slice queries."""
+
+    def __init__(self, ids: Tuple[str, ...], matrix: np.ndarray):
+        self.ids = ids
+        self.position: Dict[str, int] = {pokemon_id: row for row, pokemon_id in enumerate(ids)}
+        self.matrix = matrix
+        self.matrix.flags.writeable = False
+
+    @classmethod
+    def load(cls, store: PokedexStore, directory: Optional[Union[str, Path]] = None,
+             chart: int = DEFAULT_CHART) -> "MatchupMatrix":
+        """
+        Memory-map the matrix for this dataset version, building and saving
+        it first if needed. Unversioned stores, or directories that cannot
+        be written, get an in-memory matrix instead.
+        """
+        if not store.version:
+            return cls(store.ids, build_matchup_matrix(store, chart=chart))
+        if directory is None:
+            from poketype.pokedex import default_snapshot_path
+            directory = default_snapshot_path().parent
+        path = matrix_path(store, directory, chart)
+        if not path.exists():
+            try:
+                write_matchup_matrix(store, path, chart)
+            except OSError:
+                return cls(store.ids, build_matchup_matrix(store, chart=chart))
+        return cls(store.ids, np.load(path, mmap_mode="r"))
+
+    def _row(self, pokemon_id: str) -> int:
+        return self.position[pokemon_id]
+
+    def matchup(self, attacker: str, defender: str) -> Tuple[float, float]:
+        """Best STAB multipliers (attacker -> defender, defender -> attacker)."""
+        a, d = self._row(attacker), self._row(defender)
+        return self.multiplier(self.matrix[a, d]), self.multiplier(self.matrix[d, a])
+
+    @staticmethod
+    def multiplier(code: int) -> Optional[float]:
+        return None if code == NO_STAB else MATCHUP_MULTIPLIERS[code]
+
+    def beats(self, pokemon_id: str) -> List[str]:
+        """Species X hits super effectively without being hit super effectively back."""
+        row = self._row(pokemon_id)
+        mask = (self.matrix[row, :] >= SUPER_EFFECTIVE) & (self.matrix[:, row] < SUPER_EFFECTIVE)
+        return [self.ids[i] for i in np.nonzero(mask)[0].tolist()]
+
+    def walls(self, pokemon_id: str) -> List[str]:
+        """Species that resist or are immune to every STAB type of X."""
+        row = self._row(pokemon_id)
+        mask = (self.matrix[row, :] >= IMMUNE) & (self.matrix[row, :] <= RESIST_2X)
+        return [self.ids[i] for i in np.nonzero(mask)[0].tolist()]
+
+    def threatened_by(self, pokemon_id: str) -> List[str]:
+        """Species whose STAB hits X super effectively (a column slice)."""
+        row = self._row(pokemon_id)
+        return [self.ids[i] for i in np.nonzero(self.matrix[:, row] >= SUPER_EFFECTIVE)[0].tolist()]
+
+
+def get_matchup_matrix(store: PokedexStore, directory: Optional[Union[str, Path]] = None,
+                       chart: int = DEFAULT_CHART) -> MatchupMatrix:
+    """MatchupMatrix of a store, loaded once per dataset version, chart and process."""
+    if not store.version:
+        return MatchupMatrix.load(store, directory, chart)
+    return DERIVED_CACHE.get_or_compute(("matchups", store.version, chart, str(directory)),
+                                        lambda: MatchupMatrix.load(store, directory, chart))
@@ -0,0 +1,214 @@
+"""
+Team-completion optimizer.
+Suggests the best species to fill the open slots of a team with a
+branch-and-bound search over distinct type combinations.
+
+Completions are ranked by the sum over the 18 attacking types of the rating
+points (S+ = 10 ... F = 0), ties broken by the summed net_score, both taken
+from the same counts as analyze_team_by_type.
+"""
+
+import heapq
+import time
+from typing import Collection, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from poketype import engine
+from poketype.batch import CLASS_BITS, CLASS_MASK, COUNT_KEYS, NET_SCORE_LUT, RATING_LUT, pack_defense_vectors
+from poketype.rating import RATING_POINTS, RATINGS
+from poketype.typechart import DEFAULT_CHART
+
+TEAM_SIZE = 6
+
+# Net score totals stay within +-432, so this keeps rating points dominant
+RATING_WEIGHT = 1000
+
+# Rating points of one type's packed counts
+RATING_POINTS_LUT = np.array([RATING_POINTS[r] for r in RATINGS], dtype=np.int32)[RATING_LUT]
+
+# Score of one type's packed counts: rating points first, net score second
+TYPE_SCORE_LUT = RATING_POINTS_LUT * RATING_WEIGHT + NET_SCORE_LUT.astype(np.int32)
+
+# Sentinel for packed states that cannot be reached (a class count overflows)
+UNREACHABLE = np.iinfo(np.int32).min // 4
+
+_BOUND_TABLES: List[np.ndarray] = []
+
+
+def _bound_table(remaining: int) -> np.ndarray:
+    """
+    Best single-type score reachable from each packed state by adding
+    `remaining` members of any multiplier class. Used as an admissible
+    per-type upper bound (summed over types) during the search.
+    """
+    if not _BOUND_TABLES:
+        _BOUND_TABLES.append(TYPE_SCORE_LUT)
+    size = len(TYPE_SCORE_LUT)
+    states = np.arange(size, dtype=np.int64)
+    while len(_BOUND_TABLES) <= remaining:
+        previous = _BOUND_TABLES[-1]
+        table = np.full(size, UNREACHABLE, dtype=np.int32)
+        for class_id in range(len(COUNT_KEYS)):
+            shift = CLASS_BITS * class_id
+            room = ((states >> shift) & CLASS_MASK) < CLASS_MASK
+            target = states[room] + (1 << shift)
+            table[room] = np.maximum(table[room], previous[target])
+        table.flags.writeable = False
+        _BOUND_TABLES.append(table)
+    return _BOUND_TABLES[remaining]
+
+
+def _score(packed: np.ndarray) -> np.ndarray:
+    """Total score of packed team states (last axis = 18 types)."""
+    return TYPE_SCORE_LUT[packed].sum(axis=-1)
+
+
+def filter_candidates(pokemon_dict: Mapping[str, Mapping], exclude: Collection[str] = (),
+                      generation: Optional[int] = None,
+                      form_types: Optional[Collection[str]] = None) -> List[str]:
+    """Species ids allowed to fill a slot."""
+    return [
+        pokemon_id for pokemon_id, data in pokemon_dict.items()
+        if pokemon_id not in exclude
+        and (generation is None or data.get("gen") == generation)
+        and (form_types is None or data.get("form_type") in form_types)
+    ]
+
+
+def _group_by_profile(pokemon_dict: Mapping[str, Mapping], species_ids: Sequence[str],
+                      chart: int = DEFAULT_CHART) -> Tuple[np.ndarray, List[List[str]]]:
+    """
+    Deduplicate candidates by defensive profile (their type combination).
+    Returns the packed rows of each group and the species in each group.
+    """
+    groups: Dict[bytes, int] = {}
+    rows: List[np.ndarray] = []
+    members: List[List[str]] = []
+    if not species_ids:
+        return np.zeros((0, engine.NUM_TYPES), dtype=np.int32), members
+    packed = pack_defense_vectors(engine.defense_matrix([pokemon_dict[p]["types"] for p in species_ids], chart))
+    for pokemon_id, row in zip(species_ids, packed):
+        key = row.tobytes()
+        if key not in groups:
+            groups[key] = len(rows)
+            rows.append(row)
+            members.append([])
+        members[groups[key]].append(pokemon_id)
+    return np.array(rows, dtype=np.int32), members
+
+
+def suggest_completions(pokemon_dict: Mapping[str, Mapping], team: Sequence[str], top_k: int = 5,
+                        generation: Optional[int] = None,
+                        form_types: Optional[Collection[str]] = None,
+                        open_slots: Optional[int] = None,
+                        time_budget: Optional[float] = None,
+                        chart: int = DEFAULT_CHART) -> Dict:
+    """
+    Find the top-K ways to fill the open slots of a team.
+
+    Candidates are grouped by type combination, so each suggestion lists one
+    species per slot plus the other species sharing that typing. With a
+    time_budget (seconds) the search stops early and returns the best
+    completions found so far, with "complete" set to False. Types missing
+    from the chart are neutral to every candidate, so they do not change the
+    ranking and are left out of the reported totals.
+    """
+    start_time = time.perf_counter()
+    deadline = start_time + time_budget if time_budget is not None else None
+
+    current = [pokemon_id for pokemon_id in team if pokemon_id in pokemon_dict]
+    slots = TEAM_SIZE - len(team) if open_slots is None else open_slots
+    candidates = filter_candidates(pokemon_dict, exclude=set(team), generation=generation, form_types=form_types)
+    rows, members = _group_by_profile(pokemon_dict, candidates, chart)
+    chart_types = list(engine.CHART_TYPE_IDS[chart])
+
+    base = np.zeros(engine.NUM_TYPES, dtype=np.int32)
+    if current:
+        base = pack_defense_vectors(engine.defense_matrix([pokemon_dict[p]["types"] for p in current], chart)).sum(axis=0)
+
+    result = {"suggestions": [], "complete": True, "nodes": 0, "elapsed": 0.0}
+    if slots <= 0 or not len(rows):
+        result["elapsed"] = time.perf_counter() - start_time
+        return result
+    slots = min(slots, sum(len(m) for m in members))
+
+    # Best individual additions first, so good incumbents are found early
+    order = np.argsort(-_score(base + rows), kind="stable")
+    rows = rows[order]
+    members = [members[i] for i in order]
+    capacity = [len(m) for m in members]
+    bounds = [_bound_table(r) for r in range(slots)]
+
+    # Min-heap of (score, tiebreak, groups) holding the current top-K
+    heap: List[Tuple[int, int, Tuple[int, ...]]] = []
+    counter = 0
+    complete = True
+    nodes = 0
+
+    def threshold() -> int:
+        return heap[0][0] if len(heap) >= top_k else UNREACHABLE
+
+    # Depth-first stack of (bound, packed state, first allowed group, chosen groups)
+    stack = [(0, base, 0, ())]
+    while stack:
+        if deadline is not None and time.perf_counter() > deadline:
+            complete = False
+            break
+        bound, packed, first, chosen = stack.pop()
+        if chosen and bound <= threshold():
+            continue
+        nodes += 1
+        remaining = slots - len(chosen)
+
+        children = packed + rows[first:]
+        child_bounds = bounds[remaining - 1][children].sum(axis=1)
+        viable = np.nonzero(child_bounds > threshold())[0]
+
+        if remaining == 1:
+            # Leaves: child bounds are exact scores
+            for offset in viable[np.argsort(-child_bounds[viable], kind="stable")][:top_k]:
+                score = int(child_bounds[offset])
+                if score <= threshold():
+                    break
+                counter += 1
+                entry = (score, -counter, chosen + (first + int(offset),))
+                if len(heap) < top_k:
+                    heapq.heappush(heap, entry)
+                else:
+                    heapq.heapreplace(heap, entry)
+            continue
+
+        # Push in reverse so the most promising child is expanded first
+        for offset in viable[::-1]:
+            group = first + int(offset)
+            used = chosen.count(group) + 1
+            next_first = group if used < capacity[group] else group + 1
+            if next_first >= len(rows):
+                continue
+            stack.append((int(child_bounds[offset]), children[offset], next_first, chosen + (group,)))
+
+    suggestions = []
+    for score, _, chosen in sorted(heap, reverse=True):
+        picks = []
+        total = base + rows[list(chosen)].sum(axis=0)
+        used: Dict[int, int] = {}
+        for group in chosen:
+            index = used.get(group, 0)
+            used[group] = index + 1
+            picks.append(members[group][index])
+        suggestions.append({
+            "species": picks,
+            "alternatives": [members[group] for group in chosen],
+            "rating_points": int(RATING_POINTS_LUT[total[chart_types]].sum()),
+            "net_score": int(NET_SCORE_LUT[total[chart_types]].sum()),
+            "score": score,
+        })
+
+    result.update({
+        "suggestions": suggestions,
+        "complete": complete,
+        "nodes": nodes,
+        "elapsed": time.perf_counter() - start_time,
+    })
+    return result
@@ -0,0 +1,235 @@
+"""
+Pokedex loading from Pokemon Showdown, backed by a local on-disk snapshot.
+
+The parsed Pokedex is kept as a gzip-compressed, versioned JSON snapshot so
+startup never waits on the network. The snapshot is only refreshed once it is
+older than max_age, with a conditional request (ETag / If-Modified-Since)
+so an unchanged pokedex.json is not downloaded again. Snapshot writes go to a
+temporary file that atomically replaces the old one.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+POKEDEX_URL = "https://play.pokemonshowdown.com/data/pokedex.json"
+
+# Bump when parse_pokedex output changes, older snapshots are then ignored
+SNAPSHOT_VERSION = 2
+
+SNAPSHOT_MAX_AGE = 86400  # 24 hours
+
+FETCH_TIMEOUT = 30
+
+
+def default_snapshot_path() -> Path:
+    """Snapshot location, overridable with the POKEDEX_SNAPSHOT env var."""
+    if os.environ.get("POKEDEX_SNAPSHOT"):
+        return Path(os.environ["POKEDEX_SNAPSHOT"])
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "poketype" / "pokedex.json.gz"
+
+
+# =============================================================================
+# PARSING
+# =============================================================================
+
+# Last national dex number of each generation 1-8; anything above is Gen 9
+GEN_LAST_NUM = (151, 251, 386, 493, 649, 721, 809, 905)
+
+# Regional/battle form markers, checked in order, with the generation they belong to
+FORM_MARKERS = (
+    ("mega", 6),  # Megas are Gen 6
+    ("gmax", 8),
+    ("alola", 7),
+    ("galar", 8),
+    ("hisui", 8),
+    ("paldea", 9),
+)
+
+
+def get_form_type(pokemon_id: str, forme: str, gen: int) -> Tuple[str, int]:
+    """
+    Categorize a species form from its id and forme name.
+    Returns (form_type, gen); marked forms override the dex-number generation.
+    """
+    pokemon_id = pokemon_id.lower()
+    forme = forme.lower()
+    for marker, marker_gen in FORM_MARKERS:
+        if marker in pokemon_id:
+            return marker, marker_gen
+        # Mega formes are "Mega", "Mega-X", "Mega-Y"
+        if forme.startswith(marker) if marker == "mega" else forme == marker:
+            return marker, marker_gen
+    if forme:
+        return "form", gen
+    return "base", gen
+
+
+def parse_pokedex(pokedex: Dict[str, Dict]) -> Dict[str, Dict]:
+    """
+    Build the Pokemon dict from Showdown's raw pokedex.json data.
+    Includes all forms, megas, regionals, etc.
+    """
+    pokemon_dict = {}
+
+    for pokemon_id, data in pokedex.items():
+        # Skip if no types (not a real Pokemon)
+        if "types" not in data:
+            continue
+
+        # Skip all non-standard Pokemon (CAP, LGPE, etc.)
+        nonstandard = data.get("isNonstandard")
+        if nonstandard and nonstandard not in ["Past", "Unobtainable"]:
+            continue
+
+        # Get the number/generation
+        num = data.get("num", 0)
+
+        # Skip if num is 0 or negative (not real Pokemon) except for some special cases
+        if num <= 0:
+            continue
+
+        # Determine generation based on dex number
+        gen = bisect_left(GEN_LAST_NUM, num) + 1
+
+        # Handle forme/form naming
+        name = data.get("name", pokemon_id.title())
+        base_species = data.get("baseSpecies", "")
+        forme = data.get("forme", "")
+
+        # Determine form type for categorization
+        form_type, gen = get_form_type(pokemon_id, forme, gen)
+
+        pokemon_dict[pokemon_id] = {
+            "name": name,
+            "types": data.get("types", []),
+            "showdown_id": pokemon_id,
+            "num": num,
+            "gen": gen,
+            "form_type": form_type,
+            "base_species": base_species if base_species else name,
+            "forme": forme,
+            # Slots "0", "1", "H", "S"; a name can sit in several
+            "abilities": list(dict.fromkeys(data.get("abilities", {}).values())),
+        }
+
+    return pokemon_dict
+
+
+# =============================================================================
+# SNAPSHOT
+# =============================================================================
+
+def read_snapshot(path: Union[str, Path]) -> Optional[Dict]:
+    """
+    Read a snapshot file.
+    Returns None if it is missing, unreadable or from another SNAPSHOT_VERSION.
+    """
+    try:
+        with gzip.open(path, "rb") as f:
+            snapshot = json.loads(f.read())
+    except (OSError, EOFError, ValueError):
+        return None
+    if not isinstance(snapshot, dict) or snapshot.get("version") != SNAPSHOT_VERSION:
+        return None
+    return snapshot
+
+
+def write_snapshot(path: Union[str, Path], snapshot: Dict) -> None:
+    """Atomically replace the snapshot file."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = gzip.compress(json.dumps(snapshot, separators=(",", ":")).encode("utf-8"), compresslevel=6)
+
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def is_fresh(snapshot: Dict, max_age: float = SNAPSHOT_MAX_AGE) -> bool:
+    """Whether a snapshot was fetched (or revalidated) less than max_age seconds ago."""
+    return time.time() - snapshot.get("fetched_at", 0) < max_age
+
+
+def fetch_snapshot(url: str = POKEDEX_URL, previous: Optional[Dict] = None,
+                   timeout: float = FETCH_TIMEOUT) -> Dict:
+    """
+    Download and parse pokedex.json into a new snapshot.
+    If a previous snapshot is given the request is conditional, and a
+    304 Not Modified answer returns the previous data with a new fetched_at.
+    """
+    import requests
+
+    headers = {}
+    if previous:
+        if previous.get("etag"):
+            headers["If-None-Match"] = previous["etag"]
+        if previous.get("last_modified"):
+            headers["If-Modified-Since"] = previous["last_modified"]
+
+    response = requests.get(url, headers=headers, timeout=timeout)
+
+    if response.status_code == 304 and previous:
+        return dict(previous, fetched_at=time.time())
+
+    response.raise_for_status()
+    content = response.content
+    return {
+        "version": SNAPSHOT_VERSION,
+        "source": url,
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "fetched_at": time.time(),
+        "dataset_version": hashlib.sha256(content).hexdigest()[:16],
+        "pokemon": parse_pokedex(json.loads(content)),
+    }
+
+
+def load_snapshot(path: Optional[Union[str, Path]] = None, url: str = POKEDEX_URL,
+                  max_age: float = SNAPSHOT_MAX_AGE, timeout: float = FETCH_TIMEOUT) -> Dict:
+    """
+    Load the Pokedex snapshot, refreshing it from Showdown only when stale.
+    A failed refresh falls back to the stale snapshot; the error is raised
+    only when there is no snapshot at all.
+    """
+    path = Path(path) if path is not None else default_snapshot_path()
+    snapshot = read_snapshot(path)
+    if snapshot is not None and is_fresh(snapshot, max_age):
+        return snapshot
+
+    try:
+        refreshed = fetch_snapshot(url, previous=snapshot, timeout=timeout)
+    except Exception:
+        if snapshot is not None:
+            return snapshot
+        raise
+
+    try:
+        write_snapshot(path, refreshed)
+    except OSError:
+        # Read-only deployments still get the fresh data, just not persisted
+        pass
+    return refreshed
+
+
+def load_pokedex(path: Optional[Union[str, Path]] = None, url: str = POKEDEX_URL,
+                 max_age: float = SNAPSHOT_MAX_AGE, timeout: float = FETCH_TIMEOUT) -> Dict[str, Dict]:
+    """Load all Pokemon, see load_snapshot."""
+    return load_snapshot(path, url, max_age, timeout)["pokemon"]
@@ -0,0 +1,267 @@
+"""
+Timing spans for finding where a rerun spends its time.
+
+    with span("coverage"):
+        ...
+
+    @profiled("analyze_team_by_type")
+    def analyze_team_by_type(...): ...
+
+Spans are off unless enabled for the whole process with set_enabled(True)
+or the POKETYPE_PROFILE environment variable (the API and CLI), or for one
+session with SessionProfile.enabled (the app's ?debug=1). A disabled span
+is one global check returning a shared no-op context manager until some
+session enables its spans, then also a lookup of the current thread's
+session (see benchmarks/bench_profiling.py for the measured overhead).
+Enabled spans add their duration to a process-wide
+SpanStats and to the SessionProfile bound to the current thread, which
+also keeps the spans of its latest rerun in order, with nesting depth.
+Durations are aggregated into log2 histograms from 1 us up.
+"""
+
+import functools
+import json
+import math
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, TypeVar
+
+F = TypeVar("F", bound=Callable)
+
+ENABLED = os.environ.get("POKETYPE_PROFILE", "").lower() in ("1", "true", "yes", "on")
+
+# Bucket i counts durations in [2^(i-1), 2^i) us; bucket 0 is < 1 us
+HISTOGRAM_BUCKETS = 27  # up to ~67 s, longer spans land in the last bucket
+
+# Spans kept per rerun for the timeline; later ones only go to the histograms
+MAX_RERUN_SPANS = 500
+
+# Set once any session enables its own spans; until then spans skip the thread-local lookup
+_SESSION_SPANS = False
+
+
+def set_enabled(enabled: bool) -> None:
+    """Turn span recording on or off for the whole process."""
+    global ENABLED
+    ENABLED = enabled
+
+
+class Histogram:
+    """Count, total, min, max and log2 buckets of durations in seconds."""
+
+    __slots__ = ("count", "total", "min", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+        self.buckets = [0] * HISTOGRAM_BUCKETS
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+        # floor(log2(us)) + 1, and 0 below 1 us
+        bucket = int(seconds * 1e6).bit_length()
+        self.buckets[bucket if bucket < HISTOGRAM_BUCKETS else HISTOGRAM_BUCKETS - 1] += 1
+
+    def percentile(self, fraction: float) -> float:
+        """Upper bound of the bucket holding the given fraction, capped at max."""
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for bucket, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank:
+                return self.max if bucket == HISTOGRAM_BUCKETS - 1 else min(2 ** bucket * 1e-6, self.max)
+        return self.max
+
+    def to_dict(self) -> Dict:
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "min": self.min if self.count else 0.0,
+            "max": self.max,
+            "p50": self.percentile(0.5),
+            "p90": self.percentile(0.9),
+            "p99": self.percentile(0.99),
+            # Upper bound in us -> count, empty buckets left out
+            "buckets": {str(2 ** bucket): count for bucket, count in enumerate(self.buckets) if count},
+        }
+
+
+class SpanStats:
+    """Thread-safe histograms keyed by span name."""
+
+    def __init__(self):
+        self._histograms: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float) -> None:
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram()
+            histogram.add(seconds)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+
+    def to_dict(self) -> Dict[str, Dict]:
+        """Histogram summaries, slowest total first."""
+        with self._lock:
+            items = [(name, histogram.to_dict()) for name, histogram in self._histograms.items()]
+        return dict(sorted(items, key=lambda item: -item[1]["total"]))
+
+
+# Spans of every session in the process
+PROCESS_STATS = SpanStats()
+
+
+class SessionProfile:
+    """One session's span histograms and the spans of its latest rerun."""
+
+    def __init__(self, enabled: bool = False):
+        self.stats = SpanStats()
+        self.enabled = enabled
+        self.reruns = 0
+        # {"name", "depth", "start" offset and "seconds"} per span, in start order
+        self.last_rerun: List[Dict] = []
+        self._rerun_start = time.perf_counter()
+        self._depth = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Record this session's spans even while profiling is off process-wide."""
+        return self._enabled
+
+    @enabled.setter
+    def enabled(self, enabled: bool) -> None:
+        global _SESSION_SPANS
+        self._enabled = enabled
+        if enabled:
+            _SESSION_SPANS = True
+
+    def begin_rerun(self) -> None:
+        self.reruns += 1
+        self.last_rerun = []
+        self._rerun_start = time.perf_counter()
+        self._depth = 0
+
+    def clear(self) -> None:
+        self.stats.clear()
+        self.reruns = 0
+        self.last_rerun = []
+
+
+_local = threading.local()
+
+
+def bind(profile: Optional[SessionProfile]) -> None:
+    """Make profile the current thread's session (None unbinds)."""
+    _local.profile = profile
+
+
+def current_profile() -> Optional[SessionProfile]:
+    return getattr(_local, "profile", None)
+
+
+def _session_enabled() -> bool:
+    profile = getattr(_local, "profile", None)
+    return profile is not None and profile._enabled
+
+
+def begin_rerun(profile: SessionProfile) -> SessionProfile:
+    """Bind a session to the current thread and start a new rerun on it."""
+    bind(profile)
+    profile.begin_rerun()
+    return profile
+
+
+class _Span:
+    __slots__ = ("name", "start", "profile", "entry")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        profile = self.profile = current_profile()
+        self.start = time.perf_counter()
+        if profile is not None:
+            self.entry = None
+            if len(profile.last_rerun) < MAX_RERUN_SPANS:
+                self.entry = {"name": self.name, "depth": profile._depth,
+                              "start": self.start - profile._rerun_start, "seconds": None}
+                profile.last_rerun.append(self.entry)
+            profile._depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self.start
+        PROCESS_STATS.record(self.name, seconds)
+        profile = self.profile
+        if profile is not None:
+            profile._depth -= 1
+            if self.entry is not None:
+                self.entry["seconds"] = seconds
+            profile.stats.record(self.name, seconds)
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name: str):
+    """Context manager timing a named block, a no-op while profiling is disabled."""
+    if not ENABLED and not (_SESSION_SPANS and _session_enabled()):
+        return _NULL_SPAN
+    return _Span(name)
+
+
+def profiled(name: Optional[str] = None) -> Callable[[F], F]:
+    """Decorator timing every call of a function as a span (default name: the function's)."""
+    def decorate(func: F) -> F:
+        span_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not ENABLED and not (_SESSION_SPANS and _session_enabled()):
+                return func(*args, **kwargs)
+            with _Span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def export(profile: Optional[SessionProfile] = None) -> Dict:
+    """Process-wide stats, plus a session's stats and latest rerun when given."""
+    data = {"enabled": ENABLED, "process": PROCESS_STATS.to_dict()}
+    if profile is not None:
+        data["session_enabled"] = profile.enabled
+        data["session"] = profile.stats.to_dict()
+        data["reruns"] = profile.reruns
+        data["last_rerun"] = list(profile.last_rerun)
+    return data
+
+
+def export_json(profile: Optional[SessionProfile] = None, indent: Optional[int] = 2) -> str:
+    """export() as a JSON document."""
+    return json.dumps(export(profile), indent=indent)
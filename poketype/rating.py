@@ -0,0 +1,63 @@
+"""
+Defensive rating for a single attacking type.
+Turns per-type multiplier counts into the net score and the S+ to F rating.
+"""
+
+from typing import Dict, Tuple
+
+# Rating labels from best to worst, with their display colors
+RATINGS: Tuple[str, ...] = ("S+", "S", "A+", "A", "B+", "B", "C+", "C", "D", "E", "F")
+
+RATING_COLORS: Dict[str, str] = {
+    "S+": "#22c55e",  # Bright green
+    "S": "#4ade80",   # Green
+    "A+": "#86efac",  # Light green
+    "A": "#a3e635",   # Lime
+    "B+": "#bef264",  # Yellow-green
+    "B": "#fde047",   # Yellow
+    "C+": "#fbbf24",  # Amber
+    "C": "#fb923c",   # Orange
+    "D": "#f87171",   # Light red
+    "E": "#ef4444",   # Red
+    "F": "#dc2626",   # Red
+}
+
+# Points per rating, used to rank whole teams (sum over the 18 types)
+RATING_POINTS: Dict[str, int] = {rating: len(RATINGS) - 1 - i for i, rating in enumerate(RATINGS)}
+
+# Net score thresholds for the ratings between S and E
+NET_SCORE_THRESHOLDS: Tuple[Tuple[int, str], ...] = (
+    (6, "A+"),
+    (4, "A"),
+    (2, "B+"),
+    (0, "B"),
+    (-2, "C+"),
+    (-4, "C"),
+    (-6, "D"),
+)
+
+
+def get_net_score(immune_count: int, resist_4x_count: int, resist_2x_count: int,
+                  weak_2x_count: int, weak_4x_count: int) -> int:
+    """
+    Calculate score for rating.
+    Positive = good coverage, Negative = vulnerable
+    """
+    defense_score = immune_count * 4 + resist_4x_count * 3 + resist_2x_count * 2
+    offense_score = weak_2x_count * 2 + weak_4x_count * 4
+    return defense_score - offense_score
+
+
+def get_rating(immune_count: int, resist_4x_count: int, resist_2x_count: int,
+               weak_2x_count: int, weak_4x_count: int, net_score: int) -> str:
+    """Rating system with more granularity, S+ to F scale."""
+    if immune_count >= 2 or (immune_count >= 1 and resist_2x_count + resist_4x_count >= 2):
+        return "S+"
+    if immune_count >= 1 and weak_2x_count == 0 and weak_4x_count == 0:
+        return "S"
+    for threshold, rating in NET_SCORE_THRESHOLDS:
+        if net_score >= threshold:
+            return rating
+    if weak_4x_count >= 2 or (weak_4x_count >= 1 and weak_2x_count >= 2):
+        return "F"
+    return "E"
@@ -0,0 +1,187 @@
+"""
+Stale-while-revalidate Pokedex refresh.
+A DatasetRefresher serves the current PokedexStore and, once its snapshot
+is older than max_age, refreshes it on a background thread: conditional
+fetch of pokedex.json, parse, validation, then an atomic swap of the
+store reference. Readers never wait on the network except for the very
+first load when no snapshot exists. A failed or invalid refresh keeps the
+old data and is counted in RefreshMetrics; the next get() after
+retry_interval tries again. An error raised by the on_swap callback does
+not undo the swap and is counted on its own.
+"""
+
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Mapping, Optional, Union
+
+from poketype.pokedex import (FETCH_TIMEOUT, POKEDEX_URL, SNAPSHOT_MAX_AGE, default_snapshot_path, fetch_snapshot,
+                              is_fresh, read_snapshot, write_snapshot)
+from poketype.store import DERIVED_CACHE, PokedexStore
+
+# Seconds between attempts after a failed refresh
+RETRY_INTERVAL = 300
+
+# A new Pokedex smaller than this share of the current one is rejected
+# (truncated or partial payloads)
+MIN_SIZE_RATIO = 0.9
+
+
+def validate_snapshot(snapshot: Mapping, previous: Optional[Mapping] = None) -> None:
+    """Raise ValueError unless a fetched snapshot looks like a usable Pokedex."""
+    pokemon = snapshot.get("pokemon")
+    if not isinstance(pokemon, Mapping) or not pokemon:
+        raise ValueError("snapshot has no Pokemon")
+    for pokemon_id, data in pokemon.items():
+        types = data.get("types") if isinstance(data, Mapping) else None
+        if not data.get("name") or not isinstance(types, list) or not types:
+            raise ValueError(f"malformed entry {pokemon_id!r}")
+    if previous and previous.get("pokemon"):
+        minimum = int(len(previous["pokemon"]) * MIN_SIZE_RATIO)
+        if len(pokemon) < minimum:
+            raise ValueError(f"{len(pokemon)} Pokemon, expected at least {minimum}")
+
+
+class RefreshMetrics:
+    """Counters and timestamps of a DatasetRefresher, read with to_dict()."""
+
+    def __init__(self):
+        self.attempts = 0
+        self.swaps = 0
+        self.not_modified = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+        self.last_attempt: Optional[float] = None
+        self.last_success: Optional[float] = None
+        self.last_duration: Optional[float] = None
+        self.callback_errors = 0
+        self.last_callback_error: Optional[str] = None
+
+    def to_dict(self) -> Dict:
+        return dict(vars(self))
+
+
+class DatasetRefresher:
+    """
+    Current Pokedex plus its background refresh, see the module docstring.
+    on_swap(store) runs on the refresh thread after each swap (e.g.
+    dataset.set_pokemon).
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None, url: str = POKEDEX_URL,
+                 max_age: float = SNAPSHOT_MAX_AGE, timeout: float = FETCH_TIMEOUT,
+                 retry_interval: float = RETRY_INTERVAL,
+                 on_swap: Optional[Callable[[PokedexStore], None]] = None):
+        self.path = Path(path) if path is not None else default_snapshot_path()
+        self.url = url
+        self.max_age = max_age
+        self.timeout = timeout
+        self.retry_interval = retry_interval
+        self.on_swap = on_swap
+        self.metrics = RefreshMetrics()
+        self._snapshot: Optional[Dict] = None
+        self._store: Optional[PokedexStore] = None
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def get(self) -> PokedexStore:
+        """
+        The current store, starting a background refresh when it is stale.
+        Only the first call may block, on loading the snapshot (or fetching
+        one when there is none).
+        """
+        store = self._store
+        if store is None:
+            with self._lock:
+                if self._store is None:
+                    self._load_initial()
+                store = self._store
+        if not is_fresh(self._snapshot, self.max_age) and self._retry_due():
+            self.refresh()
+        return store
+
+    @property
+    def snapshot(self) -> Optional[Dict]:
+        """The snapshot the current store was built from."""
+        return self._snapshot
+
+    def _retry_due(self) -> bool:
+        last_attempt = self.metrics.last_attempt
+        return (self.metrics.last_error is None or last_attempt is None
+                or time.time() - last_attempt >= self.retry_interval)
+
+    def _load_initial(self) -> None:
+        snapshot = read_snapshot(self.path)
+        if snapshot is None:
+            # Nothing to serve yet, so this one fetch happens in the caller
+            snapshot = fetch_snapshot(self.url, timeout=self.timeout)
+            validate_snapshot(snapshot)
+            self._write(snapshot)
+        self._snapshot = snapshot
+        self._store = PokedexStore.from_snapshot(snapshot)
+
+    def refresh(self, wait: bool = False) -> Optional[threading.Thread]:
+        """
+        Start a background refresh unless one is running; returns its
+        thread (None when one was already running). wait=True joins the
+        started or running refresh.
+        """
+        with self._lock:
+            running = self._thread
+            if running is None or not running.is_alive():
+                self._thread = threading.Thread(target=self._refresh, name="pokedex-refresh", daemon=True)
+                self._thread.start()
+            thread = self._thread
+        if wait:
+            thread.join()
+        return None if thread is running else thread
+
+    def _refresh(self) -> None:
+        metrics = self.metrics
+        start = time.perf_counter()
+        metrics.attempts += 1
+        metrics.last_attempt = time.time()
+        previous = self._snapshot
+        try:
+            snapshot = fetch_snapshot(self.url, previous=previous, timeout=self.timeout)
+            if previous is not None and snapshot.get("dataset_version") == previous.get("dataset_version"):
+                # 304 Not Modified (or identical content): same data, now fresh
+                metrics.not_modified += 1
+                self._snapshot = dict(previous, fetched_at=snapshot["fetched_at"])
+            else:
+                validate_snapshot(snapshot, previous)
+                self._swap(snapshot)
+            self._write(self._snapshot)
+        except Exception as e:
+            metrics.failures += 1
+            metrics.last_error = f"{type(e).__name__}: {e}"
+        else:
+            metrics.last_error = None
+            metrics.last_success = time.time()
+        finally:
+            metrics.last_duration = time.perf_counter() - start
+
+    def _swap(self, snapshot: Dict) -> None:
+        """Build the new store off the request path, then replace the reference."""
+        store = PokedexStore.from_snapshot(snapshot)
+        old_version = self._store.version if self._store is not None else None
+        with self._lock:
+            self._snapshot = snapshot
+            self._store = store
+        self.metrics.swaps += 1
+        if old_version and old_version != store.version:
+            DERIVED_CACHE.discard_where(lambda key: key[1] == old_version)
+        if self.on_swap is not None:
+            try:
+                self.on_swap(store)
+            except Exception as e:
+                # The new store is already served; the refresh itself succeeded
+                self.metrics.callback_errors += 1
+                self.metrics.last_callback_error = f"{type(e).__name__}: {e}"
+
+    def _write(self, snapshot: Dict) -> None:
+        try:
+            write_snapshot(self.path, snapshot)
+        except OSError:
+            # Read-only deployments keep the refreshed data in memory only
+            pass
@@ -0,0 +1,205 @@
+"""
+Fuzzy species search.
+Every species is indexed under the words of its name, base species and
+forme, and its showdown id ("Charizard-Mega-X" -> charizard, mega, x,
+charizardmegax). A query is split the same way and each query word must
+match one of a species' terms:
+
+    exact      "mega"    -> mega
+    prefix     "garch"   -> garchomp      (bisect over the sorted terms)
+    trigram    "garchmp" -> garchomp      (typos, and inner parts: "zard")
+
+Species are ranked by the sum of their words' scores, then dex order.
+Generation, type and form_type filters are precomputed masks, so a query
+is a handful of NumPy operations over a few thousand terms.
+"""
+
+import re
+from bisect import bisect_left
+from typing import Collection, Dict, List, Mapping, Optional, Set
+
+import numpy as np
+
+from poketype import engine
+from poketype.store import FORM_TYPE_INDEX, PokedexStore
+
+# A trigram match needs this share of the query word's trigrams
+MIN_CONTAINMENT = 0.5
+
+# Score of a word by match kind; prefix and trigram scores also grow with
+# how much of the term the word covers, staying below the kind above
+EXACT_SCORE = 3.0
+PREFIX_SCORE = 2.0
+TRIGRAM_SCORE = 1.0
+
+_SPLIT = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_words(text: str) -> List[str]:
+    """Lowercase alphanumeric words of a name or query ("Mr. Mime-Galar" -> mr, mime, galar)."""
+    return [word for word in _SPLIT.split(text.lower()) if word]
+
+
+def trigrams(word: str) -> Set[str]:
+    """Trigrams of a word padded with one boundary marker on each side."""
+    padded = f"^{word}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SpeciesSearch:
+    """
+    Search index over one Pokedex.
+    terms is the sorted list of distinct terms (bisect over it stands in
+    for a prefix trie); pair_terms and pair_rows list every (term, species
+    row) pair, and trigram_terms maps a trigram to the terms holding it.
+    """
+
+    def __init__(self, pokemon_dict: Mapping[str, Mapping]):
+        self.ids: List[str] = list(pokemon_dict)
+        size = len(self.ids)
+        self.names: List[str] = []
+        gen = np.zeros(size, dtype=np.uint8)
+        form_type = np.zeros(size, dtype=np.uint8)
+        type_mask = np.zeros(size, dtype=np.int32)
+        num = []
+
+        row_terms: List[Set[str]] = []
+        for row, pokemon_id in enumerate(self.ids):
+            data = pokemon_dict[pokemon_id]
+            name = data["name"]
+            self.names.append(name)
+            num.append(data.get("num", 0))
+            gen[row] = data.get("gen", 1)
+            form_type[row] = FORM_TYPE_INDEX.get(data.get("form_type", "base"), FORM_TYPE_INDEX["form"])
+            for type_name in data.get("types", ()):
+                if type_name in engine.TYPE_INDEX:
+                    type_mask[row] |= 1 << engine.TYPE_INDEX[type_name]
+            terms = set(normalize_words(name))
+            terms.update(normalize_words(data.get("base_species", "")))
+            terms.update(normalize_words(data.get("forme", "")))
+            terms.add("".join(normalize_words(pokemon_id)))
+            terms.add("".join(normalize_words(name)))
+            row_terms.append(terms)
+
+        self.terms: List[str] = sorted(set().union(*row_terms)) if row_terms else []
+        term_index = {term: i for i, term in enumerate(self.terms)}
+        pair_terms, pair_rows = [], []
+        for row, terms in enumerate(row_terms):
+            for term in terms:
+                pair_terms.append(term_index[term])
+                pair_rows.append(row)
+        self.pair_terms = np.array(pair_terms, dtype=np.int32)
+        self.pair_rows = np.array(pair_rows, dtype=np.int32)
+        # Pairs are grouped by row (every row has its id term), for reduceat
+        self.row_starts = np.searchsorted(self.pair_rows, np.arange(size))
+        self.term_lengths = np.array([len(term) for term in self.terms], dtype=np.float64)
+
+        # Trigram -> ids of the terms containing it
+        postings: Dict[str, List[int]] = {}
+        for term_id, term in enumerate(self.terms):
+            for trigram in trigrams(term):
+                postings.setdefault(trigram, []).append(term_id)
+        self.trigram_terms: Dict[str, np.ndarray] = {
+            trigram: np.array(term_ids, dtype=np.int32) for trigram, term_ids in postings.items()
+        }
+        self.term_trigram_counts = np.array([len(trigrams(term)) for term in self.terms], dtype=np.float64)
+
+        self.gen = gen
+        self.form_type = form_type
+        self.type_mask = type_mask
+        # Rank in (num, name) order, the final tiebreak
+        order = sorted(range(size), key=lambda row: (num[row], self.names[row]))
+        self.dex_rank = np.empty(size, dtype=np.int32)
+        self.dex_rank[order] = np.arange(size, dtype=np.int32)
+        self.dex_order = np.array(order, dtype=np.int32)
+
+    def _term_scores(self, word: str) -> np.ndarray:
+        """Score of every term for one query word, 0 where it does not match."""
+        scores = np.zeros(len(self.terms))
+
+        # Trigram containment, for typos and words inside longer terms
+        word_trigrams = trigrams(word)
+        posting_lists = [self.trigram_terms[t] for t in word_trigrams if t in self.trigram_terms]
+        if posting_lists:
+            shared = np.bincount(np.concatenate(posting_lists), minlength=len(self.terms))
+            containment = shared / len(word_trigrams)
+            dice = 2 * shared / (len(word_trigrams) + self.term_trigram_counts)
+            matched = containment >= MIN_CONTAINMENT
+            scores[matched] = TRIGRAM_SCORE * (containment[matched] + dice[matched]) / 2
+
+        # Prefixes sit in one contiguous run of the sorted terms
+        start = bisect_left(self.terms, word)
+        end = bisect_left(self.terms, word + "\x7f", start)
+        if end > start:
+            scores[start:end] = PREFIX_SCORE + len(word) / self.term_lengths[start:end] * 0.99
+            if self.terms[start] == word:
+                scores[start] = EXACT_SCORE
+        return scores
+
+    def _mask(self, generation: Optional[int], types: Optional[Collection[str]],
+              form_types: Optional[Collection[str]]) -> Optional[np.ndarray]:
+        mask = None
+        if generation is not None:
+            mask = self.gen == generation
+        if types:
+            bits = 0
+            for type_name in types:
+                if type_name not in engine.TYPE_INDEX:
+                    raise ValueError(f"unknown type {type_name!r}, expected one of {engine.TYPES}")
+                bits |= 1 << engine.TYPE_INDEX[type_name]
+            # Species having every requested type
+            mask = ((self.type_mask & bits) == bits) if mask is None else mask & ((self.type_mask & bits) == bits)
+        if form_types is not None:
+            allowed = np.isin(self.form_type, [FORM_TYPE_INDEX[f] for f in form_types if f in FORM_TYPE_INDEX])
+            mask = allowed if mask is None else mask & allowed
+        return mask
+
+    def search(self, query: str, limit: int = 10, generation: Optional[int] = None,
+               types: Optional[Collection[str]] = None,
+               form_types: Optional[Collection[str]] = None) -> List[Dict]:
+        """
+        Best matching species, as dicts with id, name and score. An empty
+        query lists the filtered species in dex order. types keeps species
+        with all the given types (ValueError for an unknown one); form_types
+        takes store.FORM_TYPES names.
+        """
+        mask = self._mask(generation, types, form_types)
+        words = normalize_words(query)
+        if not words or not self.ids:
+            rows = self.dex_order if mask is None else self.dex_order[mask[self.dex_order]]
+            return [{"id": self.ids[row], "name": self.names[row], "score": 0.0} for row in rows[:limit].tolist()]
+
+        total = np.zeros(len(self.ids))
+        matched = np.ones(len(self.ids), dtype=bool)
+        for word in words:
+            # Best term of each species
+            word_scores = np.maximum.reduceat(self._term_scores(word)[self.pair_terms], self.row_starts)
+            total += word_scores
+            matched &= word_scores > 0
+        if mask is not None:
+            matched &= mask
+
+        rows = np.nonzero(matched)[0]
+        if len(rows) > limit:
+            # Keep every row tied with the limit-th score, then sort exactly
+            cutoff = np.partition(total[rows], len(rows) - limit)[len(rows) - limit]
+            rows = rows[total[rows] >= cutoff]
+        rows = rows[np.lexsort((self.dex_rank[rows], -total[rows]))][:limit]
+        return [
+            {"id": self.ids[row], "name": self.names[row], "score": round(float(total[row]), 3)}
+            for row in rows.tolist()
+        ]
+
+
+def search_species(query: str, pokemon_dict: Optional[Mapping[str, Mapping]] = None, limit: int = 10,
+                   **filters) -> List[Dict]:
+    """
+    Fuzzy species search, see SpeciesSearch.search for filters.
+    A PokedexStore keeps its index across calls; plain dicts build one per
+    call.
+    """
+    if pokemon_dict is None:
+        from poketype.dataset import get_pokemon
+        pokemon_dict = get_pokemon()
+    index = pokemon_dict.search_index if isinstance(pokemon_dict, PokedexStore) else SpeciesSearch(pokemon_dict)
+    return index.search(query, limit, **filters)
@@ -0,0 +1,108 @@
+"""
+Pokemon Showdown team export parsing.
+Streams teams out of export text line by line, so a dump of any size is
+never held in memory, and resolves species names to Pokedex ids.
+"""
+
+import re
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional
+
+# "=== [gen9ou] Folder/Team name ===" (the format tag is optional)
+TEAM_HEADER = re.compile(r"^===\s*(?:\[(?P<format>[^\]]*)\]\s*)?(?P<name>.*?)\s*===$")
+
+# Without headers an export is cut into teams of this many sets
+TEAM_SIZE = 6
+
+_NON_ID_CHARS = re.compile(r"[^a-z0-9]")
+
+
+def to_id(text: str) -> str:
+    """Showdown's toID: lowercase, letters and digits only."""
+    return _NON_ID_CHARS.sub("", text.lower())
+
+
+def parse_species(line: str) -> str:
+    """
+    Species name from the first line of a set:
+    "Nickname (Species) (F) @ Item", "Species (M) @ Item" or "Species".
+    """
+    line = line.split(" @ ", 1)[0].strip()
+    if line.endswith((" (M)", " (F)")):
+        line = line[:-4].rstrip()
+    if line.endswith(")") and " (" in line:
+        line = line[line.rindex(" (") + 2:-1]
+    return line.strip()
+
+
+def _new_team(name: str = "", team_format: str = "") -> Dict:
+    return {"name": name, "format": team_format, "species": []}
+
+
+def iter_teams(lines: Iterable[str]) -> Iterator[Dict]:
+    """
+    Yield {"name", "format", "species"} for each team in export text.
+    Teams start at "=== [format] name ===" headers; text without headers is
+    cut every TEAM_SIZE sets. Species are the names as written.
+    """
+    team = _new_team()
+    has_header = False
+    in_set = False
+
+    for line in lines:
+        line = line.strip()
+        if not line:
+            in_set = False
+            continue
+
+        header = TEAM_HEADER.match(line)
+        if header:
+            if team["species"]:
+                yield team
+            team = _new_team(header.group("name"), header.group("format") or "")
+            has_header = True
+            in_set = False
+            continue
+
+        if in_set:
+            # Ability, EVs, nature, moves... only the species matters here
+            continue
+        in_set = True
+
+        if not has_header and len(team["species"]) == TEAM_SIZE:
+            yield team
+            team = _new_team()
+        team["species"].append(parse_species(line))
+
+    if team["species"]:
+        yield team
+
+
+def species_name_index(pokemon_dict: Mapping[str, Mapping]) -> Dict[str, str]:
+    """toID(display name) -> Pokedex id, for names that differ from the id."""
+    return {to_id(data["name"]): pokemon_id for pokemon_id, data in pokemon_dict.items()}
+
+
+def resolve_species(name: str, pokemon_dict: Mapping[str, Mapping],
+                    name_index: Optional[Mapping[str, str]] = None) -> Optional[str]:
+    """Pokedex id of a species name from an export, or None if unknown."""
+    species_id = to_id(name)
+    if species_id in pokemon_dict:
+        return species_id
+    if name_index is None:
+        name_index = species_name_index(pokemon_dict)
+    return name_index.get(species_id)
+
+
+def resolve_team(species: List[str], pokemon_dict: Mapping[str, Mapping],
+                 name_index: Optional[Mapping[str, str]] = None) -> Dict[str, List[str]]:
+    """Split species names into resolved ids and unknown names."""
+    if name_index is None:
+        name_index = species_name_index(pokemon_dict)
+    resolved = {"species": [], "unknown": []}
+    for name in species:
+        species_id = resolve_species(name, pokemon_dict, name_index)
+        if species_id is None:
+            resolved["unknown"].append(name)
+        else:
+            resolved["species"].append(species_id)
+    return resolved
@@ -0,0 +1,300 @@
+"""
+Compact columnar Pokedex.
+
+Holds the same data as the dict built by parse_pokedex, but as columns:
+interned strings in tuples (ability lists shared between species with the
+same abilities), typings as small integer codes and gen/num/form_type as
+typed NumPy arrays. Indexing the store returns a lightweight SpeciesRecord
+view, so existing POKEMON[pid]["types"] callers keep working.
+"""
+
+import sys
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from poketype import engine
+from poketype.cache import LRUCache
+from poketype.typechart import DEFAULT_CHART, TYPES
+
+if TYPE_CHECKING:
+    from poketype.abilities import AbilityVectors
+    from poketype.cores import DefensiveCores
+    from poketype.indexes import PokedexIndexes
+    from poketype.search import SpeciesSearch
+    from poketype.threats import ThreatIndex
+
+# Form categories assigned by parse_pokedex
+FORM_TYPES: Tuple[str, ...] = ("base", "mega", "gmax", "alola", "galar", "hisui", "paldea", "form")
+
+FORM_TYPE_INDEX: Dict[str, int] = {form_type: i for i, form_type in enumerate(FORM_TYPES)}
+
+# Type code for "no second type"
+NO_TYPE = -1
+
+# Derived structures keyed by (kind, dataset version)
+DERIVED_CACHE = LRUCache(maxsize=16)
+
+RECORD_KEYS = ("name", "types", "showdown_id", "num", "gen", "form_type", "base_species", "forme", "abilities")
+
+
+class SpeciesRecord(Mapping):
+    """Read-only dict-like view of one species row in a PokedexStore."""
+
+    __slots__ = ("_store", "_row")
+
+    def __init__(self, store: "PokedexStore", row: int):
+        self._store = store
+        self._row = row
+
+    def __getitem__(self, key: str):
+        store = self._store
+        row = self._row
+        if key == "name":
+            return store.names[row]
+        if key == "types":
+            return store.get_types(row)
+        if key == "showdown_id":
+            return store.ids[row]
+        if key == "num":
+            return int(store.num[row])
+        if key == "gen":
+            return int(store.gen[row])
+        if key == "form_type":
+            return FORM_TYPES[store.form_type[row]]
+        if key == "base_species":
+            return store.base_species[row]
+        if key == "forme":
+            return store.formes[row]
+        if key == "abilities":
+            return list(store.abilities[row])
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(RECORD_KEYS)
+
+    def __len__(self) -> int:
+        return len(RECORD_KEYS)
+
+    def __repr__(self) -> str:
+        return f"SpeciesRecord({dict(self)!r})"
+
+
+def freeze_arrays(value) -> None:
+    """
+    Mark the NumPy arrays a derived structure holds read-only: its
+    attributes and the values of its dict/tuple/list attributes.
+    """
+    for item in getattr(value, "__dict__", {}).values():
+        if isinstance(item, dict):
+            item = item.values()
+        elif not isinstance(item, (tuple, list)):
+            item = (item,)
+        for array in item:
+            if isinstance(array, np.ndarray):
+                array.flags.writeable = False
+
+
+class PokedexStore(Mapping):
+    """
+    Columnar Pokedex keyed by showdown id.
+    Row i of every column describes species ids[i]. A store is frozen once
+    built: columns are tuples and read-only arrays, the mappings are
+    read-only proxies and setting or deleting an attribute raises, so a
+    single instance (and the derived structures it caches) can be shared by
+    every session and thread of the process.
+    """
+
+    def __init__(self, ids: Tuple[str, ...], names: Tuple[str, ...], base_species: Tuple[str, ...],
+                 formes: Tuple[str, ...], type1: np.ndarray, type2: np.ndarray, num: np.ndarray,
+                 gen: np.ndarray, form_type: np.ndarray, odd_types: Optional[Dict[int, Tuple[str, ...]]] = None,
+                 version: str = "", abilities: Optional[Tuple[Tuple[str, ...], ...]] = None):
+        self.ids = ids
+        self.names = names
+        self.base_species = base_species
+        self.formes = formes
+        self.type1 = type1
+        self.type2 = type2
+        self.num = num
+        self.gen = gen
+        self.form_type = form_type
+        # Typings that do not fit two known type codes, kept verbatim
+        self.odd_types: Mapping[int, Tuple[str, ...]] = MappingProxyType(dict(odd_types or {}))
+        self.abilities = abilities if abilities is not None else ((),) * len(ids)
+        self.version = version
+        self.position: Mapping[str, int] = MappingProxyType({pokemon_id: row for row, pokemon_id in enumerate(ids)})
+        self.combo = self._build_combo_codes()
+        for column in (self.type1, self.type2, self.num, self.gen, self.form_type, self.combo):
+            column.flags.writeable = False
+        # Derived structures built on first use, see _derived
+        self._memo: Dict[str, object] = {}
+        self._frozen = True
+
+    def __setattr__(self, name: str, value) -> None:
+        if self.__dict__.get("_frozen"):
+            raise AttributeError(f"PokedexStore is read-only, cannot set {name!r}")
+        super().__setattr__(name, value)
+
+    def __delattr__(self, name: str) -> None:
+        if self.__dict__.get("_frozen"):
+            raise AttributeError(f"PokedexStore is read-only, cannot delete {name!r}")
+        super().__delattr__(name)
+
+    def __getstate__(self) -> Dict:
+        # Proxies do not pickle and derived structures are rebuilt (or found
+        # in DERIVED_CACHE) on the copy
+        state = dict(self.__dict__)
+        state["odd_types"] = dict(self.odd_types)
+        state["position"] = dict(self.position)
+        state["_memo"] = {}
+        return state
+
+    def __setstate__(self, state: Dict) -> None:
+        state["odd_types"] = MappingProxyType(state["odd_types"])
+        state["position"] = MappingProxyType(state["position"])
+        self.__dict__.update(state)
+        for column in (self.type1, self.type2, self.num, self.gen, self.form_type, self.combo):
+            column.flags.writeable = False
+
+    @classmethod
+    def from_dict(cls, pokemon_dict: Mapping[str, Mapping], version: str = "") -> "PokedexStore":
+        """Build a store from a parse_pokedex-style dict."""
+        size = len(pokemon_dict)
+        type1 = np.full(size, NO_TYPE, dtype=np.int8)
+        type2 = np.full(size, NO_TYPE, dtype=np.int8)
+        num = np.zeros(size, dtype=np.uint16)
+        gen = np.zeros(size, dtype=np.uint8)
+        form_type = np.zeros(size, dtype=np.uint8)
+        ids, names, base_species, formes = [], [], [], []
+        odd_types: Dict[int, Tuple[str, ...]] = {}
+        abilities: List[Tuple[str, ...]] = []
+        ability_sets: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+        type_index = engine.TYPE_INDEX
+
+        for row, (pokemon_id, data) in enumerate(pokemon_dict.items()):
+            ids.append(sys.intern(pokemon_id))
+            names.append(sys.intern(data["name"]))
+            base_species.append(sys.intern(data.get("base_species", "")))
+            formes.append(sys.intern(data.get("forme", "")))
+            num[row] = data.get("num", 0)
+            gen[row] = data.get("gen", 1)
+            form_type[row] = FORM_TYPE_INDEX.get(data.get("form_type", "base"), FORM_TYPE_INDEX["form"])
+            species_abilities = tuple(sys.intern(a) for a in data.get("abilities", ()))
+            abilities.append(ability_sets.setdefault(species_abilities, species_abilities))
+
+            types = data.get("types", [])
+            if 1 <= len(types) <= 2 and all(t in type_index for t in types):
+                type1[row] = type_index[types[0]]
+                if len(types) == 2:
+                    type2[row] = type_index[types[1]]
+            else:
+                odd_types[row] = tuple(sys.intern(t) for t in types)
+
+        return cls(tuple(ids), tuple(names), tuple(base_species), tuple(formes),
+                   type1, type2, num, gen, form_type, odd_types, version, tuple(abilities))
+
+    @classmethod
+    def from_snapshot(cls, snapshot: Mapping) -> "PokedexStore":
+        """Build a store from a poketype.pokedex snapshot."""
+        return cls.from_dict(snapshot["pokemon"], version=snapshot.get("dataset_version", ""))
+
+    def _build_combo_codes(self) -> np.ndarray:
+        """engine.COMBOS code of every row, -1 where the typing is not in the table."""
+        combo = np.full(len(self.ids), -1, dtype=np.int16)
+        for row in range(len(self.ids)):
+            if row in self.odd_types:
+                combo[row] = engine.combo_code(self.odd_types[row])
+                continue
+            t1, t2 = int(self.type1[row]), int(self.type2[row])
+            key = (t1,) if t2 == NO_TYPE else (min(t1, t2), max(t1, t2))
+            combo[row] = engine.COMBO_INDEX.get(key, -1)
+        return combo
+
+    def get_types(self, row: int) -> List[str]:
+        """Type names of a row, in the original Showdown order."""
+        if row in self.odd_types:
+            return list(self.odd_types[row])
+        t2 = self.type2[row]
+        if t2 == NO_TYPE:
+            return [TYPES[self.type1[row]]]
+        return [TYPES[self.type1[row]], TYPES[t2]]
+
+    def __getitem__(self, pokemon_id: str) -> SpeciesRecord:
+        return SpeciesRecord(self, self.position[pokemon_id])
+
+    def __contains__(self, pokemon_id) -> bool:
+        return pokemon_id in self.position
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.ids)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __repr__(self) -> str:
+        return f"PokedexStore({len(self)} species, version={self.version!r})"
+
+    def _derived(self, kind: str, build: Callable[["PokedexStore"], object]):
+        """
+        Structure derived from the data, built on first use with its arrays
+        made read-only. Versioned stores share it through DERIVED_CACHE, so
+        copies of the same dataset (e.g. unpickled ones) do not rebuild it.
+        """
+        value = self._memo.get(kind)
+        if value is None:
+            def build_frozen():
+                built = build(self)
+                freeze_arrays(built)
+                return built
+
+            if self.version:
+                value = DERIVED_CACHE.get_or_compute((kind, self.version), build_frozen)
+            else:
+                value = build_frozen()
+            self._memo[kind] = value
+        return value
+
+    @property
+    def indexes(self) -> "PokedexIndexes":
+        """Generation/form/species/type indexes."""
+        from poketype.indexes import PokedexIndexes
+        return self._derived("indexes", PokedexIndexes)
+
+    @property
+    def threat_index(self) -> "ThreatIndex":
+        """STAB threat matrices."""
+        from poketype.threats import ThreatIndex
+        return self._derived("threat_index", ThreatIndex)
+
+    @property
+    def search_index(self) -> "SpeciesSearch":
+        """Fuzzy species search index."""
+        from poketype.search import SpeciesSearch
+        return self._derived("search_index", SpeciesSearch)
+
+    def ability_vectors(self, mode: str, chart: int = DEFAULT_CHART) -> "AbilityVectors":
+        """Ability-aware defensive vectors for an ability mode and chart."""
+        from poketype.abilities import AbilityVectors
+        return self._derived(f"abilities-{mode}-{chart}", lambda store: AbilityVectors(store, mode, chart))
+
+    def defensive_cores(self, chart: int = DEFAULT_CHART) -> "DefensiveCores":
+        """Valid 2- and 3-typing defensive cores under a chart."""
+        from poketype.cores import DefensiveCores
+        return self._derived(f"cores-{chart}", lambda store: DefensiveCores(store, chart))
+
+    def defense_matrix(self, team: List[str], chart: int = DEFAULT_CHART) -> np.ndarray:
+        """
+        (members x 18) defensive multiplier matrix for a team, one table row
+        per member. Ids not in the store are skipped.
+        """
+        rows = [self.position[pokemon_id] for pokemon_id in team if pokemon_id in self.position]
+        codes = self.combo[rows]
+        if (codes >= 0).all():
+            return engine.defense_table(chart)[codes]
+        return engine.defense_matrix([self.get_types(row) for row in rows], chart)
+
+    def to_dict(self) -> Dict[str, Dict]:
+        """Expand back into the parse_pokedex dict layout."""
+        return {pokemon_id: dict(self[pokemon_id]) for pokemon_id in self.ids}
@@ -0,0 +1,148 @@
+"""
+Incremental team analysis.
+TeamState keeps per-type multiplier counts for the current members and
+updates them in O(18) when a member is added, removed or swapped, instead of
+re-running analyze_team_by_type over the whole team. Switching the type
+chart or the ability mode only re-sums the members' rows for it.
+"""
+
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from poketype import engine
+from poketype.abilities import species_defense_vector
+from poketype.batch import (CLASS_BITS, CLASS_MASK, COUNT_KEYS, MAX_SLOTS, NET_SCORE_LUT, RATING_LUT,
+                            pack_defense_vectors)
+from poketype.rating import RATING_COLORS, RATINGS
+from poketype.typechart import DEFAULT_CHART, TYPES
+
+# Per chart, its type indices in the alphabetical order analyze_team_by_type returns
+_SORTED_TYPE_INDICES = tuple(
+    sorted(type_ids, key=lambda i: TYPES[i]) for type_ids in engine.CHART_TYPE_IDS
+)
+
+_ZERO_ROW: Tuple[int, ...] = (0,) * len(TYPES)
+
+
+class TeamState:
+    """
+    Team members plus their per-type packed multiplier class counts.
+    Members missing from the Pokedex are kept but contribute nothing,
+    like analyze_team_by_type skipping them.
+    """
+
+    def __init__(self, pokemon_dict: Mapping[str, Mapping], members: Iterable[str] = (),
+                 chart: int = DEFAULT_CHART, ability_mode: Optional[str] = None):
+        self.pokemon_dict = pokemon_dict
+        self.version = getattr(pokemon_dict, "version", "")
+        self.chart = chart
+        self.ability_mode = ability_mode
+        self.members: List[str] = []
+        self._packed: List[int] = list(_ZERO_ROW)
+        self._rows: Dict[Tuple[int, Optional[str], str], Tuple[int, ...]] = {}
+        self._analysis: Optional[List[Dict]] = None
+        for pokemon_id in members:
+            self.add(pokemon_id)
+
+    def __len__(self) -> int:
+        return len(self.members)
+
+    def __contains__(self, pokemon_id: str) -> bool:
+        return pokemon_id in self.members
+
+    def _row(self, pokemon_id: str) -> Tuple[int, ...]:
+        """Packed class row of one species in the current chart and ability mode (all zero if unknown)."""
+        key = (self.chart, self.ability_mode, pokemon_id)
+        row = self._rows.get(key)
+        if row is None:
+            if pokemon_id in self.pokemon_dict:
+                vector = species_defense_vector(pokemon_id, self.pokemon_dict, self.ability_mode, self.chart)
+                row = tuple(pack_defense_vectors(vector).tolist())
+            else:
+                row = _ZERO_ROW
+            self._rows[key] = row
+        return row
+
+    def add(self, pokemon_id: str) -> None:
+        """Append a member and add its counts."""
+        if len(self.members) >= MAX_SLOTS:
+            raise ValueError(f"TeamState holds at most {MAX_SLOTS} members")
+        self.members.append(pokemon_id)
+        self._packed = [total + value for total, value in zip(self._packed, self._row(pokemon_id))]
+        self._analysis = None
+
+    def remove(self, pokemon_id: str) -> None:
+        """Remove the first occurrence of a member and subtract its counts."""
+        self.members.remove(pokemon_id)
+        self._packed = [total - value for total, value in zip(self._packed, self._row(pokemon_id))]
+        self._analysis = None
+
+    def swap(self, old_id: str, new_id: str) -> None:
+        """Replace a member in place, keeping its slot."""
+        slot = self.members.index(old_id)
+        self.members[slot] = new_id
+        self._packed = [
+            total - old + new
+            for total, old, new in zip(self._packed, self._row(old_id), self._row(new_id))
+        ]
+        self._analysis = None
+
+    def set_chart(self, chart: int) -> None:
+        """Switch type chart, re-summing the members' rows for it."""
+        if chart != self.chart:
+            self.chart = chart
+            self._resum()
+
+    def set_ability_mode(self, ability_mode: Optional[str]) -> None:
+        """Switch ability mode (None = type-only), re-summing the members' rows for it."""
+        if ability_mode != self.ability_mode:
+            self.ability_mode = ability_mode
+            self._resum()
+
+    def _resum(self) -> None:
+        packed = list(_ZERO_ROW)
+        for pokemon_id in self.members:
+            packed = [total + value for total, value in zip(packed, self._row(pokemon_id))]
+        self._packed = packed
+        self._analysis = None
+
+    def clear(self) -> None:
+        self.members.clear()
+        self._packed = list(_ZERO_ROW)
+        self._analysis = None
+
+    def counts(self, type_index: int) -> Tuple[int, ...]:
+        """(immune, resist_4x, resist_2x, neutral, weak_2x, weak_4x) for one attacking type."""
+        packed = self._packed[type_index]
+        return tuple((packed >> (CLASS_BITS * class_id)) & CLASS_MASK for class_id in range(len(COUNT_KEYS)))
+
+    def analysis(self) -> List[Dict]:
+        """
+        Same result as analyze_team_by_type(self.members, chart=self.chart,
+        ability_mode=self.ability_mode).
+        Cached until the next change; treat the result as read-only.
+        """
+        if self._analysis is None:
+            packed = np.array(self._packed, dtype=np.int64)
+            net_scores = NET_SCORE_LUT[packed].tolist()
+            ratings = RATING_LUT[packed].tolist()
+            results = []
+            for atk_index in _SORTED_TYPE_INDICES[self.chart]:
+                immune, resist_4x, resist_2x, neutral, weak_2x, weak_4x = self.counts(atk_index)
+                net_score = net_scores[atk_index]
+                rating = RATINGS[ratings[atk_index]]
+                results.append({
+                    "type": TYPES[atk_index],
+                    "immune": immune,
+                    "resist_4x": resist_4x,
+                    "resist_2x": resist_2x,
+                    "neutral": neutral,
+                    "weak_2x": weak_2x,
+                    "weak_4x": weak_4x,
+                    "rating": rating,
+                    "rating_color": RATING_COLORS[rating],
+                    "net_score": net_score
+                })
+            self._analysis = results
+        return self._analysis
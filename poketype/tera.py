@@ -0,0 +1,211 @@
+"""
+Tera type search.
+In Gen 9 a member can Terastallize, turning its defensive typing into a
+single Tera type. search_tera finds the Tera choice per member (or none)
+that maximizes the team's total score over the 18 attacking types, ranked
+like optimizer.suggest_completions: rating points first, net score second,
+then fewer Terastallized members.
+
+The 19^6 assignments of a full team are not enumerated one by one:
+members' options are deduplicated by packed class row, the team is split
+in two halves whose distinct packed totals (at most 19^3 each, usually far
+fewer) are scored against each other in NumPy batches through per type
+pair lookup tables, and left states whose bound cannot beat the best
+assignment found are skipped.
+"""
+
+import time
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from poketype import engine
+from poketype.abilities import species_defense_vector, species_vector
+from poketype.analysis import _analyze_matrix
+from poketype.batch import NET_SCORE_LUT, pack_defense_vectors
+from poketype.optimizer import RATING_POINTS_LUT, TYPE_SCORE_LUT
+from poketype.typechart import TYPES
+
+# Generation that introduced Terastallization
+TERA_GENERATION = 9
+
+# Tera types with a defensive effect (Stellar keeps the original typing)
+TERA_TYPES: Tuple[str, ...] = TYPES
+
+# Scores are scaled so one Tera less breaks ties (at most 7 members)
+TERA_SCALE = 8
+
+# Left x right state pairs scored per NumPy batch (bounds temporary memory)
+EVAL_PAIRS = 1 << 18
+
+# Attacking types scored together through one small lookup table
+TYPE_GROUPS: Tuple[Tuple[int, ...], ...] = tuple(
+    tuple(range(start, start + 2)) for start in range(0, engine.NUM_TYPES, 2)
+)
+
+
+def member_options(pokemon_id: str, pokemon_dict: Mapping[str, Mapping],
+                   ability_mode: Optional[str] = None) -> Tuple[np.ndarray, List[Optional[str]]]:
+    """
+    (options x 18) defensive vectors of one member and the Tera type of
+    each option, None (no Tera) first.
+    """
+    keep = species_defense_vector(pokemon_id, pokemon_dict, ability_mode)
+    if ability_mode is None:
+        # engine.COMBOS starts with the mono types, in TYPES order
+        tera = engine.DEFENSE_TABLE[:engine.NUM_TYPES]
+    else:
+        abilities = pokemon_dict[pokemon_id].get("abilities", ())
+        tera = np.stack([species_vector([tera_type], abilities, ability_mode) for tera_type in TERA_TYPES])
+    return np.vstack([keep[None, :], tera]), [None] + list(TERA_TYPES)
+
+
+def _unique_options(vectors: np.ndarray, labels: List[Optional[str]]) -> Tuple[np.ndarray, List[Optional[str]]]:
+    """Packed rows of the distinct options, keeping the first label of each."""
+    packed = pack_defense_vectors(vectors)
+    seen: Dict[bytes, int] = {}
+    for row, label in enumerate(labels):
+        seen.setdefault(packed[row].tobytes(), row)
+    rows = sorted(seen.values())
+    return packed[rows], [labels[row] for row in rows]
+
+
+def _half_states(options: Sequence[np.ndarray]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Distinct packed totals of every option combination of some members,
+    with the fewest Teras reaching each and the flat index of that
+    combination (see np.unravel_index), sorted by Tera count.
+    """
+    states = np.zeros((1, engine.NUM_TYPES), dtype=np.int32)
+    teras = np.zeros(1, dtype=np.int32)
+    for rows in options:
+        states = (states[:, None, :] + rows[None, :, :]).reshape(-1, engine.NUM_TYPES)
+        teras = (teras[:, None] + (np.arange(len(rows)) > 0)).ravel()
+    order = np.argsort(teras, kind="stable")
+    _, first = np.unique(states[order], axis=0, return_index=True)
+    keep = order[np.sort(first)]
+    return states[keep], teras[keep], keep
+
+
+def _group_tables(left: np.ndarray, right: np.ndarray) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    For each of TYPE_GROUPS, the score table of every distinct left x right
+    pair of class counts on those types (at most a few hundred each way),
+    with the row of each left state and the column of each right state.
+    Summing the tables over the groups scores a pair of states with 9
+    lookups into small, cache resident tables instead of 18 into
+    TYPE_SCORE_LUT.
+    """
+    tables = []
+    for group in TYPE_GROUPS:
+        columns = list(group)
+        left_values, left_codes = np.unique(left[:, columns], axis=0, return_inverse=True)
+        right_values, right_codes = np.unique(right[:, columns], axis=0, return_inverse=True)
+        # Two scores of at most 10063 each fit in int16
+        table = TYPE_SCORE_LUT[left_values[:, None, :] + right_values[None, :, :]].sum(axis=2).astype(np.int16)
+        tables.append((table, left_codes.ravel(), right_codes.ravel()))
+    return tables
+
+
+def best_tera_by_type(vectors: np.ndarray, labels: List[Optional[str]]) -> Dict[str, Dict]:
+    """
+    For each attacking type, the lowest multiplier a member can reach and
+    the Tera types reaching it (empty when its own typing already does).
+    """
+    result = {}
+    for atk_index, atk_type in enumerate(TYPES):
+        column = vectors[:, atk_index]
+        best = float(column.min())
+        result[atk_type] = {
+            "multiplier": best,
+            "current": float(column[0]),
+            "tera": [] if column[0] == best else [label for label, mult in zip(labels, column.tolist()) if mult == best],
+        }
+    return result
+
+
+def search_tera(pokemon_dict: Mapping[str, Mapping], team: Sequence[str], ability_mode: Optional[str] = None,
+                max_tera: Optional[int] = None, time_budget: Optional[float] = None) -> Dict:
+    """
+    Best Tera assignment for a team, see the module docstring.
+    max_tera limits how many members may Terastallize (None = any). With a
+    time_budget (seconds) the search stops early, returning the best
+    assignment found so far with "complete" set to False. Also reports, per
+    member and attacking type, the Tera types that minimize the multiplier.
+    """
+    start_time = time.perf_counter()
+    deadline = start_time + time_budget if time_budget is not None else None
+    members = [pokemon_id for pokemon_id in team if pokemon_id in pokemon_dict]
+    limit = len(members) if max_tera is None else max_tera
+
+    all_options = [member_options(pokemon_id, pokemon_dict, ability_mode) for pokemon_id in members]
+    options = [_unique_options(vectors, labels) for vectors, labels in all_options]
+    rows = [packed for packed, _ in options]
+    keep_total = sum((packed[0] for packed in rows), np.zeros(engine.NUM_TYPES, dtype=np.int32))
+
+    # Meet in the middle: every left half state against every right half state
+    split = (len(rows) + 1) // 2
+    left, left_teras, left_index = _half_states(rows[:split])
+    right, right_teras, right_index = _half_states(rows[split:])
+    usable = left_teras <= limit
+    left, left_teras, left_index = left[usable], left_teras[usable], left_index[usable]
+
+    # Bound of each left state: the best each type group can reach on its own
+    tables = _group_tables(left, right)
+    bounds = sum(table.max(axis=1).astype(np.int64)[left_codes] for table, left_codes, _ in tables)
+    bounds = bounds * TERA_SCALE - left_teras
+    order = np.argsort(-bounds, kind="stable")
+
+    # The no-Tera assignment is both halves' state 0
+    best_score = int(TYPE_SCORE_LUT[keep_total].sum()) * TERA_SCALE
+    best_pair = (0, 0)
+    complete = True
+    pairs = 0
+    chunk = max(1, EVAL_PAIRS // len(right))
+    for offset in range(0, len(order), chunk):
+        if deadline is not None and time.perf_counter() > deadline:
+            complete = False
+            break
+        batch = order[offset:offset + chunk]
+        batch = batch[bounds[batch] > best_score]
+        if not len(batch):
+            # Bounds are sorted, no later state can do better
+            break
+        scores = np.zeros((len(batch), len(right)), dtype=np.int32)
+        for table, left_codes, right_codes in tables:
+            scores += np.take(table[left_codes[batch]], right_codes, axis=1)
+        scores = scores * TERA_SCALE - left_teras[batch][:, None] - right_teras[None, :]
+        scores[left_teras[batch][:, None] + right_teras[None, :] > limit] = np.iinfo(np.int32).min
+        pairs += scores.size
+        flat = int(np.argmax(scores))
+        if scores.flat[flat] > best_score:
+            best_score = int(scores.flat[flat])
+            best_pair = (int(batch[flat // len(right)]), flat % len(right))
+
+    best_choice = (
+        np.unravel_index(left_index[best_pair[0]], [len(packed) for packed in rows[:split]])
+        + np.unravel_index(right_index[best_pair[1]], [len(packed) for packed in rows[split:]])
+    ) if members else ()
+    best_choice = tuple(int(choice) for choice in best_choice)
+
+    total = sum((packed[choice] for packed, choice in zip(rows, best_choice)), np.zeros_like(keep_total))
+    tera = [labels[choice] for (_, labels), choice in zip(options, best_choice)]
+    matrix = np.stack([
+        vectors[labels.index(label)] for (vectors, labels), label in zip(all_options, tera)
+    ]) if members else np.empty((0, engine.NUM_TYPES))
+    return {
+        "members": members,
+        "tera": tera,
+        "rating_points": int(RATING_POINTS_LUT[total].sum()),
+        "net_score": int(NET_SCORE_LUT[total].sum()),
+        "baseline_rating_points": int(RATING_POINTS_LUT[keep_total].sum()),
+        "baseline_net_score": int(NET_SCORE_LUT[keep_total].sum()),
+        "analysis": _analyze_matrix(matrix),
+        "best_by_type": {
+            pokemon_id: best_tera_by_type(vectors, labels)
+            for pokemon_id, (vectors, labels) in zip(members, all_options)
+        },
+        "complete": complete,
+        "pairs": pairs,
+        "elapsed": time.perf_counter() - start_time,
+    }
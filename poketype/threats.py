@@ -0,0 +1,176 @@
+"""
+Dex-wide threat index.
+Answers "which species' STAB types hit this team hardest" from matrices
+built once per dataset: every species is reduced to its attacking profile
+(its set of types) and the best STAB multiplier of every profile against
+every type combination is precomputed, so a query is a few array lookups
+instead of a loop over the dex. The matrix of each type chart is built
+the first time that chart is queried.
+"""
+
+from typing import Collection, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from poketype import engine
+from poketype.store import FORM_TYPE_INDEX, PokedexStore
+from poketype.typechart import DEFAULT_CHART, TYPES
+
+# A STAB hit at or above this multiplier is super effective
+SUPER_EFFECTIVE = 2.0
+
+
+def best_stab_matrix(profiles: Sequence[Tuple[int, ...]], defense: np.ndarray) -> np.ndarray:
+    """
+    (profiles x defenders) best multiplier any of a profile's types deals to
+    each row of a (defenders x 18) defensive matrix. Profiles with no type
+    (typeless attackers) deal 0.
+    """
+    stab = np.zeros((len(profiles), engine.NUM_TYPES), dtype=bool)
+    for row, type_ids in enumerate(profiles):
+        stab[row, list(type_ids)] = True
+    return np.where(stab[:, None, :], defense[None, :, :], 0.0).max(axis=-1)
+
+
+def attack_profile(pokemon_types: Sequence[str]) -> Tuple[int, ...]:
+    """Sorted ids of the known, distinct types of a typing."""
+    return tuple(sorted({engine.TYPE_INDEX[t] for t in pokemon_types if t in engine.TYPE_INDEX}))
+
+
+class ThreatIndex:
+    """
+    Threat lookups over one Pokedex.
+
+    Species are grouped by attacking profile: profile codes below
+    len(engine.COMBOS) are engine.COMBOS codes, typeless and 3+ type
+    profiles are appended after them. best_for(chart)[p, c] is the best STAB
+    multiplier of profile p against combo c under that chart; `best` is the
+    current chart's.
+    """
+
+    def __init__(self, pokemon_dict: Mapping[str, Mapping]):
+        self.pokemon_dict = pokemon_dict
+        self.ids: List[str] = list(pokemon_dict)
+
+        profiles: List[Tuple[int, ...]] = list(engine.COMBOS)
+        profile_codes: Dict[Tuple[int, ...], int] = dict(engine.COMBO_INDEX)
+        attack_code = np.empty(len(self.ids), dtype=np.int16)
+        by_type: Dict[str, List[str]] = {type_name: [] for type_name in TYPES}
+        for row, pokemon_id in enumerate(self.ids):
+            profile = attack_profile(pokemon_dict[pokemon_id]["types"])
+            if profile not in profile_codes:
+                profile_codes[profile] = len(profiles)
+                profiles.append(profile)
+            attack_code[row] = profile_codes[profile]
+            for type_id in profile:
+                by_type[TYPES[type_id]].append(pokemon_id)
+
+        self.profiles = profiles
+        self.attack_code = attack_code
+        # Inverted index: type name -> species with that STAB, in dex order
+        self.by_type: Dict[str, Tuple[str, ...]] = {type_name: tuple(ids) for type_name, ids in by_type.items()}
+        self._best: Dict[int, np.ndarray] = {}
+
+        if isinstance(pokemon_dict, PokedexStore):
+            self.gen = np.asarray(pokemon_dict.gen)
+            self.form_type = np.asarray(pokemon_dict.form_type)
+            num, names = pokemon_dict.num.tolist(), pokemon_dict.names
+        else:
+            records = [pokemon_dict[pokemon_id] for pokemon_id in self.ids]
+            self.gen = np.array([data.get("gen", 1) for data in records], dtype=np.uint8)
+            self.form_type = np.array(
+                [FORM_TYPE_INDEX.get(data.get("form_type", "base"), FORM_TYPE_INDEX["form"]) for data in records],
+                dtype=np.uint8,
+            )
+            num, names = [data.get("num", 0) for data in records], [data["name"] for data in records]
+
+        # Rank of each species in (num, name) order, the final tiebreak
+        order = sorted(range(len(self.ids)), key=lambda row: (num[row], names[row]))
+        self.dex_rank = np.empty(len(self.ids), dtype=np.int32)
+        self.dex_rank[order] = np.arange(len(self.ids), dtype=np.int32)
+
+    @property
+    def best(self) -> np.ndarray:
+        return self.best_for(DEFAULT_CHART)
+
+    def best_for(self, chart: int) -> np.ndarray:
+        """(profiles x combos) best STAB multipliers under a type chart."""
+        best = self._best.get(chart)
+        if best is None:
+            best = self._best[chart] = best_stab_matrix(self.profiles, engine.defense_table(chart))
+        return best
+
+    def member_columns(self, team: Sequence[str], chart: int = DEFAULT_CHART) -> Tuple[List[str], np.ndarray]:
+        """Known team members and their (profiles x members) best STAB columns."""
+        members = [pokemon_id for pokemon_id in team if pokemon_id in self.pokemon_dict]
+        best = self.best_for(chart)
+        columns = np.empty((len(self.profiles), len(members)))
+        for col, pokemon_id in enumerate(members):
+            types = self.pokemon_dict[pokemon_id]["types"]
+            code = engine.combo_code(types)
+            if code >= 0:
+                columns[:, col] = best[:, code]
+            else:
+                columns[:, col] = best_stab_matrix(self.profiles, engine.defense_vector(types, chart)[None, :])[:, 0]
+        return members, columns
+
+    def threats(self, team: Sequence[str], k: int = 2, generation: Optional[int] = None,
+                form_types: Optional[Collection[str]] = None, species: Optional[Collection[str]] = None,
+                limit: Optional[int] = None, chart: int = DEFAULT_CHART) -> List[Dict]:
+        """
+        Species whose STAB hits at least k team members super effectively,
+        most members hit first, then most 4x hits, then dex order.
+        Team members are not listed. generation, form_types and species
+        (e.g. a format's legal species) restrict the candidates.
+        """
+        members, columns = self.member_columns(team, chart)
+        if not members:
+            return []
+        super_effective = columns >= SUPER_EFFECTIVE
+        hits = super_effective.sum(axis=1)[self.attack_code]
+        quad_hits = (columns >= 4).sum(axis=1)[self.attack_code]
+
+        candidate = hits >= k
+        if generation is not None:
+            candidate &= self.gen == generation
+        if form_types is not None:
+            allowed = [FORM_TYPE_INDEX[form_type] for form_type in form_types if form_type in FORM_TYPE_INDEX]
+            candidate &= np.isin(self.form_type, allowed)
+        rows = np.nonzero(candidate)[0]
+        if species is not None:
+            species = set(species)
+            rows = np.array([row for row in rows.tolist() if self.ids[row] in species], dtype=np.intp)
+        team_set = set(members)
+        rows = np.array([row for row in rows.tolist() if self.ids[row] not in team_set], dtype=np.intp)
+        if not len(rows):
+            return []
+
+        rows = rows[np.lexsort((self.dex_rank[rows], -quad_hits[rows], -hits[rows]))]
+        if limit is not None:
+            rows = rows[:limit]
+
+        results = []
+        for row in rows.tolist():
+            code = self.attack_code[row]
+            results.append({
+                "species": self.ids[row],
+                "hits": int(hits[row]),
+                "weak_4x": int(quad_hits[row]),
+                "members": [member for member, hit in zip(members, super_effective[code].tolist()) if hit],
+                "stab": [TYPES[type_id] for type_id in self.profiles[code]],
+            })
+        return results
+
+
+def get_threats(team: Sequence[str], pokemon_dict: Optional[Mapping[str, Mapping]] = None, k: int = 2,
+                **filters) -> List[Dict]:
+    """
+    Species whose STAB hits k or more team members super effectively.
+    A PokedexStore keeps its ThreatIndex across calls; plain dicts build one
+    per call. See ThreatIndex.threats for filters.
+    """
+    if pokemon_dict is None:
+        from poketype.dataset import get_pokemon
+        pokemon_dict = get_pokemon()
+    index = pokemon_dict.threat_index if isinstance(pokemon_dict, PokedexStore) else ThreatIndex(pokemon_dict)
+    return index.threats(team, k=k, **filters)
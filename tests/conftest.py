@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Tests import poketype and benchmarks from the repository root, as the benchmarks do
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
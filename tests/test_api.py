@@ -0,0 +1,57 @@
+import http.client
+import json
+import threading
+
+import pytest
+
+from benchmarks.synthetic import synthetic_pokedex
+from poketype.api import APIHandler, APIServer
+from poketype.pokedex import parse_pokedex
+
+
+@pytest.fixture(scope="module")
+def server():
+    server = APIServer(parse_pokedex(synthetic_pokedex(50)), port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def request(server, method, path, body=b"", headers=None):
+    connection = http.client.HTTPConnection(*server.server_address[:2], timeout=5)
+    try:
+        connection.putrequest(method, path)
+        for name, value in (headers or {}).items():
+            connection.putheader(name, value)
+        connection.endheaders(body)
+        response = connection.getresponse()
+        return response.status, json.loads(response.read())
+    finally:
+        connection.close()
+
+
+@pytest.mark.parametrize("length", ["abc", "-5", "1.5"])
+def test_bad_content_length_is_a_json_400(server, length):
+    status, body = request(server, "POST", "/analyze", b'{"team": []}', {"Content-Length": length})
+    assert status == 400
+    assert body == {"error": "invalid Content-Length"}
+
+
+def test_analyze(server):
+    payload = json.dumps({"team": ["species1", "Species2", "missingno"]}).encode()
+    status, body = request(server, "POST", "/analyze", payload, {"Content-Length": str(len(payload))})
+    assert status == 200
+    assert body["team"] == ["species1", "species2"]
+    assert body["unknown"] == ["missingno"]
+
+
+def test_unexpected_error_is_a_json_500(server, monkeypatch):
+    def broken(self, query):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(APIHandler, "get_health", broken)
+    status, body = request(server, "GET", "/health")
+    assert status == 500
+    assert body == {"error": "internal server error"}
@@ -0,0 +1,184 @@
+import json
+import random
+
+import pytest
+import requests
+
+from benchmarks.standin import js_literal, serve
+from benchmarks.synthetic import synthetic_pokedex
+from poketype import datafiles
+from poketype.datafiles import DATA_FILES, JSONObjectStream, load_data_files
+from poketype.pokedex import parse_pokedex
+
+LEARNSETS = {
+    "species1": {"learnset": {"tackle": ["9L1"], "earthquake": ["9M", "8M"]}},
+    "species2": {"eventData": [{"generation": 9}]},
+}
+MOVES = {
+    "tackle": {"num": 33, "name": "Tackle", "type": "Normal", "category": "Physical", "basePower": 40,
+               "accuracy": 100, "priority": 0, "flags": {"contact": 1}},
+    "swift": {"num": 129, "name": "Swift", "type": "Normal", "category": "Special", "basePower": 60,
+              "accuracy": True, "priority": 0},
+    "quickattack": {"num": 98, "name": "Quick Attack", "type": "Normal", "category": "Physical",
+                    "basePower": 40, "accuracy": 100, "priority": 1},
+    # Numbers that chunk boundaries can cut
+    "oddities": {"name": "Oddities", "basePower": -12.5, "accuracy": 1.5e3, "priority": -7},
+}
+ABILITIES = {
+    "levitate": {"name": "Levitate", "rating": 3.5, "num": 26, "flags": {"breakable": 1},
+                 "desc": 'Immune to "Ground" moves: {type:Ground}, see x\\y'},
+    "0weird-key": {"name": "Weird", "rating": -1.5e-3, "num": 999},
+    "noability": {"name": "No Ability", "rating": 0.1, "num": 0, "isNonstandard": "Past"},
+}
+FORMATS_DATA = {
+    "species1": {"tier": "OU", "doublesTier": "DOU", "natDexTier": "OU"},
+    "species2": {"tier": "Illegal", "isNonstandard": "Past"},
+}
+
+
+def js(name, data):
+    return f'"use strict";\nexports.{name} = {js_literal(data)};\n'.encode("utf-8")
+
+
+@pytest.fixture
+def raw():
+    return {
+        "pokedex": synthetic_pokedex(40),
+        "learnsets": LEARNSETS,
+        "moves": MOVES,
+        "abilities": ABILITIES,
+        "formats_data": FORMATS_DATA,
+    }
+
+
+@pytest.fixture
+def files(raw):
+    return {
+        "/pokedex.json": json.dumps(raw["pokedex"]).encode("utf-8"),
+        "/learnsets.json": json.dumps(raw["learnsets"], indent=2).encode("utf-8"),
+        "/moves.json": json.dumps(raw["moves"]).encode("utf-8"),
+        "/abilities.js": js("BattleAbilities", raw["abilities"]),
+        "/formats-data.js": js("BattleFormatsData", raw["formats_data"]),
+    }
+
+
+def expected(raw, name):
+    data_file = DATA_FILES[name]
+    data = {key: data_file.reduce_entry(entry) for key, entry in raw[name].items()}
+    return data_file.finish(data) if data_file.finish is not None else data
+
+
+def feed_in_chunks(text, sizes):
+    stream = JSONObjectStream()
+    pairs, pos = [], 0
+    while pos < len(text):
+        size = next(sizes)
+        pairs.extend(stream.feed(text[pos:pos + size]))
+        pos += size
+    stream.close()
+    return pairs
+
+
+@pytest.mark.parametrize("chunks", [
+    ['{"c":-12.', '5,"d":1}'],
+    ['{"c":1.5e', '3}'],
+    ['{"c":1', '0', ', "d": tr', 'ue}'],
+])
+def test_numbers_cut_by_a_chunk(chunks):
+    stream = JSONObjectStream()
+    pairs = [pair for chunk in chunks for pair in stream.feed(chunk)]
+    stream.close()
+    assert dict(pairs) == json.loads("".join(chunks))
+
+
+def test_bare_keys():
+    text = 'exports.BattleAbilities = {noability:{isNonstandard:"Past",flags:{},name:"No Ability",rating:0.1,num:0}};'
+    stream = JSONObjectStream(bare_keys=True)
+    pairs = list(stream.feed(text))
+    stream.close()
+    assert pairs == [("noability", {"isNonstandard": "Past", "flags": {}, "name": "No Ability",
+                                    "rating": 0.1, "num": 0})]
+    # Without bare_keys it never completes
+    stream = JSONObjectStream()
+    assert list(stream.feed(text)) == []
+    with pytest.raises(ValueError):
+        stream.close()
+
+
+def test_bare_keys_at_every_split():
+    text = js("BattleAbilities", ABILITIES).decode("utf-8")
+    for size in range(1, 12):
+        stream = JSONObjectStream(bare_keys=True)
+        pairs = [pair for pos in range(0, len(text), size) for pair in stream.feed(text[pos:pos + size])]
+        stream.close()
+        assert dict(pairs) == ABILITIES
+
+
+def test_stream_matches_json_loads_at_every_split():
+    text = "exports.X = " + json.dumps({"a": -12.5, "b": [1, {"c": "}"}], "d": 1.5e3, "e": None, "f": 'x"y'}) + ";"
+    for size in range(1, 12):
+        assert dict(feed_in_chunks(text, iter(lambda: size, None))) == json.loads(text[12:-1])
+
+
+@pytest.mark.parametrize("text", ['{"a": 1', '{"a": 1, "b": -1.', '{"a": 1 2}', '{"a": "b'])
+def test_incomplete_or_malformed_fails_in_close(text):
+    stream = JSONObjectStream()
+    list(stream.feed(text))
+    with pytest.raises(ValueError):
+        stream.close()
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_all_files_at_random_chunk_sizes(raw, files, monkeypatch, seed):
+    rnd = random.Random(seed)
+    chunk_size = rnd.choice([1, 2, 3, 7, 64, 1000, 1 << 16])
+    monkeypatch.setattr(datafiles, "CHUNK_SIZE", chunk_size)
+    with serve(files) as server, requests.Session() as session:
+        data, timings = load_data_files(base_url=server.base_url, session=session)
+    assert set(data) == set(DATA_FILES)
+    for name in DATA_FILES:
+        assert data[name] == expected(raw, name), (name, chunk_size)
+        assert timings[name]["entries"] == len(raw[name])
+        assert "error" not in timings[name]
+    assert data["pokedex"] == parse_pokedex(raw["pokedex"])
+
+
+@pytest.mark.parametrize("status", [404, 500])
+def test_failed_file_reports_an_error(raw, files, status):
+    with serve(files) as server, requests.Session() as session:
+        if status == 404:
+            del files["/moves.json"]
+        else:
+            server.fail_paths.add("/moves.json")
+        data, timings = load_data_files(base_url=server.base_url, session=session)
+    assert "moves" not in data
+    assert str(status) in timings["moves"]["error"]
+    for name in set(DATA_FILES) - {"moves"}:
+        assert data[name] == expected(raw, name)
+        assert "error" not in timings[name]
+
+
+def test_server_error_on_every_file(files):
+    with serve(files) as server, requests.Session() as session:
+        server.fail = True
+        data, timings = load_data_files(["moves", "abilities"], base_url=server.base_url, session=session)
+    assert data == {}
+    assert "500" in timings["moves"]["error"] and "500" in timings["abilities"]["error"]
+
+
+def test_truncated_body_fails_in_close(raw, files):
+    files["/moves.json"] = files["/moves.json"][:-20]
+    with serve(files) as server, requests.Session() as session:
+        data, timings = load_data_files(["moves", "abilities"], base_url=server.base_url, session=session)
+    assert "moves" not in data
+    assert timings["moves"]["error"].startswith("ValueError: incomplete JSON object")
+    assert data["abilities"] == expected(raw, "abilities")
+
+
+def test_connections_reused_across_loads(files):
+    with serve(files) as server:
+        for _ in range(3):
+            load_data_files(base_url=server.base_url)
+        assert server.requests == 3 * len(DATA_FILES)
+        # At most one connection per concurrent file, kept alive between loads
+        assert server.connections <= len(DATA_FILES)
@@ -0,0 +1,182 @@
+"""
+The array engine against the dict-based implementation it replaced:
+TYPE_CHART lookups multiplied per defending type, as in the original app.
+"""
+
+import json
+import random
+
+import pytest
+
+from poketype import engine
+from poketype.analysis import (ANALYSIS_CACHE, analyze_team_by_type, calc_multiplier,
+                               get_pokemon_weaknesses_resistances, summarize_team)
+from poketype.store import PokedexStore
+from poketype.typechart import TYPE_CHART, TYPES
+
+# =============================================================================
+# REFERENCE: the original dict implementation
+# =============================================================================
+
+def reference_multiplier(attack_type, pokemon_types):
+    multiplier = 1.0
+    for def_type in pokemon_types:
+        multiplier *= TYPE_CHART[attack_type].get(def_type, 1.0)
+    return multiplier
+
+
+def reference_summary(team, pokemon):
+    import pandas as pd
+
+    if not team:
+        return pd.DataFrame()
+    results = []
+    for atk_type in TYPES:
+        multipliers = [reference_multiplier(atk_type, pokemon[pokemon_id]["types"])
+                       for pokemon_id in team if pokemon_id in pokemon]
+        counts = {key: multipliers.count(value) for key, value in
+                  (("x0", 0), ("x0.25", 0.25), ("x0.5", 0.5), ("x1", 1), ("x2", 2), ("x4", 4))}
+        risk = (counts["x2"] + 2 * counts["x4"]
+                - counts["x0.5"] - 2 * counts["x0.25"] - 3 * counts["x0"])
+        results.append(dict(Type=atk_type, **counts,
+                            Worst=max(multipliers) if multipliers else 1,
+                            Best=min(multipliers) if multipliers else 1,
+                            Risk=risk))
+    return pd.DataFrame(results)
+
+
+def reference_weaknesses(pokemon_types):
+    weaknesses, resistances, immunities = [], [], []
+    for atk_type in TYPES:
+        mult = reference_multiplier(atk_type, pokemon_types)
+        if mult == 0:
+            immunities.append(atk_type)
+        elif mult < 1:
+            resistances.append(atk_type)
+        elif mult > 1:
+            weaknesses.append(atk_type)
+    return weaknesses, resistances, immunities
+
+
+def reference_rating(immune, resist_4x, resist_2x, weak_2x, weak_4x, net_score):
+    if immune >= 2 or (immune >= 1 and resist_2x + resist_4x >= 2):
+        return "S+", "#22c55e"
+    if immune >= 1 and weak_2x == 0 and weak_4x == 0:
+        return "S", "#4ade80"
+    for threshold, rating, color in ((6, "A+", "#86efac"), (4, "A", "#a3e635"), (2, "B+", "#bef264"),
+                                     (0, "B", "#fde047"), (-2, "C+", "#fbbf24"), (-4, "C", "#fb923c"),
+                                     (-6, "D", "#f87171")):
+        if net_score >= threshold:
+            return rating, color
+    if weak_4x >= 2 or (weak_4x >= 1 and weak_2x >= 2):
+        return "F", "#dc2626"
+    return "E", "#ef4444"
+
+
+def reference_analysis(team, pokemon):
+    results = []
+    for atk_type in TYPES:
+        counts = dict.fromkeys(("immune", "resist_4x", "resist_2x", "neutral", "weak_2x", "weak_4x"), 0)
+        for pokemon_id in team:
+            if pokemon_id in pokemon:
+                mult = reference_multiplier(atk_type, pokemon[pokemon_id]["types"])
+                if mult == 0:
+                    counts["immune"] += 1
+                elif mult == 0.25:
+                    counts["resist_4x"] += 1
+                elif mult == 0.5:
+                    counts["resist_2x"] += 1
+                elif mult == 1:
+                    counts["neutral"] += 1
+                elif mult == 2:
+                    counts["weak_2x"] += 1
+                elif mult >= 4:
+                    counts["weak_4x"] += 1
+        net_score = (counts["immune"] * 4 + counts["resist_4x"] * 3 + counts["resist_2x"] * 2
+                     - counts["weak_2x"] * 2 - counts["weak_4x"] * 4)
+        rating, rating_color = reference_rating(counts["immune"], counts["resist_4x"], counts["resist_2x"],
+                                                counts["weak_2x"], counts["weak_4x"], net_score)
+        results.append({"type": atk_type, **counts, "rating": rating, "rating_color": rating_color,
+                        "net_score": net_score})
+    results.sort(key=lambda x: x["type"])
+    return results
+
+
+# =============================================================================
+# TYPINGS
+# =============================================================================
+
+ALL_TYPINGS = [[TYPES[t] for t in combo] for combo in engine.COMBOS]
+ODD_TYPINGS = [
+    [],
+    ["???"],
+    ["Stellar"],
+    ["Fire", "Stellar"],
+    ["Water", "Fire"],
+    ["Fire", "Fire"],
+    ["Ghost", "Ghost"],
+    ["Fire", "Water", "Grass"],
+    ["Grass", "Bug", "Steel"],
+    ["Ground", "Flying", "Electric"],
+]
+TYPINGS = ALL_TYPINGS + ODD_TYPINGS
+
+
+def typing_id(types):
+    return "/".join(types) or "typeless"
+
+
+@pytest.fixture(scope="module")
+def pokemon():
+    return {f"mon{i}": {"name": f"Mon{i}", "types": types, "num": i + 1, "gen": 1, "form_type": "base"}
+            for i, types in enumerate(TYPINGS)}
+
+
+@pytest.fixture(scope="module")
+def teams(pokemon):
+    rnd = random.Random(0)
+    ids = list(pokemon)
+    teams = [[], ["missingno"], ["mon0", "missingno"]]
+    teams += [[pokemon_id] for pokemon_id in ids]
+    teams += [rnd.sample(ids, rnd.randint(2, 6)) for _ in range(300)]
+    # Repeated members
+    teams += [[pokemon_id] * 3 for pokemon_id in rnd.sample(ids, 10)]
+    return teams
+
+
+def test_all_dual_typings_covered():
+    assert len(ALL_TYPINGS) == 171
+    assert len({tuple(types) for types in ALL_TYPINGS}) == 171
+
+
+@pytest.mark.parametrize("types", TYPINGS, ids=typing_id)
+def test_calc_multiplier(types):
+    for attack_type in TYPES:
+        result = calc_multiplier(attack_type, types)
+        expected = reference_multiplier(attack_type, types)
+        assert type(result) is float
+        assert repr(result) == repr(expected), attack_type
+
+
+@pytest.mark.parametrize("types", TYPINGS, ids=typing_id)
+def test_weaknesses_resistances(types):
+    assert get_pokemon_weaknesses_resistances(types) == reference_weaknesses(types)
+
+
+@pytest.mark.parametrize("store", [False, True], ids=["dict", "store"])
+def test_analyze_team_by_type(pokemon, teams, store):
+    ANALYSIS_CACHE.clear()
+    source = PokedexStore.from_dict(pokemon) if store else pokemon
+    for team in teams:
+        assert json.dumps(analyze_team_by_type(team, source)) == json.dumps(reference_analysis(team, pokemon)), team
+
+
+@pytest.mark.parametrize("store", [False, True], ids=["dict", "store"])
+def test_summarize_team(pokemon, teams, store):
+    ANALYSIS_CACHE.clear()
+    source = PokedexStore.from_dict(pokemon) if store else pokemon
+    for team in teams:
+        result = summarize_team(team, source)
+        expected = reference_summary(team, pokemon)
+        assert result.to_csv() == expected.to_csv(), team
+        assert result.dtypes.to_dict() == expected.dtypes.to_dict(), team
@@ -0,0 +1,137 @@
+import gzip
+import json
+import os
+import time
+
+import pytest
+
+from benchmarks.standin import serve
+from benchmarks.synthetic import synthetic_pokedex
+from poketype import pokedex
+from poketype.pokedex import (SNAPSHOT_VERSION, fetch_snapshot, load_snapshot, parse_pokedex, read_snapshot,
+                              write_snapshot)
+
+
+@pytest.fixture
+def files():
+    return {"/pokedex.json": json.dumps(synthetic_pokedex(30)).encode("utf-8")}
+
+
+@pytest.fixture
+def server(files):
+    with serve(files) as server:
+        server.url = server.base_url + "/pokedex.json"
+        yield server
+
+
+def make_stale(path):
+    snapshot = read_snapshot(path)
+    snapshot["fetched_at"] = 0
+    write_snapshot(path, snapshot)
+
+
+def test_first_load_fetches_and_writes(server, tmp_path):
+    path = tmp_path / "pokedex.json.gz"
+    snapshot = load_snapshot(path, server.url)
+    assert snapshot["pokemon"] == parse_pokedex(json.loads(server.files["/pokedex.json"]))
+    assert snapshot["etag"] and snapshot["last_modified"]
+    assert read_snapshot(path) == snapshot
+    # Fresh: served from disk without a request
+    assert load_snapshot(path, server.url) == snapshot
+    assert server.requests == 1
+
+
+def test_conditional_request_reuses_snapshot(server, tmp_path):
+    path = tmp_path / "pokedex.json.gz"
+    first = load_snapshot(path, server.url)
+    make_stale(path)
+    second = load_snapshot(path, server.url)
+
+    headers = server.request_headers[-1]
+    assert headers["If-None-Match"] == first["etag"]
+    assert headers["If-Modified-Since"] == first["last_modified"]
+    assert server.not_modified == 1
+    assert second["pokemon"] == first["pokemon"]
+    assert second["dataset_version"] == first["dataset_version"]
+    assert time.time() - second["fetched_at"] < 60
+    # The revalidation is persisted
+    assert read_snapshot(path)["fetched_at"] == second["fetched_at"]
+
+
+def test_changed_content_is_downloaded(server, files, tmp_path):
+    path = tmp_path / "pokedex.json.gz"
+    first = load_snapshot(path, server.url)
+    files["/pokedex.json"] = json.dumps(synthetic_pokedex(31)).encode("utf-8")
+    make_stale(path)
+    second = load_snapshot(path, server.url)
+    assert server.not_modified == 0
+    assert second["dataset_version"] != first["dataset_version"]
+    assert len(second["pokemon"]) == 31
+
+
+def test_other_snapshot_version_forces_refetch(server, tmp_path):
+    path = tmp_path / "pokedex.json.gz"
+    current = load_snapshot(path, server.url)
+    write_snapshot(path, dict(current, version=SNAPSHOT_VERSION - 1, pokemon={}, fetched_at=time.time()))
+    assert read_snapshot(path) is None
+
+    refetched = load_snapshot(path, server.url)
+    assert server.requests == 2
+    # Unconditional: the old snapshot is not trusted for a 304
+    assert "If-None-Match" not in server.request_headers[-1]
+    assert refetched["pokemon"] == current["pokemon"]
+    assert read_snapshot(path)["version"] == SNAPSHOT_VERSION
+
+
+def test_fetch_error_falls_back_to_stale_snapshot(server, tmp_path):
+    path = tmp_path / "pokedex.json.gz"
+    first = load_snapshot(path, server.url)
+    make_stale(path)
+    server.fail = True
+    stale = load_snapshot(path, server.url)
+    assert stale["pokemon"] == first["pokemon"]
+    assert stale["fetched_at"] == 0
+
+
+def test_fetch_error_without_snapshot_raises(server, tmp_path):
+    server.fail = True
+    with pytest.raises(Exception):
+        load_snapshot(tmp_path / "pokedex.json.gz", server.url)
+    with pytest.raises(Exception):
+        fetch_snapshot(server.base_url + "/missing.json")
+
+
+def test_write_snapshot_replaces_atomically(tmp_path, monkeypatch):
+    path = tmp_path / "pokedex.json.gz"
+    write_snapshot(path, {"version": SNAPSHOT_VERSION, "pokemon": {"a": 1}})
+    replaced = []
+    real_replace = os.replace
+
+    def replace(source, target):
+        # Written in full to a temporary file in the same directory first
+        assert os.path.dirname(source) == str(tmp_path)
+        with gzip.open(source) as f:
+            assert json.loads(f.read())["pokemon"] == {"b": 2}
+        replaced.append(target)
+        real_replace(source, target)
+
+    monkeypatch.setattr(pokedex.os, "replace", replace)
+    write_snapshot(path, {"version": SNAPSHOT_VERSION, "pokemon": {"b": 2}})
+    assert replaced == [path]
+    assert read_snapshot(path)["pokemon"] == {"b": 2}
+    assert os.listdir(tmp_path) == [path.name]
+
+
+def test_failed_write_keeps_old_snapshot(tmp_path, monkeypatch):
+    path = tmp_path / "pokedex.json.gz"
+    write_snapshot(path, {"version": SNAPSHOT_VERSION, "pokemon": {"a": 1}})
+
+    def replace(source, target):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(pokedex.os, "replace", replace)
+    with pytest.raises(OSError):
+        write_snapshot(path, {"version": SNAPSHOT_VERSION, "pokemon": {"b": 2}})
+    assert read_snapshot(path)["pokemon"] == {"a": 1}
+    # No temporary file left behind
+    assert os.listdir(tmp_path) == [path.name]
@@ -0,0 +1,41 @@
+import pytest
+
+from poketype import profiling
+
+
+@pytest.fixture(autouse=True)
+def unbound():
+    enabled = profiling.ENABLED
+    profiling.set_enabled(False)
+    yield
+    profiling.bind(None)
+    profiling.set_enabled(enabled)
+
+
+def test_session_spans_do_not_leak_to_other_sessions():
+    debug = profiling.SessionProfile(enabled=True)
+    other = profiling.SessionProfile()
+
+    profiling.begin_rerun(debug)
+    with profiling.span("debug-block"):
+        pass
+    profiling.begin_rerun(other)
+    with profiling.span("other-block"):
+        pass
+
+    assert "debug-block" in debug.stats.to_dict()
+    assert other.stats.to_dict() == {}
+    assert "other-block" not in profiling.PROCESS_STATS.to_dict()
+    assert profiling.ENABLED is False
+
+
+def test_process_toggle_records_every_session():
+    profile = profiling.begin_rerun(profiling.SessionProfile())
+    profiling.set_enabled(True)
+
+    @profiling.profiled("toggled")
+    def call():
+        return 1
+
+    assert call() == 1
+    assert profile.stats.to_dict()["toggled"]["count"] == 1
@@ -0,0 +1,147 @@
+import json
+import time
+
+import pytest
+
+from benchmarks.standin import serve
+from benchmarks.synthetic import synthetic_pokedex
+from poketype.pokedex import load_snapshot, read_snapshot, write_snapshot
+from poketype.refresh import DatasetRefresher
+from poketype.store import DERIVED_CACHE
+
+
+def payload(n):
+    return json.dumps(synthetic_pokedex(n)).encode("utf-8")
+
+
+@pytest.fixture
+def server():
+    with serve({"/pokedex.json": payload(30)}) as server:
+        server.url = server.base_url + "/pokedex.json"
+        yield server
+
+
+@pytest.fixture
+def stale_path(server, tmp_path):
+    """A stale snapshot of the served data."""
+    path = tmp_path / "pokedex.json.gz"
+    snapshot = load_snapshot(path, server.url)
+    write_snapshot(path, dict(snapshot, fetched_at=0))
+    server.requests = 0
+    return path
+
+
+def refresher(server, path, **kwargs):
+    return DatasetRefresher(path, server.url, max_age=3600, timeout=10, **kwargs)
+
+
+def wait(refresher):
+    thread = refresher._thread
+    assert thread is not None
+    thread.join(10)
+    assert not thread.is_alive()
+
+
+def test_old_store_served_during_slow_fetch(server, stale_path):
+    server.files["/pokedex.json"] = payload(31)
+    server.delay = 0.5
+    dataset = refresher(server, stale_path)
+
+    start = time.perf_counter()
+    old = dataset.get()
+    assert time.perf_counter() - start < server.delay
+    assert len(old) == 30
+    assert dataset._thread.is_alive()
+    # Still the old store while the fetch is in flight, without a second fetch
+    assert dataset.get() is old
+
+    wait(dataset)
+    new = dataset.get()
+    assert new is not old and len(new) == 31
+    assert dataset.metrics.swaps == 1 and dataset.metrics.failures == 0
+    assert server.requests == 1
+    assert len(read_snapshot(stale_path)["pokemon"]) == 31
+
+
+def test_failed_fetch_waits_retry_interval(server, stale_path):
+    server.fail = True
+    dataset = refresher(server, stale_path, retry_interval=60)
+    old = dataset.get()
+    wait(dataset)
+    metrics = dataset.metrics
+    assert metrics.failures == 1 and metrics.attempts == 1
+    assert metrics.last_error.startswith("HTTPError")
+    assert metrics.last_success is None
+
+    # Within retry_interval: no new attempt
+    assert dataset.get() is old
+    wait(dataset)
+    assert metrics.attempts == 1 and server.requests == 1
+
+    metrics.last_attempt -= 60
+    server.fail = False
+    assert dataset.get() is old
+    wait(dataset)
+    assert metrics.attempts == 2 and metrics.failures == 1
+    assert metrics.last_error is None and metrics.last_success is not None
+    assert metrics.not_modified == 1
+
+
+def test_not_modified_keeps_store(server, stale_path):
+    dataset = refresher(server, stale_path)
+    old = dataset.get()
+    version = dataset.snapshot["dataset_version"]
+    wait(dataset)
+    assert server.not_modified == 1
+    assert dataset.metrics.not_modified == 1 and dataset.metrics.swaps == 0
+    assert dataset.get() is old
+    assert dataset.snapshot["dataset_version"] == version
+    assert time.time() - dataset.snapshot["fetched_at"] < 60
+    # Fresh again: no further refresh
+    dataset.get()
+    wait(dataset)
+    assert dataset.metrics.attempts == 1
+
+
+def test_invalid_snapshot_not_swapped(server, stale_path):
+    # Far smaller than the current Pokedex: rejected by validate_snapshot
+    server.files["/pokedex.json"] = payload(5)
+    dataset = refresher(server, stale_path)
+    old = dataset.get()
+    wait(dataset)
+    assert dataset.get() is old
+    assert dataset.metrics.swaps == 0 and dataset.metrics.failures == 1
+    assert dataset.metrics.last_error.startswith("ValueError")
+    assert len(read_snapshot(stale_path)["pokemon"]) == 30
+
+
+def test_swap_discards_old_derived_structures(server, stale_path):
+    server.files["/pokedex.json"] = payload(31)
+    dataset = refresher(server, stale_path)
+    old = dataset.get()
+    old.indexes
+    assert ("indexes", old.version) in DERIVED_CACHE
+    wait(dataset)
+    new = dataset.get()
+    assert new.version != old.version
+    assert ("indexes", old.version) not in DERIVED_CACHE
+    new.indexes
+    assert ("indexes", new.version) in DERIVED_CACHE
+
+
+def test_on_swap_error_does_not_fail_refresh(server, stale_path):
+    server.files["/pokedex.json"] = payload(31)
+
+    def on_swap(store):
+        raise RuntimeError("callback broke")
+
+    dataset = refresher(server, stale_path, on_swap=on_swap)
+    old = dataset.get()
+    wait(dataset)
+    metrics = dataset.metrics
+    assert dataset.get() is not old
+    assert metrics.swaps == 1 and metrics.failures == 0
+    assert metrics.last_error is None and metrics.last_success is not None
+    assert metrics.callback_errors == 1
+    assert metrics.last_callback_error == "RuntimeError: callback broke"
+    assert len(read_snapshot(stale_path)["pokemon"]) == 31
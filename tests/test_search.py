@@ -0,0 +1,25 @@
+import pytest
+
+from benchmarks.synthetic import synthetic_pokedex
+from poketype.pokedex import parse_pokedex
+from poketype.search import search_species
+from poketype.store import PokedexStore
+
+
+@pytest.fixture(scope="module")
+def store():
+    return PokedexStore.from_dict(parse_pokedex(synthetic_pokedex(200)))
+
+
+def test_type_filter(store):
+    results = search_species("", store, limit=500, types=["Fire"])
+    assert results
+    assert all("Fire" in store[result["id"]]["types"] for result in results)
+    expected = sum("Fire" in store[pokemon_id]["types"] for pokemon_id in store)
+    assert len(results) == expected
+
+
+@pytest.mark.parametrize("query", ["", "a"])
+def test_unknown_type_raises(store, query):
+    with pytest.raises(ValueError, match="unknown type 'Fairyy'"):
+        search_species(query, store, types=["Fire", "Fairyy"])
@@ -0,0 +1,87 @@
+"""
+TeamState against analyze_team_by_type over random edit sequences
+(seeded, so a failure names its seed and step).
+"""
+
+import random
+
+import pytest
+
+from benchmarks.synthetic import synthetic_pokedex
+from poketype.abilities import ABILITY_MODES
+from poketype.analysis import analyze_team_by_type
+from poketype.batch import MAX_SLOTS
+from poketype.pokedex import parse_pokedex
+from poketype.store import PokedexStore
+from poketype.team import TeamState
+from poketype.typechart import CHARTS
+
+STEPS = 60
+
+
+@pytest.fixture(scope="module")
+def pokedex():
+    return parse_pokedex(synthetic_pokedex(300))
+
+
+def random_step(rnd, state, ids):
+    """Apply one random operation to state; returns its description."""
+    candidates = ids + ["missingno"]
+    operations = ["set_chart", "set_ability_mode", "clear"]
+    if len(state) < MAX_SLOTS:
+        operations += ["add"] * 4
+    if len(state):
+        operations += ["remove"] * 2 + ["swap"] * 3
+    operation = rnd.choice(operations)
+    if operation == "add":
+        # Repeated members too
+        argument = rnd.choice(state.members) if state.members and rnd.random() < 0.2 else rnd.choice(candidates)
+        state.add(argument)
+    elif operation == "remove":
+        argument = rnd.choice(state.members)
+        state.remove(argument)
+    elif operation == "swap":
+        argument = (rnd.choice(state.members), rnd.choice(candidates))
+        state.swap(*argument)
+    elif operation == "set_chart":
+        argument = rnd.randrange(len(CHARTS))
+        state.set_chart(argument)
+    elif operation == "set_ability_mode":
+        argument = rnd.choice((None,) + ABILITY_MODES)
+        state.set_ability_mode(argument)
+    else:
+        argument = None
+        state.clear()
+    return operation, argument
+
+
+@pytest.mark.parametrize("store", [False, True], ids=["dict", "store"])
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_analyze_team_by_type(pokedex, store, seed):
+    source = PokedexStore.from_dict(pokedex, version="test-team-state") if store else pokedex
+    ids = list(pokedex)
+    rnd = random.Random(seed)
+    state = TeamState(source, rnd.sample(ids, rnd.randint(0, 6)))
+    members = list(state.members)
+    for step in range(STEPS):
+        operation, argument = random_step(rnd, state, ids)
+        if operation == "add":
+            members.append(argument)
+        elif operation == "remove":
+            members.remove(argument)
+        elif operation == "swap":
+            members[members.index(argument[0])] = argument[1]
+        elif operation == "clear":
+            members = []
+        assert state.members == members, (step, operation, argument)
+        expected = analyze_team_by_type(members, source, chart=state.chart, ability_mode=state.ability_mode)
+        assert state.analysis() == expected, (step, operation, argument)
+        # Cached result until the next change
+        assert state.analysis() == expected
+
+
+def test_add_beyond_max_slots(pokedex):
+    state = TeamState(pokedex, list(pokedex)[:MAX_SLOTS])
+    with pytest.raises(ValueError):
+        state.add(next(iter(pokedex)))
+    assert len(state) == MAX_SLOTS
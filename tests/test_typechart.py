@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from poketype.analysis import analyze_team_by_type, calc_multiplier, get_pokemon_weaknesses_resistances
+from poketype.engine import CHART_TENSOR, CHART_TYPE_IDS, TYPE_INDEX
+from poketype.typechart import (CHART_TYPES, DEFAULT_CHART, GEN1_CHART, GEN2_5_CHART, GEN6_CHART, TYPE_CHART,
+                                TYPES, chart_for_generation)
+
+
+def multiplier(chart, attack_type, defense_type):
+    return CHART_TENSOR[chart, TYPE_INDEX[attack_type], TYPE_INDEX[defense_type]]
+
+
+@pytest.mark.parametrize("generation, chart", [
+    (None, GEN6_CHART), (1, GEN1_CHART), (2, GEN2_5_CHART), (5, GEN2_5_CHART), (6, GEN6_CHART), (9, GEN6_CHART),
+])
+def test_chart_for_generation(generation, chart):
+    assert chart_for_generation(generation) == chart
+
+
+def test_gen6_is_type_chart():
+    assert DEFAULT_CHART == GEN6_CHART
+    for attack_type in TYPES:
+        for defense_type in TYPES:
+            assert multiplier(GEN6_CHART, attack_type, defense_type) == TYPE_CHART[attack_type][defense_type]
+
+
+def test_gen1_changes():
+    assert multiplier(GEN1_CHART, "Ghost", "Psychic") == 0
+    assert multiplier(GEN1_CHART, "Bug", "Poison") == 2
+    assert multiplier(GEN1_CHART, "Poison", "Bug") == 2
+    assert multiplier(GEN1_CHART, "Ice", "Fire") == 1
+    assert calc_multiplier("Ghost", ["Psychic"], chart=GEN1_CHART) == 0
+    assert calc_multiplier("Bug", ["Poison", "Grass"], chart=GEN1_CHART) == 4
+    assert calc_multiplier("Ice", ["Fire", "Flying"], chart=GEN1_CHART) == 2
+    # Unchanged from Gen 2 on
+    assert multiplier(GEN2_5_CHART, "Ghost", "Psychic") == 2
+    assert multiplier(GEN2_5_CHART, "Bug", "Poison") == 0.5
+    assert multiplier(GEN2_5_CHART, "Ice", "Fire") == 0.5
+
+
+def test_gen2_5_steel():
+    assert multiplier(GEN2_5_CHART, "Ghost", "Steel") == 0.5
+    assert multiplier(GEN2_5_CHART, "Dark", "Steel") == 0.5
+    assert calc_multiplier("Dark", ["Steel", "Psychic"], chart=GEN2_5_CHART) == 1
+    assert multiplier(GEN6_CHART, "Ghost", "Steel") == 1
+    assert multiplier(GEN6_CHART, "Dark", "Steel") == 1
+
+
+@pytest.mark.parametrize("chart, missing", [
+    (GEN1_CHART, {"Dark", "Steel", "Fairy"}), (GEN2_5_CHART, {"Fairy"}), (GEN6_CHART, set()),
+])
+def test_missing_types(chart, missing):
+    assert set(TYPES) - set(CHART_TYPES[chart]) == missing
+    assert {TYPES[i] for i in CHART_TYPE_IDS[chart]} == set(CHART_TYPES[chart])
+    for missing_type in missing:
+        # Neutral both ways
+        assert np.all(CHART_TENSOR[chart, TYPE_INDEX[missing_type], :] == 1)
+        assert np.all(CHART_TENSOR[chart, :, TYPE_INDEX[missing_type]] == 1)
+    analysis = analyze_team_by_type(["mon"], {"mon": {"name": "Mon", "types": ["Normal"]}}, chart=chart)
+    assert {item["type"] for item in analysis} == set(CHART_TYPES[chart])
+    weaknesses, resistances, immunities = get_pokemon_weaknesses_resistances(["Steel"], chart=chart)
+    assert not missing & set(weaknesses + resistances + immunities)
+
+
+def test_chart_tensor_read_only():
+    with pytest.raises(ValueError):
+        CHART_TENSOR[GEN1_CHART, 0, 0] = 2